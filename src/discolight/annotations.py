@@ -49,6 +49,135 @@ class BoundingBox:
         return [self.x_min, self.y_min, self.x_max, self.y_max, self.class_idx]
 
 
+# The fields of each row of an AnnotationTable
+ANNOTATION_DTYPE = np.dtype([("x_min", np.float64), ("y_min", np.float64),
+                             ("x_max", np.float64), ("y_max", np.float64),
+                             ("class_idx", np.int64), ("info", np.int64)])
+
+# The info field of a bounding box without additional info
+NO_INFO = -1
+
+
+class AnnotationTable:
+
+    """The bounding boxes annotating an image, stored column by column.
+
+    Each bounding box is a row of a structured numpy array with
+    ANNOTATION_DTYPE. The additional info of the bounding boxes is kept in
+    the additional_info list, and the info field of each row is the index
+    of its additional info in the list, or NO_INFO. The same list can be
+    shared by the tables of every image in a dataset, so that each
+    distinct additional info dictionary is only stored once.
+
+    Annotation tables can be used like lists of BoundingBox objects, which
+    are constructed as they are accessed. Loaders, augmentations, and
+    writers should use the columns in rows instead.
+    """
+
+    def __init__(self, rows=None, additional_info=None):
+        """Construct an annotation table from an array of rows."""
+        self.rows = (np.empty(0, dtype=ANNOTATION_DTYPE)
+                     if rows is None else rows)
+        self.additional_info = (additional_info
+                                if additional_info is not None else [])
+
+    @staticmethod
+    def from_numpy(bboxes, info=None, additional_info=None):
+        """Construct an annotation table from an annotation numpy array.
+
+        bboxes is an array with a row of x_min, y_min, x_max, y_max, and
+        class_idx for each bounding box, as passed to augmentations. info,
+        if given, is the index of the additional info of each bounding box
+        in additional_info.
+        """
+        bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 5)
+
+        rows = np.empty(len(bboxes), dtype=ANNOTATION_DTYPE)
+
+        for column, field in enumerate(ANNOTATION_DTYPE.names[:5]):
+            rows[field] = bboxes[:, column]
+
+        rows["info"] = NO_INFO if info is None else info
+
+        return AnnotationTable(rows, additional_info)
+
+    @staticmethod
+    def from_bounding_boxes(bboxes):
+        """Construct an annotation table from a list of BoundingBox objects.
+
+        If bboxes is already an annotation table, it is returned as is.
+        """
+        if isinstance(bboxes, AnnotationTable):
+            return bboxes
+
+        additional_info = []
+        info = []
+
+        for bbox in bboxes:
+            if bbox.additional_info:
+                info.append(len(additional_info))
+                additional_info.append(bbox.additional_info)
+            else:
+                info.append(NO_INFO)
+
+        return AnnotationTable.from_numpy(
+            [bbox.as_list() for bbox in bboxes], info, additional_info)
+
+    def __len__(self):
+        """Return the number of bounding boxes in the table."""
+        return len(self.rows)
+
+    def __getitem__(self, idx):
+        """Return a bounding box, or a table with a slice of the rows."""
+        if isinstance(idx, slice):
+            return AnnotationTable(self.rows[idx], self.additional_info)
+
+        row = self.rows[idx]
+
+        return BoundingBox(row["x_min"], row["y_min"], row["x_max"],
+                           row["y_max"], row["class_idx"], self.info(idx))
+
+    def __iter__(self):
+        """Iterate over the bounding boxes in the table."""
+        for idx in range(len(self.rows)):
+            yield self[idx]
+
+    def info(self, idx):
+        """Return the additional info of a bounding box."""
+        info_idx = self.rows["info"][idx]
+
+        return {} if info_idx == NO_INFO else self.additional_info[info_idx]
+
+    def to_numpy(self):
+        """Return the bounding boxes as an annotation numpy array."""
+        return np.column_stack([
+            self.rows[field].astype(np.float64)
+            for field in ANNOTATION_DTYPE.names[:5]
+        ]).reshape(-1, 5)
+
+    def normalize(self, width, height):
+        """Return a new table with normalized coordinates."""
+        rows = self.rows.copy()
+
+        rows["x_min"] /= width
+        rows["y_min"] /= height
+        rows["x_max"] /= width
+        rows["y_max"] /= height
+
+        return AnnotationTable(rows, self.additional_info)
+
+    def unnormalize(self, width, height):
+        """Return a new table with unnormalized coordinates."""
+        rows = self.rows.copy()
+
+        rows["x_min"] *= width
+        rows["y_min"] *= height
+        rows["x_max"] *= width
+        rows["y_max"] *= height
+
+        return AnnotationTable(rows, self.additional_info)
+
+
 ImageWithAnnotations = namedtuple('ImageWithAnnotations', 'image bboxes')
 
 
@@ -56,8 +185,11 @@ def annotations_to_numpy_array(bboxes):
     """Convert a list of BoundingBox objects to a numpy array.
 
     Image augmenations expect annotations to be passed in unnormalized
-    format in a numpy array.
+    format in a numpy array. bboxes can also be an AnnotationTable.
     """
+    if isinstance(bboxes, AnnotationTable):
+        return bboxes.to_numpy()
+
     bbox_list = list(map(lambda bbox_object: bbox_object.as_list(), bboxes))
 
     return np.array(bbox_list).reshape(-1, 5)
@@ -0,0 +1,110 @@
+"""Affine transformations of images and their annotations."""
+import numpy as np
+import cv2
+
+from ..bbox_utilities import bbox_utilities
+
+# Pixel centers lie halfway between the integer coordinates used for
+# bounding boxes. This converts from the former to the latter.
+PIXEL_CENTER_TO_CORNER = np.array([[1.0, 0.0, 0.5], [0.0, 1.0, 0.5],
+                                   [0.0, 0.0, 1.0]])
+PIXEL_CORNER_TO_CENTER = np.linalg.inv(PIXEL_CENTER_TO_CORNER)
+
+
+class AffineTransform:
+
+    """An affine transformation from one image to another.
+
+    The transformation is described by a 3x3 matrix that maps (x, y)
+    coordinates in the source image to coordinates in the destination
+    image, and the width and height of the destination image. Coordinates
+    are the same as those of bounding boxes, i.e., the pixel in column i
+    and row j covers [i, i + 1] x [j, j + 1].
+
+    A chain of transformations can be combined with then, so that an image
+    only has to be resampled once for the whole chain.
+    """
+
+    def __init__(self, matrix, width, height):
+        """Construct a new affine transformation."""
+        self.matrix = np.asarray(matrix, dtype=np.float64)
+        self.width = int(width)
+        self.height = int(height)
+
+    @staticmethod
+    def identity(width, height):
+        """Return a transformation that leaves an image unchanged."""
+        return AffineTransform(np.eye(3), width, height)
+
+    @staticmethod
+    def scaling(scale_x, scale_y, width, height):
+        """Return a transformation that scales an image about its origin."""
+        return AffineTransform(
+            [[scale_x, 0.0, 0.0], [0.0, scale_y, 0.0], [0.0, 0.0, 1.0]],
+            width, height)
+
+    @staticmethod
+    def translation(translate_x, translate_y, width, height):
+        """Return a transformation that translates an image."""
+        return AffineTransform([[1.0, 0.0, translate_x],
+                                [0.0, 1.0, translate_y], [0.0, 0.0, 1.0]],
+                               width, height)
+
+    def then(self, transform):
+        """Return this transformation followed by the given one."""
+        return AffineTransform(transform.matrix @ self.matrix,
+                               transform.width, transform.height)
+
+    def is_identity_for(self, img):
+        """Return whether this transformation would leave img unchanged."""
+        height, width = img.shape[0], img.shape[1]
+
+        return (width == self.width and height == self.height
+                and np.allclose(self.matrix, np.eye(3)))
+
+    def transform_image(self, img):
+        """Resample an image with this transformation.
+
+        Parts of the destination image that do not come from the source
+        image are filled with black.
+        """
+        warp_matrix = (PIXEL_CORNER_TO_CENTER @ self.matrix
+                       @ PIXEL_CENTER_TO_CORNER)
+
+        transformed = cv2.warpAffine(np.ascontiguousarray(img),
+                                     warp_matrix[:2],
+                                     (self.width, self.height))
+
+        # cv2 drops the channel dimension of single-channel images
+        if len(transformed.shape) == 2:
+            transformed = transformed.reshape(self.height, self.width, 1)
+
+        return transformed
+
+    def transform_bboxes(self, bboxes, alpha=0.25):
+        """Transform bounding boxes with this transformation.
+
+        Each bounding box becomes the smallest box enclosing its
+        transformed corners. Boxes are then clipped to the destination
+        image, and boxes with less than alpha of their area left inside
+        the image are dropped.
+        """
+        if bboxes.size == 0:
+            return bboxes
+
+        corners = bbox_utilities.get_corners(bboxes).reshape(-1, 4, 2)
+        corners = (corners @ self.matrix[:2, :2].T +
+                   self.matrix[:2, 2]).reshape(-1, 8)
+
+        enclosing = bbox_utilities.get_enclosing_box(
+            np.hstack((corners, bboxes[:, 4:])))
+
+        return bbox_utilities.clip_box(enclosing,
+                                       [0, 0, self.width, self.height], alpha)
+
+    def apply(self, img, bboxes):
+        """Transform an image and its bounding boxes."""
+        if self.is_identity_for(img):
+            return img, bboxes
+
+        return self.transform_image(img), self.transform_bboxes(bboxes)
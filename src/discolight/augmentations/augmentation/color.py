@@ -0,0 +1,113 @@
+"""Per-pixel color transformations of images."""
+import numpy as np
+import cv2
+
+
+def apply_per_pixel(img, transform, out=None):
+    """Apply an OpenCV per-pixel function to an image or batch of images.
+
+    img may be either an HxWxC image or an NxHxWxC batch of images. Since
+    the function only looks at one pixel at a time, a batch is presented
+    to it as a single (N*H)xWxC image. transform is called with this image
+    and the array to write the result to, or None to allocate a new one.
+
+    If out is given, the result is written to it instead of a new array.
+    out must be a contiguous uint8 array with the same shape as img, and
+    may be img itself.
+    """
+    shape = img.shape
+    flat = np.ascontiguousarray(img).reshape(-1, shape[-2], shape[-1])
+
+    if out is None:
+        return transform(flat, None).reshape(shape)
+
+    if (out.shape != shape or out.dtype != np.uint8
+            or not out.flags.c_contiguous):
+        raise ValueError(
+            "out must be a contiguous uint8 array of shape {}".format(shape))
+
+    transform(flat, out.reshape(flat.shape))
+
+    return out
+
+
+class ColorLUT:
+
+    """A lookup table mapping each channel value to a new value.
+
+    The table has one column of 256 entries per channel, and can be applied
+    to 8-bit images in a single pass without any floating point
+    intermediates.
+    """
+
+    def __init__(self, table):
+        """Construct a lookup table from a 256xC array of channel values.
+
+        Values are rounded and clipped to [0, 255].
+        """
+        table = np.clip(np.round(np.asarray(table, dtype=np.float64)), 0,
+                        255)
+
+        self.channels = table.shape[1]
+        self.table = table.astype(np.uint8).reshape(256, 1, self.channels)
+
+    @staticmethod
+    def from_function(func, channels=3):
+        """Construct a lookup table by evaluating a function.
+
+        func is given a 256xC float array whose rows are the channel values
+        0 to 255, and should return the 256xC array of new values.
+        """
+        values = np.repeat(np.arange(256, dtype=np.float64)[:, np.newaxis],
+                           channels,
+                           axis=1)
+
+        return ColorLUT(func(values))
+
+    def supports(self, img):
+        """Return whether this table can be applied to img."""
+        return img.dtype == np.uint8 and img.shape[-1] == self.channels
+
+    def apply(self, img, out=None):
+        """Map each channel value of an image or batch through the table.
+
+        If out is given, the result is written to it (see apply_per_pixel).
+        """
+        return apply_per_pixel(
+            img, lambda flat, dst: cv2.LUT(flat, self.table, dst=dst), out)
+
+
+class ColorMatrix:
+
+    """A matrix mapping the color of each pixel to a new color.
+
+    A CxC matrix gives the new channel values of each pixel as linear
+    combinations of its old ones. Results are rounded and saturated to
+    [0, 255], so 8-bit images are transformed in a single pass without any
+    floating point intermediates.
+    """
+
+    def __init__(self, matrix):
+        """Construct a color matrix."""
+        self.matrix = np.asarray(matrix, dtype=np.float64)
+        self.channels = self.matrix.shape[1]
+
+    def supports(self, img):
+        """Return whether this matrix can be applied to img."""
+        return img.dtype == np.uint8 and img.shape[-1] == self.channels
+
+    def apply(self, img, out=None):
+        """Transform the color of each pixel of an image or batch.
+
+        If out is given, the result is written to it (see apply_per_pixel).
+        """
+        return apply_per_pixel(
+            img, lambda flat, dst: cv2.transform(flat, self.matrix, dst=dst),
+            out)
+
+    def apply_float(self, img):
+        """Transform the color of each pixel of a non 8-bit image.
+
+        The result is a float64 array that is neither rounded nor clipped.
+        """
+        return img @ self.matrix.T
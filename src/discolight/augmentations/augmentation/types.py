@@ -114,12 +114,33 @@ class NumericalRange:
         return (floor, ceil)
 
 
+def stack_images(images):
+    """Stack a list of images into a single NxHxWxC array.
+
+    The images are only stacked if they all have the same shape and type.
+    Otherwise, they are returned as a list.
+    """
+    images = list(images)
+
+    if len(images) < 1 or any(img.shape != images[0].shape
+                              or img.dtype != images[0].dtype
+                              for img in images):
+        return images
+
+    return np.stack(images)
+
+
 class Augmentation(ABC):
 
     """An image augmentation."""
 
     _include_in_factory = True
 
+    # Whether augment may modify the image it is given in place.
+    # Augmentations that never do should set this to False, so that
+    # callers know they do not have to copy images before augmenting them.
+    mutates_image = True
+
     @staticmethod
     @abstractmethod
     def params():
@@ -144,6 +165,44 @@ class Augmentation(ABC):
         """
         raise NotImplementedError
 
+    def augment_batch(self, images, bboxes_list):
+        """Perform the augmentation on a batch of images and annotations.
+
+        images can either be a list of images in HxWxC format, or a single
+        NxHxWxC numpy array of images, and bboxes_list is a list with the
+        bounding boxes of each image (in the same format as for augment).
+        A tuple of the augmented images and their bounding boxes is
+        returned. If images is an array, the augmented images are returned
+        as an array too, as long as they all have the same shape.
+
+        The default implementation augments each image in turn.
+        Augmentations should override this method if they can process a
+        whole batch of images at once.
+        """
+        results = [
+            self.augment(img, bboxes)
+            for img, bboxes in zip(images, bboxes_list)
+        ]
+
+        aug_images = [aug_img for aug_img, _ in results]
+
+        if isinstance(images, np.ndarray):
+            aug_images = stack_images(aug_images)
+
+        return aug_images, [aug_bboxes for _, aug_bboxes in results]
+
+    def augment_preserving_input(self, img, bboxes):
+        """Perform the augmentation without modifying img or bboxes.
+
+        The image is only copied if this augmentation mutates the image it
+        is given. The returned image may be img itself, or a view of it,
+        so it should not be modified in place either.
+        """
+        if self.mutates_image:
+            img = img.copy()
+
+        return self.augment(img, bboxes.copy())
+
     def get_img(self, img):
         """Perform the augmentation on an image with no bounding boxes."""
         bboxes = np.empty((0, 5))
@@ -158,7 +217,7 @@ class ColorAugmentation(Augmentation):
     ColorAugmentations do not modify image annotations.
 
     Implementations of this class should only override the params and
-    augment_img methods.
+    augment_img methods, and optionally augment_img_batch.
     """
 
     @staticmethod
@@ -171,6 +230,71 @@ class ColorAugmentation(Augmentation):
     def augment_img(self, img, bboxes):
         """Perform the augmentation, returning only the augmented image."""
 
+    def augment_img_batch(self, images, bboxes_list):
+        """Perform the augmentation on an NxHxWxC array of images.
+
+        The augmented images should be returned as an array as well. The
+        default implementation augments each image in turn; override this
+        method with a vectorized implementation where possible.
+        """
+        return stack_images(
+            self.augment_img(img, bboxes)
+            for img, bboxes in zip(images, bboxes_list))
+
     def augment(self, img, bboxes):
         """Perform the augmentation on an image and its annotations."""
         return self.augment_img(img, bboxes), bboxes
+
+    def augment_batch(self, images, bboxes_list):
+        """Perform the augmentation on a batch of images and annotations.
+
+        Images of the same shape are augmented together with
+        augment_img_batch.
+        """
+        batch = (images
+                 if isinstance(images, np.ndarray) else stack_images(images))
+
+        if not isinstance(batch, np.ndarray):
+            return super().augment_batch(images, bboxes_list)
+
+        aug_images = self.augment_img_batch(batch, bboxes_list)
+
+        if not isinstance(images, np.ndarray):
+            aug_images = list(aug_images)
+
+        return aug_images, bboxes_list
+
+
+class AffineAugmentation(Augmentation):
+
+    """An image augmentation that is an affine transformation of the image.
+
+    AffineAugmentations describe themselves with an AffineTransform, so
+    that a Sequence of them can be combined into a single transformation
+    that only resamples the image once.
+
+    Implementations of this class should only need to override the params
+    and get_transform methods.
+    """
+
+    mutates_image = False
+
+    @staticmethod
+    @abstractmethod
+    def params():
+        """Return a Params object describing constructor parameters."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_transform(self, height, width):
+        """Return the AffineTransform for an image of the given size.
+
+        Augmentations with random parameters should draw them each time
+        this method is called, as they would for every call to augment.
+        """
+
+    def augment(self, img, bboxes):
+        """Perform the augmentation on an image and its annotations."""
+        height, width = img.shape[0], img.shape[1]
+
+        return self.get_transform(height, width).apply(img, bboxes)
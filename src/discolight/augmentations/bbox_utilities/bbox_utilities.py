@@ -2,6 +2,9 @@
 import numpy as np
 import cv2
 
+from discolight.util.bufferpool import get_buffer_pool
+from discolight.util.profiler import count
+
 
 def draw_rect(img, bboxes, color=None, stroke=None):
     """Draw annotation bounding boxes on the image as red rectangles."""
@@ -13,7 +16,7 @@ def draw_rect(img, bboxes, color=None, stroke=None):
         pt1 = int(pt1[0]), int(pt1[1])
         pt2 = int(pt2[0]), int(pt2[1])
         stroke = int(max(img.shape[:2]) / 200) if stroke is None else stroke
-        img = cv2.rectangle(img.copy(), pt1, pt2, color, stroke)
+        img = cv2.rectangle(img, pt1, pt2, color, stroke)
     return img
 
 
@@ -36,6 +39,9 @@ def clip_box(bbox, clipping_box, alpha):
     delta_area = (area - bbox_area(bbox)) / area
     mask = (delta_area < (1 - alpha)).astype(int)
     bbox = bbox[mask == 1, :]
+
+    count("boxes_dropped_by_clip_box", len(mask) - len(bbox))
+
     return bbox
 
 
@@ -111,9 +117,16 @@ def letterbox_image(img, input_dim, interpolation=cv2.INTER_LINEAR):
     width, height = input_dimension
     new_w = int(img_w * min(width / img_w, height / img_h))
     new_h = int(img_h * min(width / img_w, height / img_h))
-    resized_image = cv2.resize(img, (new_w, new_h), interpolation)
-    canvas = np.full((input_dimension[1], input_dimension[0], 3), 0)
-    canvas[(height - new_h) // 2:(height - new_h) // 2 + new_h,
-           (width - new_w) // 2:(width - new_w) // 2 +
-           new_w, :, ] = resized_image
+    canvas = np.zeros((input_dimension[1], input_dimension[0], 3),
+                      dtype=img.dtype)
+
+    with get_buffer_pool().borrowed((new_h, new_w) + img.shape[2:],
+                                    img.dtype) as buf:
+        resized_image = cv2.resize(img, (new_w, new_h),
+                                   dst=buf,
+                                   interpolation=interpolation)
+        canvas[(height - new_h) // 2:(height - new_h) // 2 + new_h,
+               (width - new_w) // 2:(width - new_w) // 2 +
+               new_w, :, ] = resized_image
+
     return canvas
@@ -2,6 +2,7 @@
 import numpy as np
 
 from discolight.params.params import Params
+from .augmentation.color import ColorLUT
 from .augmentation.types import ColorAugmentation, BoundedNumber
 from .decorators.accepts_probs import accepts_probs
 
@@ -433,6 +434,8 @@ class ColorTemperature(ColorAugmentation):
     library can be found at <https://github.com/aleju/imgaug/>
     """
 
+    mutates_image = False
+
     def __init__(self, kelvin):
         """Initialize parameters and RGB multiplier table."""
         super().__init__()
@@ -441,6 +444,10 @@ class ColorTemperature(ColorAugmentation):
 
         self.kelvin_table = create_kelvin_table()
 
+        self.rgb_multiplier = self._convert_kelvin_to_rgb_multiplier(kelvin)
+        self.lut = ColorLUT.from_function(lambda values: np.round(
+            values.astype(np.float32) * self.rgb_multiplier))
+
     @staticmethod
     def params():
         """Return a Params object describing constructor parameters."""
@@ -458,7 +465,11 @@ class ColorTemperature(ColorAugmentation):
 
     def augment_img(self, img, _bboxes):
         """Augment an image."""
-        rgb_multiplier = self._convert_kelvin_to_rgb_multiplier(self.kelvin)
+        if self.lut.supports(img):
+            return self.lut.apply(img)
+
+        return np.round(img.astype(np.float32) * self.rgb_multiplier)
 
-        output_img = np.round(img.astype(np.float32) * rgb_multiplier)
-        return output_img
+    def augment_img_batch(self, images, bboxes_list):
+        """Augment an NxHxWxC array of images all at once."""
+        return self.augment_img(images, bboxes_list)
@@ -1,6 +1,11 @@
 """Decorators for augmentations."""
 import random
-from ..augmentation.types import Augmentation, BoundedNumber
+
+import numpy as np
+from discolight.util.profiler import profiled
+from ..augmentation.affine import AffineTransform
+from ..augmentation.types import (AffineAugmentation, Augmentation,
+                                  BoundedNumber, stack_images)
 
 
 # yapf: disable
@@ -10,8 +15,14 @@ def accepts_probs(augmentation):
     Use this function as a decorator for augmentation classes. A probs
     parameter will be added to your augmentation that determines the
     probabililty of the augmentation being applied.
+
+    If the augmentation is an AffineAugmentation, so is the decorated
+    augmentation.
     """
-    class AcceptsProbsAugmentation(Augmentation):
+    base = (AffineAugmentation
+            if issubclass(augmentation, AffineAugmentation) else Augmentation)
+
+    class AcceptsProbsAugmentation(base):
 
         # pylint: disable=protected-access
         _include_in_factory = augmentation._include_in_factory
@@ -22,6 +33,10 @@ def accepts_probs(augmentation):
             self.probs = probs
             self.augmentation = augmentation(**params)
 
+        @property
+        def mutates_image(self):
+            return self.augmentation.mutates_image
+
         @staticmethod
         def params():
             return augmentation.params().add(
@@ -32,10 +47,52 @@ def accepts_probs(augmentation):
         def augment(self, img, bboxes):
 
             if random.random() < self.probs:
-                return self.augmentation.augment(img, bboxes)
+                with profiled(augmentation.__name__):
+                    return self.augmentation.augment(img, bboxes)
 
             return img, bboxes
 
+        def augment_batch(self, images, bboxes_list):
+
+            applied = [
+                idx for idx in range(len(images))
+                if random.random() < self.probs
+            ]
+
+            if len(applied) == len(images):
+                with profiled(augmentation.__name__):
+                    return self.augmentation.augment_batch(images,
+                                                           bboxes_list)
+
+            if len(applied) < 1:
+                return images, bboxes_list
+
+            selected = (images[applied] if isinstance(images, np.ndarray)
+                        else [images[idx] for idx in applied])
+
+            with profiled(augmentation.__name__):
+                selected, selected_bboxes = self.augmentation.augment_batch(
+                    selected, [bboxes_list[idx] for idx in applied])
+
+            aug_images = list(images)
+            aug_bboxes_list = list(bboxes_list)
+
+            for idx, img, bboxes in zip(applied, selected, selected_bboxes):
+                aug_images[idx] = img
+                aug_bboxes_list[idx] = bboxes
+
+            if isinstance(images, np.ndarray):
+                aug_images = stack_images(aug_images)
+
+            return aug_images, aug_bboxes_list
+
+        def get_transform(self, height, width):
+
+            if random.random() < self.probs:
+                return self.augmentation.get_transform(height, width)
+
+            return AffineTransform.identity(width, height)
+
     AcceptsProbsAugmentation.__name__ = augmentation.__name__
     AcceptsProbsAugmentation.__doc__ = augmentation.__doc__
 
@@ -1,9 +1,8 @@
 """A Gaussian noise augmentation."""
-import random
-from math import floor
+from math import sqrt
 import numpy as np
-from skimage.util import random_noise
 from discolight.params.params import Params
+from discolight.util.rng import get_rng
 from .augmentation.types import ColorAugmentation
 from .decorators.accepts_probs import accepts_probs
 
@@ -13,6 +12,8 @@ class GaussianNoise(ColorAugmentation):
 
     """Add gaussian noise to the given image."""
 
+    mutates_image = False
+
     def __init__(self, mean, variance):
         """Construct a GaussianNoise augmenation.
 
@@ -31,14 +32,18 @@ class GaussianNoise(ColorAugmentation):
                                                       0.01)
 
     def augment_img(self, img, _bboxes):
-        """Augment an image."""
-        gaussian_noise = random_noise(
-            img,
-            mode="gaussian",
-            seed=floor(random.random() * 1000000),
-            clip=True,
-            mean=self.mean,
-            var=self.variance,
-        )
-        gaussian_noise_img = np.array(255 * gaussian_noise, dtype=np.uint8)
-        return gaussian_noise_img
+        """Augment an image.
+
+        The mean and variance of the noise are relative to pixel values
+        scaled to [0, 1]. Noisy values are clipped to the valid range.
+        """
+        noisy_img = get_rng().standard_normal(img.shape, dtype=np.float32)
+        noisy_img *= 255 * sqrt(self.variance)
+        noisy_img += 255 * self.mean
+        noisy_img += img
+
+        return np.clip(noisy_img, 0, 255, out=noisy_img).astype(np.uint8)
+
+    def augment_img_batch(self, images, bboxes_list):
+        """Augment an NxHxWxC array of images all at once."""
+        return self.augment_img(images, bboxes_list)
@@ -1,15 +1,21 @@
 """An augmentation that converts images to grayscale."""
 import numpy as np
 from discolight.params.params import Params
+from .augmentation.color import ColorMatrix
 from .augmentation.types import ColorAugmentation
 from .decorators.accepts_probs import accepts_probs
 
+GRAYSCALE_WEIGHTS = [0.299, 0.587, 0.114]
+GRAYSCALE_MATRIX = ColorMatrix([GRAYSCALE_WEIGHTS] * 3)
+
 
 @accepts_probs
 class GrayScale(ColorAugmentation):
 
     """Return a grayscale version of the given image."""
 
+    mutates_image = False
+
     @staticmethod
     def params():
         """Return a Params object describing constructor parameters."""
@@ -17,15 +23,15 @@ class GrayScale(ColorAugmentation):
 
     def augment_img(self, img, _bboxes):
         """Augment an image."""
-        grayscale_img = np.zeros(img.shape)
-        red, green, blue = (
-            np.array(img[:, :, 0]),
-            np.array(img[:, :, 1]),
-            np.array(img[:, :, 2]),
-        )
-        red, green, blue = red * 0.299, green * 0.587, blue * 0.114
-        avg = red + green + blue
-        grayscale_img = img
+        if GRAYSCALE_MATRIX.supports(img):
+            return GRAYSCALE_MATRIX.apply(img)
+
+        avg = img[..., :3] @ np.array(GRAYSCALE_WEIGHTS)
+        grayscale_img = img.copy()
         for i in range(3):
-            grayscale_img[:, :, i] = avg
+            grayscale_img[..., i] = avg
         return grayscale_img
+
+    def augment_img_batch(self, images, bboxes_list):
+        """Augment an NxHxWxC array of images all at once."""
+        return self.augment_img(images, bboxes_list)
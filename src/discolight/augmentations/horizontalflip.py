@@ -1,12 +1,13 @@
 """A horizontal flip augmentation."""
 import numpy as np
 from discolight.params.params import Params
-from .augmentation.types import Augmentation
+from .augmentation.affine import AffineTransform
+from .augmentation.types import AffineAugmentation
 from .decorators.accepts_probs import accepts_probs
 
 
 @accepts_probs
-class HorizontalFlip(Augmentation):
+class HorizontalFlip(AffineAugmentation):
 
     """Horizontally flips the given image."""
 
@@ -15,6 +16,11 @@ class HorizontalFlip(Augmentation):
         """Return a Params object describing constructor parameters."""
         return Params()
 
+    def get_transform(self, height, width):
+        """Return the AffineTransform for an image of the given size."""
+        return AffineTransform([[-1, 0, width], [0, 1, 0], [0, 0, 1]], width,
+                               height)
+
     def augment(self, img, bboxes):
         """Augment an image."""
         hor_flip_img = img[:, ::-1, :]
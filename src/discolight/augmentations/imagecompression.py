@@ -13,6 +13,8 @@ class ImageCompression(ColorAugmentation):
     This function is a lossy JPEG compression operation.
     """
 
+    mutates_image = False
+
     def __init__(self, strength):
         """Construct a ImageCompression augmentation.
 
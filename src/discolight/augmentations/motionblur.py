@@ -26,6 +26,8 @@ class MotionBlur(Augmentation):
 
     """Add motionblur to a given image."""
 
+    mutates_image = False
+
     def __init__(self, kernel_size, direction):
         """Construct a MotionBlur augmenation.
 
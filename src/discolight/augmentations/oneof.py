@@ -20,6 +20,9 @@ class OneOf(Augmentation):
         super().__init__()
 
         self.augmentations = augmentations
+        self.mutates_image = any(
+            getattr(augmentation, "mutates_image", True)
+            for augmentation in augmentations)
 
     @staticmethod
     def params():
@@ -1,21 +1,39 @@
 """An augmentation that randomly crops an image."""
 import random
+import numpy as np
 import cv2
 from discolight.params.params import Params
 from .augmentation.types import Augmentation, BoundedNumber
 from .decorators.accepts_probs import accepts_probs
 
 
+# The number of crop sizes that are tried before giving up on finding a
+# crop that keeps at least one bounding box
+MAX_CROP_ATTEMPTS = 100
+
+
 def get_bboxes_in_cropped_area(x, y, w, h, bboxes):
     """Filter out bounding boxes within the given cropped area."""
-    bboxes_filter = []
+    return bboxes[(bboxes[:, 0] >= x) & (bboxes[:, 1] >= y)
+                  & (bboxes[:, 2] <= (x + w)) & (bboxes[:, 3] <= (y + h))]
+
 
-    for item in bboxes:
-        # if xmin is greater or equal to x, if bbox is inside the crop
-        bboxes_filter.append((item[0] >= x) and (item[1] >= y)
-                             and (item[2] <= (x + w)) and (item[3] <= (y + h)))
+def get_crop_positions(w, h, bboxes):
+    """Find the positions of a crop that keep each bounding box.
 
-    return bboxes[bboxes_filter]
+    Crops are w x h in size, and their top left corner (x, y) may be
+    anywhere in [0, w] x [0, h]. For each bounding box, the range of
+    integer positions of such a crop that contain the box is returned as a
+    row of an n x 4 array with the columns x_min, y_min, x_max, y_max
+    (all inclusive). The ranges are empty (min > max) for boxes that no
+    crop of this size can contain.
+    """
+    return np.column_stack((
+        np.maximum(np.ceil(bboxes[:, 2] - w), 0),
+        np.maximum(np.ceil(bboxes[:, 3] - h), 0),
+        np.minimum(np.floor(bboxes[:, 0]), w),
+        np.minimum(np.floor(bboxes[:, 1]), h),
+    )).astype(int)
 
 
 @accepts_probs
@@ -23,6 +41,8 @@ class RandomCrop(Augmentation):
 
     """Randomly crops the given image."""
 
+    mutates_image = False
+
     def __init__(self, min_width, min_height, max_width, max_height):
         """Construct a RandomCrop augmenation.
 
@@ -52,27 +72,48 @@ class RandomCrop(Augmentation):
                                   "(normalized)", BoundedNumber(float, 0,
                                                                 1), 0.1)
 
-    def augment(self, img, bboxes, iteration=100):
-        """Augment an image."""
-        if iteration <= 0:
-            raise RuntimeError(
-                "Couldn't find crop that did not keep some bounding boxes.")
+    def augment(self, img, bboxes, iteration=MAX_CROP_ATTEMPTS):
+        """Augment an image.
 
+        If the image has bounding boxes, the crop always keeps at least
+        one of them. A crop position is first drawn at random, as for
+        images without bounding boxes. If that crop does not contain any
+        box, a box that fits in the crop is chosen at random instead, and
+        the crop is positioned so that it contains the box. Only if no box
+        fits is a new crop size drawn, up to iteration times in total.
+        """
         height, width, _ = img.shape
 
-        crop_width = random.randint(int(width * self.min_width),
-                                    int(width * self.max_width))
-        crop_height = random.randint(int(height * self.min_height),
-                                     int(height * self.max_height))
-
-        x = random.randint(0, crop_width)
-        y = random.randint(0, crop_height)
-        reduced_bboxes = get_bboxes_in_cropped_area(x, y, crop_width,
-                                                    crop_height, bboxes)
-
-        # if no bbox, get_aug return false; and recall .get_aug
-        if reduced_bboxes.size == 0 and bboxes.size > 0:
-            return self.augment(img, bboxes, iteration - 1)
+        for _ in range(iteration):
+            crop_width = random.randint(int(width * self.min_width),
+                                        int(width * self.max_width))
+            crop_height = random.randint(int(height * self.min_height),
+                                         int(height * self.max_height))
+
+            x = random.randint(0, crop_width)
+            y = random.randint(0, crop_height)
+            reduced_bboxes = get_bboxes_in_cropped_area(
+                x, y, crop_width, crop_height, bboxes)
+
+            if reduced_bboxes.size > 0 or bboxes.size == 0:
+                break
+
+            positions = get_crop_positions(crop_width, crop_height, bboxes)
+            positions = positions[(positions[:, 0] <= positions[:, 2])
+                                  & (positions[:, 1] <= positions[:, 3])]
+
+            if len(positions) > 0:
+                x_min, y_min, x_max, y_max = positions[random.randrange(
+                    len(positions))]
+
+                x = random.randint(x_min, x_max)
+                y = random.randint(y_min, y_max)
+                reduced_bboxes = get_bboxes_in_cropped_area(
+                    x, y, crop_width, crop_height, bboxes)
+                break
+        else:
+            raise RuntimeError(
+                "Couldn't find crop that did not keep some bounding boxes.")
 
         cropped_img = img[y:y + crop_height, x:x + crop_width]
 
@@ -1,19 +1,33 @@
 """An augmentation that erases random parts of an image."""
 import random
+from enum import Enum
+import numpy as np
 from discolight.params.params import Params
-from .augmentation.types import ColorAugmentation, NumericalRange
+from discolight.util.rng import get_rng
+from .augmentation.types import (ColorAugmentation, NumericalRange,
+                                 BoundedNumber)
 from .decorators.accepts_probs import accepts_probs
 
 
+class FillMode(Enum):
+
+    """How the RandomEraser augmentation fills the erased area."""
+
+    NOISE = "NOISE"
+    CONSTANT = "CONSTANT"
+    MEAN = "MEAN"
+
+
 @accepts_probs
 class RandomEraser(ColorAugmentation):
 
     """Randomly erase a rectangular area in the given image.
 
-    The erased area is replaced with random noise.
+    By default, the erased area is replaced with random noise. It can also
+    be filled with a constant value, or with the mean color of the image.
     """
 
-    def __init__(self, x_range, y_range):
+    def __init__(self, x_range, y_range, fill_mode, fill_value):
         """Construct a RandomEraser augmentation.
 
         You should probably use the augmentation factory or Discolight
@@ -23,6 +37,8 @@ class RandomEraser(ColorAugmentation):
         super().__init__()
         self.x_range = x_range
         self.y_range = y_range
+        self.fill_mode = fill_mode
+        self.fill_value = fill_value
 
     @staticmethod
     def params():
@@ -32,7 +48,14 @@ class RandomEraser(ColorAugmentation):
             NumericalRange(0.0, 1.0), (0.0, 1.0)).add(
                 "y_range",
                 "normalized y range for coordinates that may be erased",
-                NumericalRange(0.0, 1.0), (0.0, 1.0))
+                NumericalRange(0.0, 1.0), (0.0, 1.0)).add(
+                    "fill_mode",
+                    "How to fill the erased area: with random noise, a "
+                    "constant value, or the mean color of the image",
+                    FillMode, "NOISE").add(
+                        "fill_value",
+                        "The value to fill the erased area with in CONSTANT "
+                        "fill mode", BoundedNumber(int, 0, 255), 0)
 
     def augment_img(self, img, _bboxes):
         """Augment an image."""
@@ -54,17 +77,23 @@ class RandomEraser(ColorAugmentation):
             y_min = int(random.uniform(y_floor, y_ceil))
             y_max = int(random.uniform(y_floor, y_ceil))
 
-        # here must be int, because if not img[eraser_width etc]
-        # does not take in float or decimals.
-        eraser_width = int(x_max - x_min)
-        eraser_height = int(y_max - y_min)
-
-        # Iterate and Apply Eraser
-        for row_idx in range(y_min, y_min + eraser_height):
-            for col_idx in range(x_min, x_min + eraser_width):
-                img[row_idx, col_idx] = [
-                    random.uniform(0, 255),
-                    random.uniform(0, 255),
-                    random.uniform(0, 255),
-                ]
+        eraser = img[y_min:y_max, x_min:x_max]
+
+        if self.fill_mode == FillMode.CONSTANT:
+            eraser[...] = self.fill_value
+        elif self.fill_mode == FillMode.MEAN:
+            eraser[...] = np.round(
+                img.reshape(-1, img.shape[2]).mean(axis=0))
+        else:
+            rng = get_rng()
+
+            if np.issubdtype(img.dtype, np.integer):
+                eraser[...] = rng.integers(0,
+                                           255,
+                                           eraser.shape,
+                                           dtype=img.dtype,
+                                           endpoint=True)
+            else:
+                eraser[...] = rng.uniform(0, 255, eraser.shape)
+
         return img
@@ -2,15 +2,32 @@
 import random
 import numpy as np
 from discolight.params.params import Params
+from .augmentation.color import ColorLUT
 from .augmentation.types import ColorAugmentation, NumericalRange
 from .decorators.accepts_probs import accepts_probs
 
+# The upper bound of each channel after shifting
+CHANNEL_MAXIMUMS = np.array([179, 255, 255])
+
+
+def shift_channels(img, hsv_array):
+    """Shift the channels of an image or batch, clipping the results."""
+    return np.clip(img + hsv_array, 0, CHANNEL_MAXIMUMS).astype(np.uint8)
+
+
+def make_shift_lut(hsv_array):
+    """Return a lookup table that shifts the channels of an image."""
+    return ColorLUT.from_function(
+        lambda values: shift_channels(values, hsv_array))
+
 
 @accepts_probs
 class RandomHSV(ColorAugmentation):
 
     """Randomly shift the color space of the given image."""
 
+    mutates_image = False
+
     def __init__(self, hue, saturation, brightness):
         """Construct a RandomHSV augmentation.
 
@@ -31,15 +48,40 @@ class RandomHSV(ColorAugmentation):
             "saturation", "", NumericalRange(),
             (0.0, 0.0)).add("brightness", "", NumericalRange(), (0.0, 0.0))
 
+    def _random_hsv_array(self):
+        """Draw a random shift for each channel."""
+        return np.array([
+            random.randint(*self.hue),
+            random.randint(*self.saturation),
+            random.randint(*self.brightness)
+        ])
+
     def augment_img(self, img, _bboxes):
         """Augment an image."""
-        hue = random.randint(*self.hue)
-        saturation = random.randint(*self.saturation)
-        brightness = random.randint(*self.brightness)
-        img = img.astype(int)
-        hsv_array = np.array([hue, saturation, brightness]).astype(int)
-        img += np.reshape(hsv_array, (1, 1, 3))
-        img = np.clip(img, 0, 255)
-        img[:, :, 0] = np.clip(img[:, :, 0], 0, 179)
-        img = img.astype(np.uint8)
-        return img
+        hsv_array = self._random_hsv_array()
+
+        lut = make_shift_lut(hsv_array)
+
+        if lut.supports(img):
+            return lut.apply(img)
+
+        return shift_channels(img.astype(int), hsv_array)
+
+    def augment_img_batch(self, images, _bboxes_list):
+        """Augment an NxHxWxC array of images all at once.
+
+        A different shift is drawn for each image in the batch.
+        """
+        hsv_arrays = [self._random_hsv_array() for _ in range(len(images))]
+
+        if images.dtype != np.uint8:
+            return shift_channels(
+                images.astype(int),
+                np.reshape(hsv_arrays, (len(images), 1, 1, 3)))
+
+        aug_images = np.empty_like(images)
+
+        for img, hsv_array, aug_img in zip(images, hsv_arrays, aug_images):
+            make_shift_lut(hsv_array).apply(img, out=aug_img)
+
+        return aug_images
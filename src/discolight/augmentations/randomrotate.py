@@ -1,13 +1,13 @@
 """An augmentation to randomly rotate an image."""
 import random
 from discolight.params.params import Params
-from .augmentation.types import Augmentation, NumericalRange
+from .augmentation.types import AffineAugmentation, NumericalRange
 from .rotate import Rotate
 from .decorators.accepts_probs import accepts_probs
 
 
 @accepts_probs
-class RandomRotate(Augmentation):
+class RandomRotate(AffineAugmentation):
 
     """Randomly rotate the given image."""
 
@@ -32,6 +32,12 @@ class RandomRotate(Augmentation):
             (-10.0, 10.0),
         )
 
+    def get_transform(self, height, width):
+        """Return the AffineTransform for an image of the given size."""
+        angle = random.uniform(*self.angle_range)
+
+        return Rotate(angle=angle).get_transform(height, width)
+
     def augment(self, img, bboxes):
         """Augment an image."""
         angle = random.uniform(*self.angle_range)
@@ -1,13 +1,13 @@
 """An augmentation to randomly rotate an image."""
 import random
 from discolight.params.params import Params
-from .augmentation.types import Augmentation, NumericalRange
+from .augmentation.types import AffineAugmentation, NumericalRange
 from .scale import Scale
 from .decorators.accepts_probs import accepts_probs
 
 
 @accepts_probs
-class RandomScale(Augmentation):
+class RandomScale(AffineAugmentation):
 
     """Randomly scale the given image."""
 
@@ -29,10 +29,17 @@ class RandomScale(Augmentation):
                             "The scale range should be bigger than -1",
                             NumericalRange(-1), (0.2, 0.2))
 
-    def augment(self, img, bboxes):
-        """Augment an image."""
+    def random_scale(self):
+        """Return a Scale augmentation with randomly drawn factors."""
         scale_factor_x = random.uniform(*self.scale_range)
         scale_factor_y = random.uniform(*self.scale_range)
 
-        return Scale(scale_x=scale_factor_x,
-                     scale_y=scale_factor_y).augment(img, bboxes)
+        return Scale(scale_x=scale_factor_x, scale_y=scale_factor_y)
+
+    def get_transform(self, height, width):
+        """Return the AffineTransform for an image of the given size."""
+        return self.random_scale().get_transform(height, width)
+
+    def augment(self, img, bboxes):
+        """Augment an image."""
+        return self.random_scale().augment(img, bboxes)
@@ -1,13 +1,13 @@
 """An augmentation to randomly rotate an image."""
 import random
 from discolight.params.params import Params
-from .augmentation.types import Augmentation, NumericalRange
+from .augmentation.types import AffineAugmentation, NumericalRange
 from .shear import Shear
 from .decorators.accepts_probs import accepts_probs
 
 
 @accepts_probs
-class RandomShear(Augmentation):
+class RandomShear(AffineAugmentation):
 
     """Randomly shear the given image."""
 
@@ -28,8 +28,16 @@ class RandomShear(Augmentation):
         return Params().add("shear_range", "The shear range has no bounds",
                             NumericalRange(), (0.2, 0.2))
 
-    def augment(self, img, bboxes):
-        """Augment an image."""
+    def random_shear(self):
+        """Return a Shear augmentation with a randomly drawn factor."""
         shear_factor = random.uniform(*self.shear_range)
 
-        return Shear(shear_factor=shear_factor).augment(img, bboxes)
+        return Shear(shear_factor=shear_factor)
+
+    def get_transform(self, height, width):
+        """Return the AffineTransform for an image of the given size."""
+        return self.random_shear().get_transform(height, width)
+
+    def augment(self, img, bboxes):
+        """Augment an image."""
+        return self.random_shear().augment(img, bboxes)
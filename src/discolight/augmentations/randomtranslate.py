@@ -1,13 +1,13 @@
 """An augmentation to randomly rotate an image."""
 import random
 from discolight.params.params import Params
-from .augmentation.types import Augmentation, NumericalRange
+from .augmentation.types import AffineAugmentation, NumericalRange
 from .translate import Translate
 from .decorators.accepts_probs import accepts_probs
 
 
 @accepts_probs
-class RandomTranslate(Augmentation):
+class RandomTranslate(AffineAugmentation):
 
     """Randomly Translate the given image."""
 
@@ -29,10 +29,18 @@ class RandomTranslate(Augmentation):
                             "The translate range should be within 0 and 1",
                             NumericalRange(0, 1), (0.2, 0.2))
 
-    def augment(self, img, bboxes):
-        """Augment an image."""
+    def random_translate(self):
+        """Return a Translate augmentation with randomly drawn factors."""
         translate_factor_x = random.uniform(*self.translate_range)
         translate_factor_y = random.uniform(*self.translate_range)
 
         return Translate(translate_x=translate_factor_x,
-                         translate_y=translate_factor_y).augment(img, bboxes)
+                         translate_y=translate_factor_y)
+
+    def get_transform(self, height, width):
+        """Return the AffineTransform for an image of the given size."""
+        return self.random_translate().get_transform(height, width)
+
+    def augment(self, img, bboxes):
+        """Augment an image."""
+        return self.random_translate().augment(img, bboxes)
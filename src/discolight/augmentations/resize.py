@@ -24,6 +24,8 @@ class Resize(Augmentation):
 
     """Resize an image without preserving aspect ratio."""
 
+    mutates_image = False
+
     def __init__(self, height, width, interpolation):
         """Construct a Resize augmenation.
 
@@ -96,6 +98,8 @@ class ResizeMaintainAspectRatio(Augmentation):
 
     """Resize an image while preserving aspect ratio."""
 
+    mutates_image = False
+
     def __init__(self, input_dim, interpolation):
         """Construct a ResizeMaintainAspectRatio augmenation.
 
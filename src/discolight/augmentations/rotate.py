@@ -2,13 +2,15 @@
 import numpy as np
 import cv2
 from discolight.params.params import Params
+from discolight.util.bufferpool import get_buffer_pool
 from .bbox_utilities import bbox_utilities
-from .augmentation.types import Augmentation
+from .augmentation.affine import AffineTransform
+from .augmentation.types import AffineAugmentation
 from .decorators.accepts_probs import accepts_probs
 
 
 @accepts_probs
-class Rotate(Augmentation):
+class Rotate(AffineAugmentation):
 
     """Rotate the given image."""
 
@@ -29,6 +31,26 @@ class Rotate(Augmentation):
         """Return a Params object describing constructor parameters."""
         return Params().add("angle", "", float, 5)
 
+    def get_transform(self, height, width):
+        """Return the AffineTransform for an image of the given size."""
+        transformation_matrix = cv2.getRotationMatrix2D(center=(width / 2,
+                                                                height / 2),
+                                                        angle=self.angle,
+                                                        scale=1.0)
+        sin_theta = np.abs(transformation_matrix[0][1])
+        cos_theta = np.abs(transformation_matrix[0][0])
+        new_width = (width * cos_theta) + (height * sin_theta)
+        new_height = (width * sin_theta) + (height * cos_theta)
+        transformation_matrix[0][2] += (new_width - width) / 2
+        transformation_matrix[1][2] += (new_height - height) / 2
+
+        # The rotated image is resized back to the original size
+        return AffineTransform(np.vstack((transformation_matrix, [0, 0, 1])),
+                               new_width, new_height).then(
+                                   AffineTransform.scaling(
+                                       width / new_width, height / new_height,
+                                       width, height))
+
     def augment(self, img, bboxes):
         """Augment an image."""
         angle = self.angle
@@ -46,9 +68,15 @@ class Rotate(Augmentation):
         translate_y = (new_height / 2) - center_y
         transformation_matrix[0][2] = transformation_matrix[0][2] + translate_x
         transformation_matrix[1][2] = transformation_matrix[1][2] + translate_y
-        rotated_img = cv2.warpAffine(img, transformation_matrix,
-                                     (new_width, new_height))
-        rotated_img_resized = cv2.resize(rotated_img, (width, height))
+        # The rotated image is only needed until it is resized, so it is
+        # rendered into a pooled buffer
+        with get_buffer_pool().borrowed((new_height, new_width) +
+                                        img.shape[2:], img.dtype) as buf:
+            rotated_img = cv2.warpAffine(img,
+                                         transformation_matrix,
+                                         (new_width, new_height),
+                                         dst=buf)
+            rotated_img_resized = cv2.resize(rotated_img, (width, height))
         # handle grayscale images with one channel, because cv2 will mess up
         # your  shape if your image is (28,28,1) it becomes (28,28)
         if len(rotated_img_resized.shape) == 2:
@@ -62,8 +90,8 @@ class Rotate(Augmentation):
                                                        center_x, center_y,
                                                        height, width)
             new_bbox = bbox_utilities.get_enclosing_box(corners)
-            scale_factor_x = rotated_img.shape[1] / width
-            scale_factor_y = rotated_img.shape[0] / height
+            scale_factor_x = new_width / width
+            scale_factor_y = new_height / height
             new_bbox[:, :4] = new_bbox[:, :4] / [
                 scale_factor_x,
                 scale_factor_y,
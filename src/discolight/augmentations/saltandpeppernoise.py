@@ -1,9 +1,7 @@
 """An augmentation that adds random noise to an image."""
-import random
-from math import floor
 from enum import Enum
-import numpy as np
 from discolight.params.params import Params
+from discolight.util.rng import get_rng
 from .augmentation.types import ColorAugmentation, BoundedNumber
 from .decorators.accepts_probs import accepts_probs
 
@@ -49,15 +47,18 @@ class SaltAndPepperNoise(ColorAugmentation):
 
     def augment_img(self, img, _bboxes):
         """Augment an image."""
-        np.random.seed(floor(random.random() * 1000000))
+        rng = get_rng()
 
         if self.noise_type == NoiseType.SnP:
-            random_matrix = np.random.rand(img.shape[0], img.shape[1])
+            random_matrix = rng.random(img.shape[:-1])
             img[random_matrix >= (1 - self.replace_probs)] = self.salt
             img[random_matrix <= self.replace_probs] = self.pepper
         elif self.noise_type == NoiseType.RGB:
-            random_matrix = np.random.rand(img.shape[0], img.shape[1],
-                                           img.shape[2])
+            random_matrix = rng.random(img.shape)
             img[random_matrix >= (1 - self.replace_probs)] = self.salt
             img[random_matrix <= self.replace_probs] = self.pepper
         return img
+
+    def augment_img_batch(self, images, bboxes_list):
+        """Augment an NxHxWxC array of images all at once."""
+        return self.augment_img(images, bboxes_list)
@@ -2,13 +2,15 @@
 import cv2
 import numpy as np
 from discolight.params.params import Params
+from discolight.util.bufferpool import get_buffer_pool
 from .bbox_utilities import bbox_utilities
-from .augmentation.types import Augmentation, BoundedNumber
+from .augmentation.affine import AffineTransform
+from .augmentation.types import AffineAugmentation, BoundedNumber
 from .decorators.accepts_probs import accepts_probs
 
 
 @accepts_probs
-class Scale(Augmentation):
+class Scale(AffineAugmentation):
 
     """Scale the given image."""
 
@@ -34,19 +36,32 @@ class Scale(Augmentation):
                             0.2).add("scale_y", "", BoundedNumber(float, -1.0),
                                      0.2)
 
+    def get_transform(self, height, width):
+        """Return the AffineTransform for an image of the given size."""
+        return AffineTransform.scaling(1 + self.scale_x, 1 + self.scale_y,
+                                       width, height)
+
     def augment(self, img, bboxes):
         """Augment an image."""
         height, width, _ = img.shape
         resize_scale_x = 1 + self.scale_x
         resize_scale_y = 1 + self.scale_y
-        resized_img = cv2.resize(img,
-                                 None,
-                                 fx=resize_scale_x,
-                                 fy=resize_scale_y)
+        # This is the size OpenCV computes for the resized image, so that
+        # it can be resized straight into a pooled buffer
+        resized_shape = (round(height * resize_scale_y),
+                         round(width * resize_scale_x)) + img.shape[2:]
         canvas = np.zeros(img.shape, dtype=np.uint8)
         x_lim = int(min(resize_scale_x, 1) * width)
         y_lim = int(min(resize_scale_y, 1) * height)
-        canvas[:y_lim, :x_lim, :] = resized_img[:y_lim, :x_lim, :]
+
+        with get_buffer_pool().borrowed(resized_shape, img.dtype) as buf:
+            resized_img = cv2.resize(img,
+                                     None,
+                                     dst=buf,
+                                     fx=resize_scale_x,
+                                     fy=resize_scale_y)
+            canvas[:y_lim, :x_lim, :] = resized_img[:y_lim, :x_lim, :]
+
         rescaled_img = canvas
 
         # code below transform the bboxes accordingly.
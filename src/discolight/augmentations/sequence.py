@@ -1,15 +1,25 @@
 """An augmentation that performs a sequence of augmentations on an image."""
 from discolight.params.params import Params
-from .augmentation.types import Augmentation, augmentation_list
+from .augmentation.types import (AffineAugmentation, Augmentation,
+                                 augmentation_list)
 from .decorators.accepts_probs import accepts_probs
 
 
 @accepts_probs
 class Sequence(Augmentation):
 
-    """Perform a sequence of augmentations on the given image."""
+    """Perform a sequence of augmentations on the given image.
 
-    def __init__(self, augmentations):
+    If fuse is true, consecutive affine augmentations (e.g., Rotate, Shear,
+    Scale, Translate, and flips) are combined into a single transformation,
+    so the image is only resampled once for all of them. Bounding boxes
+    are then transformed and clipped once as well, instead of after every
+    augmentation. Since parts of the image that leave the frame part-way
+    through are not lost, the result can differ slightly from applying
+    the augmentations one at a time.
+    """
+
+    def __init__(self, augmentations, fuse=False):
         """Construct a Sequence augmentation.
 
         You should probably use the augmentation factory or Discolight
@@ -19,16 +29,70 @@ class Sequence(Augmentation):
         super().__init__()
 
         self.augmentations = augmentations
+        self.mutates_image = any(
+            getattr(augmentation, "mutates_image", True)
+            for augmentation in augmentations)
+        self.fuse = fuse
 
     @staticmethod
     def params():
         """Return a Params object describing constructor parameters."""
-        return Params().add("augmentations", "", augmentation_list, [])
+        return Params().add("augmentations", "", augmentation_list, []).add(
+            "fuse", "Whether to combine consecutive affine augmentations "
+            "into a single transformation", bool, False)
 
     def augment(self, img, bboxes):
         """Augment an image."""
+        if self.fuse:
+            return self.augment_fused(img, bboxes)
+
         for augmentation in self.augmentations:
 
             img, bboxes = augmentation.augment(img, bboxes)
 
         return img, bboxes
+
+    def augment_batch(self, images, bboxes_list):
+        """Augment a batch of images.
+
+        Each augmentation is applied to the whole batch in turn. Fused
+        sequences augment one image at a time instead.
+        """
+        if self.fuse:
+            return super().augment_batch(images, bboxes_list)
+
+        for augmentation in self.augmentations:
+
+            images, bboxes_list = augmentation.augment_batch(
+                images, bboxes_list)
+
+        return images, bboxes_list
+
+    def augment_fused(self, img, bboxes):
+        """Augment an image, combining consecutive affine augmentations."""
+        transform = None
+
+        for augmentation in self.augmentations:
+
+            if isinstance(augmentation, AffineAugmentation):
+
+                if transform is None:
+                    transform = augmentation.get_transform(
+                        img.shape[0], img.shape[1])
+                else:
+                    transform = transform.then(
+                        augmentation.get_transform(transform.height,
+                                                   transform.width))
+
+                continue
+
+            if transform is not None:
+                img, bboxes = transform.apply(img, bboxes)
+                transform = None
+
+            img, bboxes = augmentation.augment(img, bboxes)
+
+        if transform is not None:
+            img, bboxes = transform.apply(img, bboxes)
+
+        return img, bboxes
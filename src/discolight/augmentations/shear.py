@@ -2,14 +2,15 @@
 import numpy as np
 import cv2
 from discolight.params.params import Params
-from .augmentation.types import Augmentation
+from .augmentation.affine import AffineTransform
+from .augmentation.types import AffineAugmentation
 from .horizontalflip import HorizontalFlip
 from .decorators.accepts_probs import accepts_probs
 
 
 # TODO: Vertical Shear
 @accepts_probs
-class Shear(Augmentation):
+class Shear(AffineAugmentation):
 
     """Horizontally shear the given image."""
 
@@ -29,6 +30,20 @@ class Shear(Augmentation):
         """Return a Params object describing constructor parameters."""
         return Params().add("shear_factor", "", float, 0.2)
 
+    def get_transform(self, height, width):
+        """Return the AffineTransform for an image of the given size."""
+        new_width = width + abs(self.shear_factor * height)
+
+        shear = AffineTransform([[1, abs(self.shear_factor), 0], [0, 1, 0],
+                                 [0, 0, 1]], new_width, height)
+
+        if self.shear_factor >= 0:
+            return shear
+
+        # Negative shears are performed by shearing the flipped image
+        return HorizontalFlip().get_transform(height, width).then(shear).then(
+            HorizontalFlip().get_transform(height, shear.width))
+
     def augment(self, img, bboxes):
         """Augment an image."""
         if self.shear_factor < 0:
@@ -2,12 +2,13 @@
 import numpy as np
 from discolight.params.params import Params
 from .bbox_utilities import bbox_utilities
-from .augmentation.types import Augmentation, BoundedNumber
+from .augmentation.affine import AffineTransform
+from .augmentation.types import AffineAugmentation, BoundedNumber
 from .decorators.accepts_probs import accepts_probs
 
 
 @accepts_probs
-class Translate(Augmentation):
+class Translate(AffineAugmentation):
 
     """Translate the given image."""
 
@@ -33,12 +34,18 @@ class Translate(Augmentation):
                             0.2).add("translate_y", "",
                                      BoundedNumber(float, 0.0, 1.0), 0.2)
 
+    def get_transform(self, height, width):
+        """Return the AffineTransform for an image of the given size."""
+        return AffineTransform.translation(int(self.translate_x * width),
+                                           int(self.translate_y * height),
+                                           width, height)
+
     def augment(self, img, bboxes):
         """Augment an image."""
         height, width, _ = img.shape
         translate_factor_x = self.translate_x
         translate_factor_y = self.translate_y
-        canvas = np.zeros(img.shape).astype(np.uint8)
+        canvas = np.zeros(img.shape, dtype=np.uint8)
         corner_x = int(translate_factor_x * width)
         corner_y = int(translate_factor_y * height)
         orig_box_cords = [
@@ -1,12 +1,13 @@
 """An augmentation to vertically flip an image."""
 import numpy as np
 from discolight.params.params import Params
-from .augmentation.types import Augmentation
+from .augmentation.affine import AffineTransform
+from .augmentation.types import AffineAugmentation
 from .decorators.accepts_probs import accepts_probs
 
 
 @accepts_probs
-class VerticalFlip(Augmentation):
+class VerticalFlip(AffineAugmentation):
 
     """Vertically flip the given image."""
 
@@ -15,6 +16,11 @@ class VerticalFlip(Augmentation):
         """Return a Params object describing constructor properties."""
         return Params()
 
+    def get_transform(self, height, width):
+        """Return the AffineTransform for an image of the given size."""
+        return AffineTransform([[1, 0, 0], [0, -1, height], [0, 0, 1]], width,
+                               height)
+
     def augment(self, img, bboxes):
         """Augment an image."""
         vert_flip_img = img[::-1, :, :]
@@ -1,15 +1,253 @@
 """A YAML-based interface for Discolight."""
+import collections
+import contextlib
+import multiprocessing
 import os
+import random
 
+import numpy as np
 from tqdm import tqdm
 from .augmentations.factory import make_augmentations_factory
 from .loaders.annotation.factory import make_annotation_loader_factory
 from .loaders.image.factory import make_image_loader_factory
 from .writers.annotation.factory import make_annotation_writer_factory
-from .writers.image.factory import make_image_writer_factory
+from .writers.image.factory import (make_image_writer_factory,
+                                    get_image_writer_set)
+from .loaders.image.types import LazyImage
+from .manifest import Manifest, hash_config, hash_input
+from .cache import AugmentationCache, DEFAULT_CACHE_SIZE_MB, cache_key
 from .augmentations.bbox_utilities import bbox_utilities
-from .annotations import (annotations_from_numpy_array,
-                          annotations_to_numpy_array)
+from .util.pipeline import prefetch
+from .util.bufferpool import get_buffer_pool
+from .util.profiler import (Profiler, count, get_profiler, profiled,
+                            profiled_iter, profiling)
+from .util.rng import image_seed_sequence, random_stream
+from .annotations import AnnotationTable
+
+DEFAULT_READ_AHEAD = 2
+
+
+def validate_annotations(image_name, image, annotations):
+    """Ensure that the annotations for an image are well formed.
+
+    A ValueError is raised if any bounding box has negative coordinates,
+    has its minimum and maximum coordinates swapped, or lies outside of
+    the image. annotations must be an AnnotationTable.
+    """
+    height, width, _ = image.shape
+
+    rows = annotations.rows
+
+    negative = ((rows["x_min"] < 0) | (rows["y_min"] < 0)
+                | (rows["x_max"] < 0) | (rows["y_max"] < 0))
+    swapped_x = rows["x_min"] > rows["x_max"]
+    swapped_y = rows["y_min"] > rows["y_max"]
+    outside = ((rows["x_min"] > width) | (rows["y_min"] > height)
+               | (rows["x_max"] > width) | (rows["y_max"] > height))
+
+    invalid = np.flatnonzero(negative | swapped_x | swapped_y | outside)
+
+    if len(invalid) == 0:
+        return
+
+    idx = invalid[0]
+    annotation = annotations[idx]
+
+    if negative[idx]:
+        raise ValueError("Annotation {} for image {} contains negative "
+                         "coordinates for the bounding box!".format(
+                             annotation, image_name))
+
+    if swapped_x[idx]:
+        raise ValueError(
+            "Annotation {} for image {} has x_min > x_max!".format(
+                annotation, image_name))
+
+    if swapped_y[idx]:
+        raise ValueError(
+            "Annotation {} for image {} has y_min > y_max!".format(
+                annotation, image_name))
+
+    raise ValueError("Annotation {} for image {} contains coordinates "
+                     "for the bounding box that are greater than the "
+                     "image dimensions!".format(annotation, image_name))
+
+
+def make_augmentations(augmentation_specs):
+    """Construct the augmentations described in a query."""
+    augmentation_factory = make_augmentations_factory()
+
+    return [
+        augmentation_factory(spec["name"], **spec.get("options", {}))
+        for spec in augmentation_specs
+    ]
+
+
+def postprocess(img, bboxes, save_bbox):
+    """Prepare an image for writing, drawing its bboxes if requested."""
+    if save_bbox:
+        with profiled("draw_rect"):
+            return bbox_utilities.draw_rect(img, bboxes, (255, 0, 0))
+
+    return img
+
+
+def write_annotations(annotation_writer, image_name, img, annotations):
+    """Write the annotations for an image with an annotation writer."""
+    with profiled("write_annotations"):
+        annotation_writer.write_annotations_for_image(image_name, img,
+                                                      annotations)
+
+
+def placeholder_image(shape):
+    """Return a read-only image of the given shape without allocating it.
+
+    Annotation writers only need the shape of an image, so this is passed
+    to them in place of an augmented image that is not recomputed.
+    """
+    return np.broadcast_to(np.zeros((), dtype=np.uint8), tuple(shape))
+
+
+def augmented_image_name(image_name, augmentation_idx):
+    """Return the name of an augmentation of an image."""
+    image_name_base, ext = os.path.splitext(image_name)
+
+    return "{}--{}{}".format(image_name_base, augmentation_idx, ext)
+
+
+def augment_image(augmentations,
+                  image_name,
+                  img,
+                  bboxes,
+                  save_bbox,
+                  seed,
+                  indices=None):
+    """Apply each of the given augmentations to an image.
+
+    This is a generator that yields an (augmented_image_name, aug_img,
+    output_img, aug_bboxes) tuple for every augmentation, where
+    output_img is the augmented image prepared for writing. If indices is
+    given, only the augmentations at those (1-based) positions are
+    applied.
+
+    Each augmentation draws its random numbers from its own stream, which
+    only depends on the seed, the image name, and the position of the
+    augmentation in the list.
+    """
+    seed_sequences = image_seed_sequence(seed, image_name).spawn(
+        len(augmentations))
+
+    if indices is not None:
+        indices = set(indices)
+
+    for augmentation_idx, (augmentation, seed_sequence) in enumerate(
+            zip(augmentations, seed_sequences), 1):
+
+        if indices is not None and augmentation_idx not in indices:
+            continue
+
+        with random_stream(seed_sequence), profiled("augment"):
+            aug_img, aug_bboxes = augmentation.augment_preserving_input(
+                img, bboxes)
+
+        yield (augmented_image_name(image_name, augmentation_idx), aug_img,
+               postprocess(aug_img, aug_bboxes, save_bbox), aug_bboxes)
+
+
+_worker_state = {}
+
+
+def init_worker(augmentation_specs, save_bbox, seed, profile=False):
+    """Initialize a worker process used for parallel generation.
+
+    Augmentations are constructed once per worker from the query, instead
+    of being sent to the worker with every image.
+    """
+    _worker_state["augmentations"] = make_augmentations(augmentation_specs)
+    _worker_state["save_bbox"] = save_bbox
+    _worker_state["seed"] = seed
+    _worker_state["profiler"] = Profiler() if profile else None
+
+
+def augment_image_in_worker(image_name, img, bboxes, indices=None):
+    """Augment an image in a worker process.
+
+    Since the random numbers drawn for an image only depend on the seed
+    and the image name, the augmentations applied to an image do not depend
+    on which worker it is sent to, or what that worker has processed
+    before.
+
+    A (results, profile) tuple is returned, where profile is what the
+    worker's profiler collected while augmenting the image (as returned
+    by Profiler.take), or None if the run is not being profiled.
+    """
+    profiler = _worker_state["profiler"]
+
+    if profiler is None:
+        return list(
+            augment_image(_worker_state["augmentations"], image_name, img,
+                          bboxes, _worker_state["save_bbox"],
+                          _worker_state["seed"], indices)), None
+
+    with profiling(profiler):
+        results = list(
+            augment_image(_worker_state["augmentations"], image_name, img,
+                          bboxes, _worker_state["save_bbox"],
+                          _worker_state["seed"], indices))
+
+    profiler.high_water_mark("buffer_pool_peak_bytes",
+                             get_buffer_pool().stats()["peak_bytes"])
+
+    return results, profiler.take()
+
+
+def checkpoint(image_writer, manifest, cache):
+    """Record the outputs written so far in the manifest and the cache.
+
+    Either of the manifest and the cache may be None.
+    """
+    image_writer.flush()
+
+    if cache is not None:
+        cache.commit()
+
+    if manifest is not None:
+        manifest.checkpoint()
+
+
+class ImageWork:
+
+    """An image loaded for generation, and the outputs it still needs.
+
+    The image has an output for the original image (output 0) and for
+    each augmentation, and config_keys holds a hash of the configuration
+    of each output. If the outputs of a previous run are recorded in a
+    manifest, completed maps the index of each output that does not need
+    to be computed again to its manifest entry. Likewise, cached maps the
+    index of each augmentation found in the augmentation cache to its
+    cache entry.
+    """
+
+    def __init__(self, image_name, img, annotations, bboxes, config_keys,
+                 input_key, completed, cached):
+        """Construct the work for an image."""
+        self.image_name = image_name
+        self.img = img
+        self.annotations = annotations
+        self.bboxes = bboxes
+        self.config_keys = config_keys
+        self.input_key = input_key
+        self.completed = completed
+        self.cached = cached
+
+    def pending(self):
+        """Return the (1-based) indices of the augmentations to apply."""
+        return [
+            augmentation_idx
+            for augmentation_idx in range(1, len(self.config_keys))
+            if augmentation_idx not in self.completed
+            and augmentation_idx not in self.cached
+        ]
 
 
 class Augmentor:
@@ -40,32 +278,115 @@ class Augmentor:
         """Generate image augmentations.
 
         Generation is configured by the query passed at class construction.
+
+        Images are streamed from the annotation loader and augmented one at
+        a time. Besides the image being augmented, at most read-ahead
+        images (as given in the query) are held in memory at once.
+
+        If more than one worker is requested in the query, images are
+        augmented in a pool of worker processes instead, and written out in
+        the same order as a serial run.
+
+        The random numbers drawn by each augmentation of each image come
+        from their own stream, derived from the seed in the query (or from
+        the random module if there is none), so the output is the same
+        regardless of the number of workers.
+
+        If the query has no augmentations and does not save the original
+        images (i.e., it only converts annotations to another format),
+        images are never decoded. Only the sizes of the images are read,
+        where needed.
+
+        If the query names a manifest, the outputs that are written are
+        recorded in it, and outputs recorded by a previous run are not
+        computed again, unless their input image, annotations, or
+        configuration have changed. Annotations are always written for
+        every output, so any annotation writer can be used to resume a
+        run, but the image writer must be able to keep the images it wrote
+        (see ImageWriter.resume_options).
+
+        If the query names a cache directory, augmented images are stored
+        in it, and augmentations whose input image, annotations, and
+        configuration are found in the cache are copied from it instead of
+        being computed and encoded again. The number of cache hits and
+        misses is reported at the end of the run.
         """
-        image_loader_name = self.query["input"]["images"]["loader"]
-        image_loader_opts = self.query["input"]["images"]["options"]
+        seed = self.query.get("seed")
 
-        annot_loader_name = self.query["input"]["annotations"]["loader"]
-        annot_loader_opts = self.query["input"]["annotations"]["options"]
+        with contextlib.ExitStack() as stack:
+
+            manifest = None
+            cache = None
+
+            if self.query.get("profile") is not None:
+                profiler = stack.enter_context(profiling(Profiler()))
+
+                # The profile is saved even if the run fails
+                stack.callback(self._save_profile, profiler)
+
+            if self.query.get("manifest") is not None:
+                manifest = stack.enter_context(
+                    Manifest(self.query["manifest"]))
+
+                # Resumed runs keep the seed of the run they resume
+                if seed is None:
+                    seed = manifest.seed
+
+            if self.query.get("cache") is not None:
+                cache = stack.enter_context(
+                    AugmentationCache(
+                        self.query["cache"],
+                        self.query.get("cache-size", DEFAULT_CACHE_SIZE_MB)
+                        << 20))
+
+            if seed is None:
+                seed = random.getrandbits(64)
+
+            if manifest is not None:
+                manifest.start(seed)
+
+            self._generate(seed, manifest, cache)
 
-        with self.image_loader_factory(
-                image_loader_name, **image_loader_opts
-        ) as image_loader, self.annotation_loader_factory(
-                annot_loader_name, **annot_loader_opts) as annotation_loader:
-            images = annotation_loader.load_annotated_images(image_loader)
+            if cache is not None:
+                tqdm.write(
+                    "Cache: {hits} hits, {misses} misses, {evictions} "
+                    "evictions ({entries} entries, {bytes} bytes)".format(
+                        **cache.stats()))
 
-        augmentations = []
+    def _save_profile(self, profiler):
+        """Save the report and trace of a profiled run."""
+        profiler.high_water_mark("buffer_pool_peak_bytes",
+                                 get_buffer_pool().stats()["peak_bytes"])
 
-        for augmentation in self.query["augmentations"]:
+        profiler.save(self.query["profile"])
 
-            augmentations.append(
-                self.augmentation_factory(augmentation["name"],
-                                          **augmentation.get("options", {})))
+    def _config_keys(self, seed):
+        """Return the hash of the configuration of each output of an image.
 
-        def postprocess(img, bboxes):
-            if self.query["save-bbox"]:
-                return bbox_utilities.draw_rect(img, bboxes, (255, 0, 0))
+        The original image is output 0, and the augmentations follow.
+        """
+        original_config = {
+            "save-original": self.query["save-original"],
+            "save-bbox": self.query["save-bbox"]
+        }
+
+        return [hash_config(original_config)] + [
+            hash_config({
+                "augmentation": augmentation_spec,
+                "index": augmentation_idx,
+                "seed": seed,
+                "save-bbox": self.query["save-bbox"]
+            }) for augmentation_idx, augmentation_spec in enumerate(
+                self.query["augmentations"], 1)
+        ]
+
+    def _generate(self, seed, manifest, cache):
+        """Generate image augmentations with the given seed."""
+        image_loader_name = self.query["input"]["images"]["loader"]
+        image_loader_opts = self.query["input"]["images"]["options"]
 
-            return img
+        annot_loader_name = self.query["input"]["annotations"]["loader"]
+        annot_loader_opts = self.query["input"]["annotations"]["options"]
 
         image_writer_name = self.query["output"]["images"]["writer"]
         image_writer_opts = self.query["output"]["images"]["options"]
@@ -73,72 +394,294 @@ class Augmentor:
         annot_writer_name = self.query["output"]["annotations"]["writer"]
         annot_writer_opts = self.query["output"]["annotations"]["options"]
 
-        with self.image_writer_factory(
-                image_writer_name, **image_writer_opts
-        ) as image_writer, self.annotation_writer_factory(
-                annot_writer_name, **annot_writer_opts) as annotation_writer:
+        read_ahead = self.query.get("read-ahead", DEFAULT_READ_AHEAD)
+        workers = self.query.get("workers", 1)
+
+        decode = (self.query["save-original"]
+                  or len(self.query["augmentations"]) > 0)
+
+        # When resuming a run, the images it wrote must be kept
+        if manifest is not None and len(manifest.records) > 0:
+            image_writer_opts = get_image_writer_set()[
+                image_writer_name].resume_options(image_writer_opts)
+
+            if image_writer_opts is None:
+                raise ValueError(
+                    "The {} image writer cannot resume the run recorded in "
+                    "the manifest {}. Remove the manifest to start a new "
+                    "run".format(image_writer_name, self.query["manifest"]))
+
+        with contextlib.ExitStack() as stack:
+
+            pool = None
+
+            if workers > 1 and decode:
+                # The pool must be started before any other threads (i.e.,
+                # for read-ahead) are running in this process. Leaving the
+                # stack terminates the pool, and waits for its workers.
+                initargs = (self.query["augmentations"],
+                            self.query["save-bbox"], seed,
+                            get_profiler() is not None)
+
+                pool = stack.enter_context(
+                    multiprocessing.Pool(workers,
+                                         initializer=init_worker,
+                                         initargs=initargs))
+
+            with self.image_loader_factory(
+                    image_loader_name, **image_loader_opts
+            ) as image_loader, self.annotation_loader_factory(
+                    annot_loader_name, **annot_loader_opts
+            ) as annotation_loader, self.image_writer_factory(
+                    image_writer_name, **image_writer_opts
+            ) as image_writer, self.annotation_writer_factory(
+                    annot_writer_name,
+                    **annot_writer_opts) as annotation_writer:
+
+                annotated_images = profiled_iter(
+                    annotation_loader.iter_annotated_images(
+                        image_loader,
+                        lazy=(manifest is not None or cache is not None
+                              or not decode)), "load")
+
+                images = tqdm(prefetch(
+                    self._find_work(image_loader, annotated_images, manifest,
+                                    cache, self._config_keys(seed), decode),
+                    read_ahead),
+                              desc="Augmenting...",
+                              unit="img")
+
+                try:
+                    if pool is None:
+                        self._generate_serial(images, image_writer,
+                                              annotation_writer, manifest,
+                                              cache, seed)
+                    else:
+                        self._generate_parallel(pool, workers, images,
+                                                image_writer,
+                                                annotation_writer, manifest,
+                                                cache)
+                except BaseException:
+                    # Keep whatever was written before the run stopped
+                    try:
+                        checkpoint(image_writer, manifest, cache)
+                    except Exception:  # pylint: disable=broad-except
+                        pass
+                    raise
+
+                checkpoint(image_writer, manifest, cache)
+
+    def _find_work(self, image_loader, annotated_images, manifest, cache,
+                   config_keys, decode):
+        """Find the outputs that must be computed for each image.
+
+        This is a generator that yields an ImageWork object for every
+        image. Images are only decoded if some of their outputs are neither
+        recorded in the manifest nor found in the cache, and decode is
+        True.
+        """
+        for image_name, (img, annotations) in annotated_images:
+
+            annotations = AnnotationTable.from_bounding_boxes(annotations)
+
+            with profiled("validate"):
+                validate_annotations(image_name, img, annotations)
+
+            bboxes = annotations.to_numpy()
+
+            count("images")
+            count("input_boxes", len(bboxes))
+
+            input_key = None
+            completed = {}
+            cached = {}
+
+            if manifest is not None or cache is not None:
+                with profiled("fingerprint"):
+                    input_key = hash_input(
+                        image_loader.image_fingerprint(image_name), bboxes)
+
+            if manifest is not None:
+                for output_idx, config_key in enumerate(config_keys):
+                    record = manifest.lookup(image_name, output_idx,
+                                             input_key, config_key)
+
+                    if record is not None:
+                        completed[output_idx] = record
+
+            if cache is not None:
+                for augmentation_idx in range(1, len(config_keys)):
+
+                    if augmentation_idx in completed:
+                        continue
 
-            for image_name in tqdm(images, desc="Augmenting...", unit="img"):
+                    entry = cache.lookup(
+                        cache_key(image_name, input_key,
+                                  config_keys[augmentation_idx]))
 
-                img, annotations = images[image_name]
+                    if entry is not None:
+                        cached[augmentation_idx] = entry
 
-                height, width, _ = img.shape
+            work = ImageWork(image_name, img, annotations, bboxes,
+                             config_keys, input_key, completed, cached)
 
-                for annotation in annotations:
-                    if (annotation.x_min < 0 or annotation.y_min < 0
-                            or annotation.x_max < 0 or annotation.y_max < 0):
-                        raise ValueError(
-                            "Annotation {} for image {} contains negative "
-                            "coordinates for the bounding box!".format(
-                                annotation, image_name))
+            needs_image = (len(work.pending()) > 0
+                           or (self.query["save-original"]
+                               and 0 not in completed))
 
-                    if annotation.x_min > annotation.x_max:
-                        raise ValueError(
-                            "Annotation {} for image {} has x_min > x_max!".
-                            format(annotation, image_name))
+            if decode and needs_image and isinstance(img, LazyImage):
+                work.img = img.load()
+
+            yield work
+
+    def _write_outputs(self, image_writer, annotation_writer, manifest, cache,
+                       work, results):
+        """Write out the original image and its augmentations.
+
+        The results are the tuples produced by augment_image for the
+        pending augmentations of the image. Augmentations found in the
+        cache are copied from it, and for the other augmentations, only the
+        annotations recorded in the manifest are written.
+        """
+        if 0 in work.completed:
+            write_annotations(annotation_writer, work.image_name, work.img,
+                              work.annotations)
+        else:
+            self._write_original(image_writer, annotation_writer,
+                                 work.image_name, work.img, work.annotations,
+                                 work.bboxes)
+
+            if manifest is not None:
+                manifest.record(work.image_name, 0, work.input_key,
+                                work.config_keys[0],
+                                work.image_name, work.img.shape, work.bboxes)
+
+        results = iter(results)
+
+        for augmentation_idx in range(1, len(work.config_keys)):
+
+            record = work.completed.get(augmentation_idx)
+
+            if record is not None:
+                count("outputs_reused")
+
+                write_annotations(
+                    annotation_writer, record["output"],
+                    placeholder_image(record["shape"]),
+                    AnnotationTable.from_numpy(record["bboxes"]))
+                continue
+
+            entry = work.cached.get(augmentation_idx)
+
+            if entry is not None:
+                output_name = augmented_image_name(work.image_name,
+                                                   augmentation_idx)
+
+                try:
+                    with profiled("write_image"):
+                        image_writer.copy_image(output_name, entry.image_path)
+                finally:
+                    cache.release(entry.key)
+
+                count("outputs_reused")
+
+                aug_img = placeholder_image(entry.shape)
+                aug_bboxes = entry.bboxes
+            else:
+                output_name, aug_img, output_img, aug_bboxes = next(results)
+
+                with profiled("write_image"):
+                    image_writer.write_image(output_name, output_img)
+
+                count("outputs_written")
+
+                output_path = image_writer.image_path(output_name)
+
+                if cache is not None and output_path is not None:
+                    cache.add(
+                        cache_key(work.image_name, work.input_key,
+                                  work.config_keys[augmentation_idx]),
+                        output_path, aug_img.shape, aug_bboxes)
+
+            write_annotations(annotation_writer, output_name, aug_img,
+                              AnnotationTable.from_numpy(aug_bboxes))
+
+            if manifest is not None:
+                manifest.record(
+                    work.image_name, augmentation_idx, work.input_key,
+                    work.config_keys[augmentation_idx],
+                    output_name, aug_img.shape, aug_bboxes)
+
+        if ((manifest is not None and manifest.checkpoint_due())
+                or (cache is not None and cache.commit_due())):
+            checkpoint(image_writer, manifest, cache)
+
+    def _write_original(self, image_writer, annotation_writer, image_name, img,
+                        annotations, bboxes):
+        """Write out the original image and its annotations."""
+        write_annotations(annotation_writer, image_name, img, annotations)
+
+        if self.query["save-original"]:
+            output_img = postprocess(img, bboxes, self.query["save-bbox"])
+
+            with profiled("write_image"):
+                image_writer.write_image(image_name, output_img)
+
+    def _generate_serial(self, images, image_writer, annotation_writer,
+                         manifest, cache, seed):
+        """Augment and write out images one at a time in this process."""
+        augmentations = make_augmentations(self.query["augmentations"])
+
+        for work in images:
+
+            self._write_outputs(
+                image_writer, annotation_writer, manifest, cache, work,
+                augment_image(
+                    tqdm(augmentations,
+                         desc=work.image_name,
+                         leave=False,
+                         unit="aug"), work.image_name, work.img, work.bboxes,
+                    self.query["save-bbox"], seed, work.pending()))
+
+    def _generate_parallel(self, pool, workers, images, image_writer,
+                           annotation_writer, manifest, cache):
+        """Augment images in a process pool, writing them out in order.
+
+        At most two images per worker are in flight at once, so memory use
+        stays bounded no matter how many images are loaded. Images with no
+        pending augmentations are not sent to the pool.
+        """
+        in_flight = collections.deque()
 
-                    if annotation.y_min > annotation.y_max:
-                        raise ValueError(
-                            "Annotation {} for image {} has y_min > y_max!".
-                            format(annotation, image_name))
+        def write_next():
+            work, result = in_flight.popleft()
 
-                    if (annotation.x_min > width or annotation.y_min > height
-                            or annotation.x_max > width
-                            or annotation.y_max > height):
-                        raise ValueError(
-                            "Annotation {} for image {} contains coordinates "
-                            "for the bounding box that are greater than the "
-                            "image dimensions!".format(annotation, image_name))
+            results = []
 
-                annotation_writer.write_annotations_for_image(
-                    image_name, img, annotations)
+            if result is not None:
+                results, profile = result.get()
 
-                bboxes = annotations_to_numpy_array(annotations)
+                if profile is not None:
+                    get_profiler().merge(profile)
 
-                if self.query["save-original"]:
-                    image_writer.write_image(image_name,
-                                             postprocess(img, bboxes))
+            self._write_outputs(image_writer, annotation_writer, manifest,
+                                cache, work, results)
 
-                augmentation_idx = 1
+        for work in images:
 
-                for augmentation in tqdm(augmentations,
-                                         desc=image_name,
-                                         leave=False,
-                                         unit="aug"):
-                    image_name_base, ext = os.path.splitext(image_name)
-                    augmented_image_name = "{}--{}{}".format(
-                        image_name_base, augmentation_idx, ext)
+            pending = work.pending()
 
-                    aug_img, aug_bboxes = augmentation.augment(
-                        img.copy(), bboxes.copy())
+            result = None
 
-                    image_writer.write_image(augmented_image_name,
-                                             postprocess(aug_img, aug_bboxes))
+            if len(pending) > 0:
+                result = pool.apply_async(
+                    augment_image_in_worker,
+                    (work.image_name, work.img, work.bboxes, pending))
 
-                    augmented_annotations = annotations_from_numpy_array(
-                        aug_bboxes)
+            in_flight.append((work, result))
 
-                    annotation_writer.write_annotations_for_image(
-                        augmented_image_name, aug_img, augmented_annotations)
+            while len(in_flight) > 2 * workers:
+                write_next()
 
-                    augmentation_idx += 1
+        while in_flight:
+            write_next()
@@ -0,0 +1,546 @@
+"""Benchmarks for augmentations, loaders, writers, and generation."""
+import functools
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from .annotations import AnnotationTable
+from .augmentations.factory import (get_augmentations_set,
+                                    make_augmentations_factory)
+from .augmentor import Augmentor, placeholder_image
+from .doc import load_sample_options
+from .loaders.annotation.factory import (get_annotation_loader_set,
+                                         make_annotation_loader_factory)
+from .loaders.image.factory import make_image_loader_factory
+from .writers.annotation.factory import (get_annotation_writer_set,
+                                         make_annotation_writer_factory)
+from .util.profiler import peak_rss_mb
+
+# The (width, height) of the images augmentations are benchmarked on
+BENCH_IMAGE_SIZES = [(256, 256), (1024, 1024), (3840, 2160)]
+
+# The number of bounding boxes on each benchmarked image
+BENCH_BOX_COUNTS = [1, 10, 100]
+
+QUICK_IMAGE_SIZES = [(256, 256)]
+QUICK_BOX_COUNTS = [10]
+
+DEFAULT_REPEATS = 10
+
+# The number of images annotation loaders and writers are benchmarked on
+DATASET_IMAGES = 16
+
+# The number of images, and the augmentations applied to them, for the
+# end-to-end generate benchmark
+GENERATE_IMAGES = 4
+GENERATE_AUGMENTATIONS = [{
+    "name": "HorizontalFlip"
+}, {
+    "name": "Rotate"
+}, {
+    "name": "GaussianNoise"
+}, {
+    "name": "RandomCrop"
+}]
+GENERATE_BOX_COUNT = 10
+
+# The slowdown of the median latency, relative to the baseline, above
+# which a benchmark is reported as a regression
+DEFAULT_TOLERANCE = 0.25
+
+
+def measure(func, repeats, items=1):
+    """Time repeated calls to func, after one call to warm up.
+
+    A dictionary is returned with the percentiles of the latency of the
+    calls in milliseconds, the throughput in items (processed by each
+    call) per second, and the peak resident set size of the process
+    after the calls. Since the peak resident set size never decreases, it
+    includes the memory used by benchmarks run earlier.
+    """
+    func()
+
+    times = []
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    p50, p90, p99 = np.percentile(times, [50, 90, 99]) * 1000
+
+    return {
+        "p50_ms": float(p50),
+        "p90_ms": float(p90),
+        "p99_ms": float(p99),
+        "throughput": items * len(times) / max(sum(times), 1e-9),
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+
+def make_image(width, height):
+    """Return a reproducible random image of the given size."""
+    rng = np.random.default_rng(0)
+
+    # Smooth noise is closer to a photograph than white noise, which
+    # matters for the speed of image codecs
+    small = rng.integers(0,
+                         256,
+                         (max(1, height // 16), max(1, width // 16), 3),
+                         dtype=np.uint8)
+
+    return cv2.resize(small, (width, height),
+                      interpolation=cv2.INTER_LINEAR)
+
+
+def make_bboxes(width, height, count, seed=0):
+    """Return count reproducible random bounding boxes in an image.
+
+    Each box is at most a quarter of the width and height of the image.
+    """
+    rng = np.random.default_rng(seed)
+
+    box_width = rng.uniform(1, width / 4, count)
+    box_height = rng.uniform(1, height / 4, count)
+
+    x_min = rng.uniform(0, width - box_width)
+    y_min = rng.uniform(0, height - box_height)
+
+    return np.column_stack(
+        (x_min, y_min, x_min + box_width, y_min + box_height,
+         rng.integers(0, 5, count))).astype(np.float64)
+
+
+def make_dataset(directory, width, height, box_count, images):
+    """Write a dataset of images to directory for loaders and writers.
+
+    A list of (image_name, annotations) tuples is returned.
+    """
+    image = cv2.cvtColor(make_image(width, height), cv2.COLOR_RGB2BGR)
+
+    dataset = []
+
+    for image_idx in range(images):
+        image_name = "image{}.jpg".format(image_idx)
+
+        cv2.imwrite(os.path.join(directory, image_name), image)
+
+        dataset.append((image_name,
+                        AnnotationTable.from_numpy(
+                            make_bboxes(width, height, box_count,
+                                        image_idx))))
+
+    return dataset
+
+
+def annotation_options(params, path):
+    """Return the options for an annotation loader or writer.
+
+    The annotations are read from or written to path, which is used as a
+    file or a directory, depending on the loader or writer.
+    """
+    if "annotations_file" in params.params:
+        return {"annotations_file": path}
+
+    if "directory" in params.params:
+        return {"directory": path}
+
+    return {"annotations_folder": path}
+
+
+def write_dataset(annotation_writer_factory, name, writer_options, dataset,
+                  image):
+    """Write the annotations of a dataset with an annotation writer.
+
+    Every image of the dataset is taken to be the same size as image.
+    """
+    with annotation_writer_factory(name,
+                                   **writer_options) as annotation_writer:
+        for image_name, annotations in dataset:
+            annotation_writer.write_annotations_for_image(
+                image_name, image, annotations)
+
+
+def load_dataset(annotation_loader_factory, image_loader_factory, name,
+                 loader_options, images_directory):
+    """Load the annotations of a dataset with an annotation loader."""
+    with image_loader_factory(
+            "Directory", directory=images_directory
+    ) as image_loader, annotation_loader_factory(
+            name, **loader_options) as annotation_loader:
+        for _ in annotation_loader.iter_annotated_images(image_loader,
+                                                         lazy=True):
+            pass
+
+
+class Benchmarks:
+
+    """A suite of benchmarks.
+
+    Results are collected in a dictionary, where the keys are names of the
+    form "<kind>/<name>/<configuration>". Only benchmarks whose name
+    contains name_filter are run.
+    """
+
+    def __init__(self,
+                 image_sizes=None,
+                 box_counts=None,
+                 repeats=DEFAULT_REPEATS,
+                 name_filter=""):
+        """Construct a suite of benchmarks."""
+        self.image_sizes = (image_sizes
+                            if image_sizes is not None else BENCH_IMAGE_SIZES)
+        self.box_counts = (box_counts
+                           if box_counts is not None else BENCH_BOX_COUNTS)
+        self.repeats = repeats
+        self.name_filter = name_filter
+
+        self.results = {}
+
+    def selected(self, name):
+        """Return whether the benchmark with the given name should run."""
+        return self.name_filter in name
+
+    def run(self, name, func, repeats=None, items=1):
+        """Run a benchmark, unless it is filtered out.
+
+        If the benchmark raises an exception, the error is recorded in its
+        result instead.
+        """
+        if not self.selected(name):
+            return
+
+        random.seed(0)
+
+        try:
+            self.results[name] = measure(
+                func, repeats if repeats is not None else self.repeats, items)
+        except Exception as e:  # pylint: disable=broad-except
+            self.results[name] = {
+                "error": "{}: {}".format(type(e).__name__, e)
+            }
+
+    def run_all(self):
+        """Run every benchmark, and return the results."""
+        self.bench_augmentations()
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.bench_annotations(directory)
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.bench_generate(directory)
+
+        return self.results
+
+    def bench_augmentations(self):
+        """Benchmark every augmentation, on every image size and box count.
+
+        Augmentations are constructed with the options they are showcased
+        with in the documentation, if any.
+        """
+        augmentations_factory = make_augmentations_factory()
+
+        for name in sorted(get_augmentations_set()):
+
+            augmentation = augmentations_factory(name,
+                                                 **load_sample_options(name))
+
+            for width, height in self.image_sizes:
+
+                img = make_image(width, height)
+
+                for box_count in self.box_counts:
+
+                    bboxes = make_bboxes(width, height, box_count)
+
+                    def augment(augmentation=augmentation,
+                                img=img,
+                                bboxes=bboxes):
+                        augmentation.augment_preserving_input(img, bboxes)
+
+                    self.run(
+                        "augmentation/{}/{}x{}/{}".format(
+                            name, width, height, box_count), augment)
+
+    def bench_annotations(self, directory):
+        """Benchmark every annotation writer and loader.
+
+        For each box count, a dataset of small images is written to
+        directory. Its annotations are written with every annotation
+        writer, and read back with the annotation loader of the same name.
+        """
+        annotation_writer_factory = make_annotation_writer_factory()
+        annotation_loader_factory = make_annotation_loader_factory()
+        image_loader_factory = make_image_loader_factory()
+
+        annotation_writers = get_annotation_writer_set()
+        annotation_loaders = get_annotation_loader_set()
+
+        width, height = QUICK_IMAGE_SIZES[0]
+
+        for box_count in self.box_counts:
+
+            names = [
+                "annotation-{}/{}/{}".format(kind, name, box_count)
+                for kind in ["writer", "loader"]
+                for name in annotation_writers
+            ]
+
+            if not any(self.selected(name) for name in names):
+                continue
+
+            images_directory = os.path.join(directory,
+                                            "images{}".format(box_count))
+            os.mkdir(images_directory)
+
+            dataset = make_dataset(images_directory, width, height,
+                                   box_count, DATASET_IMAGES)
+
+            image = placeholder_image((height, width, 3))
+
+            for name in sorted(annotation_writers):
+
+                path = os.path.join(directory,
+                                    "{}-{}".format(name, box_count))
+
+                writer_options = annotation_options(
+                    annotation_writers[name].params(), path)
+
+                write = functools.partial(write_dataset,
+                                          annotation_writer_factory, name,
+                                          writer_options, dataset, image)
+
+                self.run("annotation-writer/{}/{}".format(name, box_count),
+                         write,
+                         items=len(dataset))
+
+                if name not in annotation_loaders:
+                    continue
+
+                # The loader reads what the writer wrote
+                write()
+
+                loader_options = annotation_options(
+                    annotation_loaders[name].params(), path)
+
+                load = functools.partial(load_dataset,
+                                         annotation_loader_factory,
+                                         image_loader_factory, name,
+                                         loader_options, images_directory)
+
+                self.run("annotation-loader/{}/{}".format(name, box_count),
+                         load,
+                         items=len(dataset))
+
+    def bench_generate(self, directory):
+        """Benchmark Augmentor.generate end-to-end on every image size."""
+        annotation_writer_factory = make_annotation_writer_factory()
+
+        for width, height in self.image_sizes:
+
+            if not self.selected("generate/{}x{}".format(width, height)):
+                continue
+
+            size_directory = os.path.join(directory,
+                                          "{}x{}".format(width, height))
+            images_directory = os.path.join(size_directory, "images")
+            os.makedirs(images_directory)
+
+            dataset = make_dataset(images_directory, width, height,
+                                   GENERATE_BOX_COUNT, GENERATE_IMAGES)
+
+            annotations_file = os.path.join(size_directory, "annotations.csv")
+
+            with annotation_writer_factory(
+                    "FourCornersCSV",
+                    annotations_file=annotations_file) as annotation_writer:
+                for image_name, annotations in dataset:
+                    annotation_writer.write_annotations_for_image(
+                        image_name, placeholder_image((height, width, 3)),
+                        annotations)
+
+            query = {
+                "input": {
+                    "images": {
+                        "loader": "Directory",
+                        "options": {
+                            "directory": images_directory
+                        }
+                    },
+                    "annotations": {
+                        "loader": "FourCornersCSV",
+                        "options": {
+                            "annotations_file": annotations_file
+                        }
+                    }
+                },
+                "output": {
+                    "images": {
+                        "writer": "Directory",
+                        "options": {
+                            "directory":
+                            os.path.join(size_directory, "output"),
+                            "clean_directory": True
+                        }
+                    },
+                    "annotations": {
+                        "writer": "FourCornersCSV",
+                        "options": {
+                            "annotations_file":
+                            os.path.join(size_directory, "output.csv")
+                        }
+                    }
+                },
+                "augmentations": GENERATE_AUGMENTATIONS,
+                "save-original": False,
+                "save-bbox": False,
+                "seed": 0
+            }
+
+            self.run("generate/{}x{}".format(width, height),
+                     Augmentor(query).generate,
+                     repeats=max(1, self.repeats // 3),
+                     items=len(dataset))
+
+
+def find_regressions(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Compare benchmark results to a baseline.
+
+    A list of (name, ratio) tuples is returned for each benchmark whose
+    median latency is more than tolerance slower than in the baseline,
+    where ratio is the median latency over the median latency of the
+    baseline. Benchmarks missing from either set of results, or that
+    failed, are ignored.
+    """
+    regressions = []
+
+    for name, result in sorted(results.items()):
+
+        baseline_result = baseline.get(name)
+
+        if ("p50_ms" not in result or baseline_result is None
+                or "p50_ms" not in baseline_result):
+            continue
+
+        ratio = result["p50_ms"] / max(baseline_result["p50_ms"], 1e-9)
+
+        if ratio > 1 + tolerance:
+            regressions.append((name, ratio))
+
+    return regressions
+
+
+def load_baseline(path):
+    """Load the results of a run saved with save_results."""
+    with open(path, "r", encoding="utf-8") as baseline_file:
+        return json.load(baseline_file)["results"]
+
+
+def save_results(path, results):
+    """Save benchmark results, and the platform they were run on."""
+    with open(path, "w", encoding="utf-8") as results_file:
+        json.dump(
+            {
+                "platform": {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "numpy": np.__version__,
+                    "opencv": cv2.__version__
+                },
+                "results": results
+            },
+            results_file,
+            indent=2,
+            sort_keys=True)
+
+
+def format_results(results, baseline=None):
+    """Format benchmark results as a table.
+
+    If a baseline is given, the median latency relative to the baseline
+    is shown as well.
+    """
+    lines = [
+        "{:<52} {:>10} {:>10} {:>10} {:>12} {:>10} {:>8}".format(
+            "benchmark", "p50 ms", "p90 ms", "p99 ms", "items/s", "RSS MB",
+            "vs base")
+    ]
+
+    for name, result in sorted(results.items()):
+
+        if "error" in result:
+            lines.append("{:<52} {}".format(name, result["error"]))
+            continue
+
+        ratio = ""
+
+        if baseline is not None and "p50_ms" in baseline.get(name, {}):
+            ratio = "{:.2f}x".format(result["p50_ms"] /
+                                     max(baseline[name]["p50_ms"], 1e-9))
+
+        peak_rss = result["peak_rss_mb"]
+
+        lines.append(
+            "{:<52} {:>10.2f} {:>10.2f} {:>10.2f} {:>12.1f} {:>10} {:>8}".
+            format(name, result["p50_ms"], result["p90_ms"],
+                   result["p99_ms"], result["throughput"],
+                   "" if peak_rss is None else "{:.0f}".format(peak_rss),
+                   ratio))
+
+    return "\n".join(lines)
+
+
+def run_benchmarks(*,
+                   quick=False,
+                   repeats=None,
+                   name_filter="",
+                   baseline_path=None,
+                   save_path=None,
+                   tolerance=None):
+    """Run the benchmark suite, and print its results.
+
+    In quick mode, only the smallest image size and a single box count are
+    benchmarked. If baseline_path is given, the results are compared to
+    the results saved in that file, and a list of regressions is returned
+    as by find_regressions. If save_path is given, the results are saved
+    to that file, to be used as a baseline later. DEFAULT_REPEATS and
+    DEFAULT_TOLERANCE are used if repeats or tolerance are not given.
+    """
+    if repeats is None:
+        repeats = DEFAULT_REPEATS
+
+    if tolerance is None:
+        tolerance = DEFAULT_TOLERANCE
+
+    benchmarks = Benchmarks(QUICK_IMAGE_SIZES if quick else None,
+                            QUICK_BOX_COUNTS if quick else None, repeats,
+                            name_filter)
+
+    results = benchmarks.run_all()
+
+    baseline = None
+
+    if baseline_path is not None:
+        baseline = load_baseline(baseline_path)
+
+    print(format_results(results, baseline))
+
+    if save_path is not None:
+        save_results(save_path, results)
+
+    if baseline is None:
+        return []
+
+    regressions = find_regressions(results, baseline, tolerance)
+
+    for name, ratio in regressions:
+        print("REGRESSION: {} is {:.2f}x slower than the baseline".format(
+            name, ratio))
+
+    return regressions
@@ -0,0 +1,249 @@
+"""An on-disk cache of augmented images, addressed by their inputs."""
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+from .util.files import link_or_copy, replacing
+
+DEFAULT_CACHE_SIZE_MB = 1024
+
+CACHE_COMMIT_INTERVAL = 64
+
+
+def cache_key(image_name, input_key, config_key):
+    """Return the key of an augmented image in the cache.
+
+    The key depends on the name of the image (which the random numbers
+    drawn for it depend on), a hash of the input image and annotations,
+    and a hash of the configuration of the augmentation, including the
+    seed.
+    """
+    return hashlib.sha256("\n".join([image_name, input_key,
+                                     config_key]).encode("utf-8")).hexdigest()
+
+
+class CacheEntry:
+
+    """An augmented image stored in the cache.
+
+    The encoded image is stored in the file at image_path, and shape and
+    bboxes describe the augmented image and its annotations.
+    """
+
+    def __init__(self, key, image_path, shape, bboxes):
+        """Construct a cache entry."""
+        self.key = key
+        self.image_path = image_path
+        self.shape = shape
+        self.bboxes = bboxes
+
+
+class AugmentationCache:
+
+    """A content-addressed cache of encoded augmented images.
+
+    Each augmented image is stored as the file written by the image writer,
+    along with a JSON file holding the shape of the image and its
+    annotations, so an unchanged augmentation can be written again by hard
+    linking (or copying) the file instead of augmenting and encoding the
+    image again.
+
+    Once the files in the cache take up more than max_bytes, the least
+    recently used entries are removed. Entries that have been looked up
+    but not yet released are never removed. The number of hits, misses,
+    and evictions are counted, and reported by stats.
+
+    Caches can be used in a with context.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_CACHE_SIZE_MB << 20):
+        """Construct a cache stored in the given directory."""
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.pinned = {}
+        self.pending = []
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        """Index the entries already in the cache."""
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        found = []
+
+        for file_name in os.listdir(self.directory):
+
+            key, ext = os.path.splitext(file_name)
+
+            if ext != ".json":
+                continue
+
+            try:
+                with open(self._path(file_name), "r",
+                          encoding="utf-8") as metadata_file:
+                    image_file = json.load(metadata_file)["image"]
+
+                metadata = os.stat(self._path(file_name))
+                size = (metadata.st_size +
+                        os.stat(self._path(image_file)).st_size)
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+
+            found.append((metadata.st_mtime_ns, key, image_file, size))
+
+        for _, key, image_file, size in sorted(found):
+            self.entries[key] = (image_file, size)
+            self.total_bytes += size
+
+        with self.lock:
+            self._evict()
+
+        return self
+
+    def __exit__(self, _exc_type, _exc_val, _exc_tb):
+        """Close the cache."""
+
+    def _path(self, file_name):
+        """Return the path of a file in the cache directory."""
+        return os.path.join(self.directory, file_name)
+
+    def lookup(self, key):
+        """Return the CacheEntry with the given key, or None.
+
+        The entry is marked as the most recently used, and will not be
+        removed from the cache until it is released.
+        """
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+
+            image_file, _ = self.entries[key]
+
+            self.entries.move_to_end(key)
+            self.pinned[key] = self.pinned.get(key, 0) + 1
+            self.hits += 1
+
+        try:
+            metadata_path = self._path(key + ".json")
+
+            with open(metadata_path, "r",
+                      encoding="utf-8") as metadata_file:
+                metadata = json.load(metadata_file)
+
+            # Remember when the entry was used for the next run
+            os.utime(metadata_path)
+        except (OSError, ValueError):
+            self.release(key)
+
+            with self.lock:
+                self.hits -= 1
+                self.misses += 1
+
+            return None
+
+        return CacheEntry(key, self._path(image_file), metadata["shape"],
+                          np.array(metadata["bboxes"]).reshape(-1, 5))
+
+    def release(self, key):
+        """Allow an entry returned by lookup to be removed again."""
+        with self.lock:
+            self.pinned[key] -= 1
+
+            if self.pinned[key] == 0:
+                del self.pinned[key]
+
+            self._evict()
+
+    def add(self, key, image_path, shape, bboxes):
+        """Add an image to the cache at the next commit.
+
+        image_path is the file the image is written to by an image writer,
+        which must have been written in full before commit is called.
+        """
+        self.pending.append((key, image_path, list(shape),
+                             np.asarray(bboxes, dtype=np.float64).tolist()))
+
+    def commit_due(self):
+        """Return whether enough images have been added to commit."""
+        return len(self.pending) >= CACHE_COMMIT_INTERVAL
+
+    def commit(self):
+        """Store the images passed to add in the cache."""
+        pending, self.pending = self.pending, []
+
+        for key, image_path, shape, bboxes in pending:
+
+            image_file = key + os.path.splitext(image_path)[1]
+
+            link_or_copy(image_path, self._path(image_file))
+
+            with replacing(self._path(key + ".json")) as temp_path:
+                with open(temp_path, "w",
+                          encoding="utf-8") as metadata_file:
+                    json.dump(
+                        {
+                            "image": image_file,
+                            "shape": shape,
+                            "bboxes": bboxes
+                        }, metadata_file)
+
+            size = (os.stat(self._path(image_file)).st_size +
+                    os.stat(self._path(key + ".json")).st_size)
+
+            with self.lock:
+                if key in self.entries:
+                    self.total_bytes -= self.entries[key][1]
+
+                self.entries[key] = (image_file, size)
+                self.entries.move_to_end(key)
+                self.total_bytes += size
+
+                self._evict()
+
+    def _evict(self):
+        """Remove the least recently used entries that are not in use.
+
+        This must be called with the lock held.
+        """
+        for key in list(self.entries):
+
+            if self.total_bytes <= self.max_bytes:
+                break
+
+            if key in self.pinned:
+                continue
+
+            image_file, size = self.entries.pop(key)
+
+            for file_name in [key + ".json", image_file]:
+                try:
+                    os.remove(self._path(file_name))
+                except OSError:
+                    pass
+
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def stats(self):
+        """Return the hits, misses, evictions, and size of the cache."""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": self.total_bytes
+            }
@@ -1,5 +1,8 @@
 """An easy-to-use library interface for Discolight."""
-from .augmentations.augmentation.types import Augmentation
+import numpy as np
+
+from .augmentations.augmentation.types import (AffineAugmentation,
+                                               Augmentation)
 from .augmentations.factory import (make_augmentations_factory,
                                     get_augmentations_set)
 from .annotations import (annotations_from_numpy_array,
@@ -45,6 +48,15 @@ class DiscolightInterface:
 
         image = load_image(...)
         aug_img = seq(image)
+
+    To augment many images at once (e.g., in a training loop), pass a list
+    of images, or a NxHxWxC numpy array of them, to the batch method:
+
+        aug_imgs = aug.batch(images)
+        aug_imgs, aug_annotations_list = aug.batch(images, annotations_list)
+
+    Color augmentations process a whole batch of images together, so this
+    is considerably faster than augmenting each image separately.
     """
 
     def __init__(self):
@@ -75,7 +87,12 @@ class DiscolightInterface:
             # the static params() method, so we can't just pass it to the
             # constructor.
 
-            class CallableAugmentation(Augmentation):
+            # Affine augmentations stay affine, so that Sequence can still
+            # combine them when they are constructed through this interface.
+            base = (AffineAugmentation if isinstance(
+                augmentation, AffineAugmentation) else Augmentation)
+
+            class CallableAugmentation(base):
 
                 """An augmentation that can be invoked as a function."""
 
@@ -83,6 +100,11 @@ class DiscolightInterface:
                     """Construct a new callable augmentation."""
                     self.augmentation = augmentation
 
+                @property
+                def mutates_image(self):
+                    """Return whether the augmentation mutates images."""
+                    return self.augmentation.mutates_image
+
                 @staticmethod
                 def params():
                     """Return the parameters for this augmenation."""
@@ -92,6 +114,15 @@ class DiscolightInterface:
                     """Perform the given augmentation."""
                     return self.augmentation.augment(img, bboxes)
 
+                def augment_batch(self, images, bboxes_list):
+                    """Perform the given augmentation on a batch."""
+                    return self.augmentation.augment_batch(
+                        images, bboxes_list)
+
+                def get_transform(self, height, width):
+                    """Return the transform of an affine augmentation."""
+                    return self.augmentation.get_transform(height, width)
+
                 def __call__(self, image, annotations=None):
                     """Perform the given augmentation.
 
@@ -100,17 +131,56 @@ class DiscolightInterface:
                     annotations can be optionally passed as a list of
                     BoundingBox objects (conversion to and from the numpy
                     array format is handled for you).
+
+                    The given image is never modified, and is only copied
+                    if the augmentation would otherwise modify it. The
+                    returned image may share memory with the given one, so
+                    copy it before modifying it in place.
                     """
-                    if annotations is None:
-                        return self.augmentation.get_img(image.copy())
+                    bboxes = (np.empty((0, 5)) if annotations is None else
+                              annotations_to_numpy_array(annotations))
 
-                    bboxes = annotations_to_numpy_array(annotations)
+                    aug_img, aug_bboxes = \
+                        self.augmentation.augment_preserving_input(
+                            image, bboxes)
 
-                    aug_img, aug_bboxes = self.augmentation.augment(
-                        image.copy(), bboxes.copy())
+                    if annotations is None:
+                        return aug_img
 
                     return aug_img, annotations_from_numpy_array(aug_bboxes)
 
+                def batch(self, images, annotations_list=None):
+                    """Perform the given augmentation on a batch of images.
+
+                    images can be a list of images, or a NxHxWxC numpy
+                    array of images with the same shape. Augmenting a batch
+                    at once is faster than augmenting each image in turn,
+                    especially for small images. As when invoking this
+                    object as a function, annotations_list is optional, and
+                    contains a list of BoundingBox objects for each image.
+                    """
+                    if self.augmentation.mutates_image:
+                        images = (images.copy()
+                                  if isinstance(images, np.ndarray) else
+                                  [image.copy() for image in images])
+
+                    if annotations_list is None:
+                        aug_images, _ = self.augmentation.augment_batch(
+                            images, [np.empty((0, 5)) for _ in images])
+
+                        return aug_images
+
+                    aug_images, aug_bboxes_list = \
+                        self.augmentation.augment_batch(images, [
+                            annotations_to_numpy_array(annotations)
+                            for annotations in annotations_list
+                        ])
+
+                    return aug_images, [
+                        annotations_from_numpy_array(aug_bboxes)
+                        for aug_bboxes in aug_bboxes_list
+                    ]
+
             return CallableAugmentation()
 
         return make_augmentation
@@ -128,6 +128,24 @@ def load_annotations_for_sample_image(annotations_path):
     return annotations
 
 
+def load_sample_options(augmentation_name):
+    """Load the options used to showcase an augmentation.
+
+    The options are loaded from a YAML file named after the augmentation
+    in the doc_templates/augmentations directory. If there is no such file,
+    the augmentation is showcased with its default options, and an empty
+    dictionary is returned.
+    """
+    options_dir = os.path.dirname(augmentation_options.__file__)
+
+    try:
+        with open(os.path.join(options_dir, "{}.yml".format(
+                augmentation_name))) as options_file:
+            return yamale.make_data(content=options_file.read())[0][0]
+    except IOError:
+        return {}
+
+
 def make_augmentation_doc_object(augmentation, sample_image_path,
                                  sample_annotations_path, output_dir):
     """Generate an object for documenting an augmentation in a template.
@@ -139,18 +157,7 @@ def make_augmentation_doc_object(augmentation, sample_image_path,
     """
     doc_object = make_doc_object(augmentation)
 
-    options_dir = os.path.dirname(augmentation_options.__file__)
-
-    options = {}
-    try:
-        with open(
-                os.path.join(options_dir, "{}.yml".format(
-                    augmentation.__name__))) as options_file:
-            content = options_file.read()
-
-            options = yamale.make_data(content=content)[0][0]
-    except IOError:
-        pass
+    options = load_sample_options(augmentation.__name__)
 
     if options != {}:
         doc_object["sample_options"] = yaml.dump(options,
@@ -1,8 +1,10 @@
 """A COCO annotation loader."""
-import json
+from array import array
+import numpy as np
 from discolight.params.params import Params
-from discolight.annotations import BoundingBox, ImageWithAnnotations
-from .types import AnnotationLoader
+from discolight.annotations import AnnotationTable, ImageWithAnnotations
+from discolight.util.jsonstream import iter_json_object
+from .types import AnnotationLoader, load_images
 
 
 class COCO(AnnotationLoader):
@@ -14,11 +16,12 @@ class COCO(AnnotationLoader):
         self.annotations_file = annotations_file
 
         self.annotations_fp = None
-        self.coco_json = None
 
     def __enter__(self):
         """Open the annotations_file for reading."""
-        self.annotations_fp = open(self.annotations_file, "r")
+        self.annotations_fp = open(self.annotations_file,
+                                   "r",
+                                   encoding="utf-8")
         return self
 
     def __exit__(self, _exc_type, _exc_val, _exc_tb):
@@ -35,42 +38,158 @@ class COCO(AnnotationLoader):
 
     def load_annotated_images(self, image_loader):
         """Load annotations and images from a COCO JSON file."""
-        coco_json = json.load(self.annotations_fp)
-
-        licenses = {}
-        categories = {}
-        images_json = {}
-
-        for licens in coco_json["licenses"]:
-            licenses[str(licens["id"])] = licens
-
-        for category in coco_json["categories"]:
-            categories[str(category["id"])] = category
-
-        for image in coco_json["images"]:
-            images_json[str(image["id"])] = image
-
+        return dict(self.iter_annotated_images(image_loader))
+
+    def read_annotations_file(self):
+        """Read the annotations file incrementally.
+
+        IDs are compared as strings, so an ID may be given as a number in
+        one place and as a string in another. Each image ID is given an
+        integer index the first time it is seen, and the category ID and
+        bounding box of every annotation, and the index of its image, are
+        stored in flat arrays, so no more than one annotation object is
+        held in memory at a time. Only the file name and license ID of each
+        image is kept, and image_order holds the image indices in file
+        order.
+        """
+        image_ids = []
+        image_indices = {}
         images = {}
+        image_order = []
+        categories = {}
+        licenses = {}
 
-        for annotation in coco_json["annotations"]:
-
-            image_name = images_json[str(annotation["image_id"])]["file_name"]
-            image_license_id = images_json[str(
-                annotation["image_id"])]["license"]
-
-            if image_name not in images:
-
-                image = image_loader.load_image(image_name)
-                images[image_name] = ImageWithAnnotations(image, [])
-
-            images[image_name].bboxes.append(
-                BoundingBox(
-                    annotation["bbox"][0], annotation["bbox"][1],
-                    annotation["bbox"][0] + annotation["bbox"][2],
-                    annotation["bbox"][1] + annotation["bbox"][3],
-                    annotation["category_id"], {
-                        "category": categories[str(annotation["category_id"])],
-                        "image_license": licenses[str(image_license_id)]
-                    }))
-
-        return images
+        annotation_image_indices = array("q")
+        annotation_category_ids = array("q")
+        annotation_bboxes = array("d")
+
+        def get_image_idx(image_id):
+
+            image_idx = image_indices.setdefault(str(image_id),
+                                                 len(image_ids))
+
+            if image_idx == len(image_ids):
+                image_ids.append(image_id)
+
+            return image_idx
+
+        for key, value in iter_json_object(self.annotations_fp,
+                                           ["images", "annotations"]):
+
+            if key == "annotations":
+                if len(value["bbox"]) < 4:
+                    raise ValueError("Annotation {} has an incomplete "
+                                     "bounding box".format(value["id"]))
+
+                try:
+                    category_id = int(value["category_id"])
+                except ValueError as exc:
+                    raise ValueError(
+                        "Annotation {} has category ID {}, which cannot be "
+                        "used as a class index".format(
+                            value["id"], value["category_id"])) from exc
+
+                annotation_image_indices.append(
+                    get_image_idx(value["image_id"]))
+                annotation_category_ids.append(category_id)
+                annotation_bboxes.extend(value["bbox"][:4])
+            elif key == "images":
+                image_idx = get_image_idx(value["id"])
+
+                images[image_idx] = (value["file_name"],
+                                     value.get("license"))
+                image_order.append(image_idx)
+            elif key == "categories":
+                for category in value:
+                    categories[str(category["id"])] = category
+            elif key == "licenses":
+                for licens in value:
+                    licenses[str(licens["id"])] = licens
+
+        return (image_ids, images, image_order, categories, licenses,
+                np.frombuffer(annotation_image_indices, dtype=np.int64),
+                np.frombuffer(annotation_category_ids, dtype=np.int64),
+                np.frombuffer(annotation_bboxes,
+                              dtype=np.float64).reshape(-1, 4))
+
+    def iter_annotated_images(self, image_loader, lazy=False):
+        """Load annotations and images from a COCO JSON file, one at a time.
+
+        Images with annotations are yielded in the order in which they
+        appear in the images array of the file.
+        """
+        (image_ids, images, image_order, categories, licenses,
+         annotation_image_indices, annotation_category_ids,
+         annotation_bboxes) = self.read_annotations_file()
+
+        # Group the annotations of each image together, in file order
+        order = np.argsort(annotation_image_indices, kind="stable")
+
+        grouped_image_indices, group_starts, group_counts = np.unique(
+            annotation_image_indices[order],
+            return_index=True,
+            return_counts=True)
+
+        groups = dict(
+            zip(grouped_image_indices.tolist(),
+                zip(group_starts.tolist(), group_counts.tolist())))
+
+        for image_idx in groups:
+            if image_idx not in images:
+                raise ValueError(
+                    "Annotations refer to image {}, which is not in the "
+                    "annotations file".format(image_ids[image_idx]))
+
+        image_order = [
+            image_idx for image_idx in image_order if image_idx in groups
+        ]
+
+        # Annotations with the same category and image license share their
+        # additional info
+        additional_info = []
+        info_idx = {}
+
+        def get_info_idx(category_id, image_license_id):
+
+            info_key = (category_id, image_license_id)
+
+            if info_key not in info_idx:
+                info_idx[info_key] = len(additional_info)
+                additional_info.append({
+                    "category":
+                    categories[str(category_id)],
+                    "image_license":
+                    None if image_license_id is None else
+                    licenses[str(image_license_id)]
+                })
+
+            return info_idx[info_key]
+
+        loaded_images = load_images(
+            image_loader, [images[image_idx][0] for image_idx in image_order],
+            lazy)
+
+        for image_idx, image in zip(image_order, loaded_images):
+
+            image_name, image_license_id = images[image_idx]
+
+            start, count = groups[image_idx]
+            group = order[start:start + count]
+
+            x_min, y_min, width, height = annotation_bboxes[group].T
+            category_ids = annotation_category_ids[group]
+
+            image_category_ids, category_idx = np.unique(category_ids,
+                                                         return_inverse=True)
+
+            category_info = np.array([
+                get_info_idx(category_id, image_license_id)
+                for category_id in image_category_ids.tolist()
+            ])
+
+            yield image_name, ImageWithAnnotations(
+                image,
+                AnnotationTable.from_numpy(
+                    np.column_stack((x_min, y_min, x_min + width,
+                                     y_min + height, category_ids)),
+                    category_info[category_idx], additional_info))
@@ -1,5 +1,4 @@
 """A CSV annotation loader that reads all four corners of the bounding box."""
-from discolight.annotations import BoundingBox
 from .types import CSVRow, CSVAnnotationLoader
 
 
@@ -19,7 +18,7 @@ class FourCornersCSV(CSVAnnotationLoader):
         y_max = float(row["y_max"])
 
         image_name = row["image_name"]
-        class_idx = row["label"]
+        class_idx = int(row["label"])
 
         return CSVRow(image_name=image_name,
-                      bbox=BoundingBox(x_min, y_min, x_max, y_max, class_idx))
+                      bbox=(x_min, y_min, x_max, y_max, class_idx))
@@ -1,34 +1,64 @@
 """A Pascal VOC annnotation loader."""
 import glob
+import multiprocessing
 import defusedxml.ElementTree as ET
 from discolight.params.params import Params
-from discolight.annotations import BoundingBox, ImageWithAnnotations
-from .types import AnnotationLoader
+from discolight.augmentations.augmentation.types import BoundedNumber
+from discolight.annotations import AnnotationTable, ImageWithAnnotations
+from .types import AnnotationLoader, load_images
+
+# The maximum number of XML files sent to a worker process at a time
+PARSE_CHUNK_SIZE = 64
 
 
 class PascalVOC(AnnotationLoader):
 
-    """A Pascal VOC annotation loader."""
+    """A Pascal VOC annotation loader.
+
+    If workers is greater than 0, the XML files are parsed on a pool of
+    worker processes. Class indices are still assigned to object names
+    in this process, in the order of the files, so the annotations loaded
+    are the same for any number of workers.
+    """
 
-    def __init__(self, annotations_folder):
+    def __init__(self, annotations_folder, workers=0):
         """Construct a new Pascal VOC annotation loader."""
         self.annotations_folder = annotations_folder
+        self.workers = workers
+        self.pool = None
+
         self.name_to_class_idx = {}
         self.next_class_idx = 0
 
+        # Objects with the same name, pose, truncated, and difficult tags
+        # share their additional info
+        self.additional_info = []
+        self.info_idx = {}
+
     def __enter__(self):
         """Open the annotation loader."""
+        if self.workers > 0:
+            self.pool = multiprocessing.Pool(self.workers)
+
         return self
 
     def __exit__(self, _exc_type, _exc_val, _exc_tb):
         """Close the annotation loader."""
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
 
     @staticmethod
     def params():
         """Return a Params object describing constructor parameters."""
-        return Params().add("annotations_folder",
-                            "The folder where the annotations are stored", str,
-                            "", True)
+        return Params().add(
+            "annotations_folder",
+            "The folder where the annotations are stored", str, "",
+            True).add(
+                "workers",
+                "The number of processes to parse XML files on (0 to parse "
+                "them in this process)", BoundedNumber(int, 0), 0)
 
     @staticmethod
     def parse_xml_bounding_box(bndbox):
@@ -61,8 +91,13 @@ class PascalVOC(AnnotationLoader):
 
         return xmin, ymin, xmax, ymax
 
-    def parse_xml_object(self, obj):
-        """Parse an annotation from an XML <object> tag."""
+    @staticmethod
+    def parse_xml_object(obj):
+        """Parse an annotation from an XML <object> tag.
+
+        The bounding box is returned as an (x_min, y_min, x_max, y_max)
+        tuple, along with a (name, pose, truncated, difficult) tuple.
+        """
         name = ""
         pose = ""
         truncated = ""
@@ -95,35 +130,26 @@ class PascalVOC(AnnotationLoader):
 
             xmin, ymin, xmax, ymax = PascalVOC.parse_xml_bounding_box(obj_tag)
 
-        additional_info = {
-            "name": name,
-            "pose": pose,
-            "truncated": truncated,
-            "difficult": difficult
-        }
-
-        try:
-            class_idx = int(name)
-            self.next_class_idx = class_idx + 1
-        except ValueError:
-            class_idx = self.name_to_class_idx.get(name, self.next_class_idx)
-
-            if class_idx == self.next_class_idx:
-                self.name_to_class_idx[name] = self.next_class_idx
-                self.next_class_idx += 1
+        if xmin is None:
+            raise ValueError("Annotation missing bounding box")
 
-        annotation = BoundingBox(xmin, ymin, xmax, ymax, class_idx,
-                                 additional_info)
+        return (xmin, ymin, xmax, ymax), (name, pose, truncated, difficult)
 
-        return annotation
-
-    def load_annotations_from_xml(self, filename):
-        """Load an image and annotations from a Pascal VOC-format XML file."""
+    @staticmethod
+    def parse_xml_file(filename):
+        """Parse a Pascal VOC-format XML file.
+
+        The image filename is returned, along with the bounding boxes and
+        tags of its objects, as returned by parse_xml_object. Parsing does
+        not depend on the state of the loader, so files can be parsed in
+        any process.
+        """
         tree = ET.parse(filename)
         root = tree.getroot()
 
         image_filename = None
-        annotations = []
+        bboxes = []
+        objects = []
 
         for tag in root:
 
@@ -133,24 +159,91 @@ class PascalVOC(AnnotationLoader):
             if tag.tag != "object":
                 continue
 
-            annotations.append(self.parse_xml_object(tag))
+            bbox, obj = PascalVOC.parse_xml_object(tag)
+
+            bboxes.append(bbox)
+            objects.append(obj)
 
         if image_filename is None:
             raise ValueError("Image filename not specified")
 
-        return image_filename, annotations
+        return image_filename, bboxes, objects
 
-    def load_annotated_images(self, image_loader):
-        """Load annotations, images from a directory in Pascal VOC format."""
-        images = {}
+    def get_class_idx(self, name):
+        """Return the class index of an object with the given name.
+
+        Names that are integers are their own class index. Other names are
+        given the next class index the first time they are seen, so class
+        indices depend on the order in which objects are merged.
+        """
+        try:
+            class_idx = int(name)
+            self.next_class_idx = class_idx + 1
+        except ValueError:
+            class_idx = self.name_to_class_idx.get(name, self.next_class_idx)
+
+            if class_idx == self.next_class_idx:
+                self.name_to_class_idx[name] = self.next_class_idx
+                self.next_class_idx += 1
+
+        return class_idx
+
+    def merge_xml_file(self, parsed):
+        """Assign class indices to the objects of a parsed XML file.
+
+        parsed is the result of parse_xml_file, and the image filename is
+        returned along with the AnnotationTable of the file.
+        """
+        image_filename, bboxes, objects = parsed
+
+        rows = []
+        info = []
+
+        for bbox, obj in zip(bboxes, objects):
 
-        for annotation_file in glob.glob("{}/{}".format(
-                self.annotations_folder, "*.xml")):
+            if obj not in self.info_idx:
+                self.info_idx[obj] = len(self.additional_info)
+                self.additional_info.append(
+                    dict(zip(["name", "pose", "truncated", "difficult"],
+                             obj)))
 
-            image_name, annotations = self.load_annotations_from_xml(
-                annotation_file)
+            rows.append(bbox + (self.get_class_idx(obj[0]), ))
+            info.append(self.info_idx[obj])
 
-            images[image_name] = ImageWithAnnotations(
-                image=image_loader.load_image(image_name), bboxes=annotations)
+        return image_filename, AnnotationTable.from_numpy(
+            rows, info, self.additional_info)
 
-        return images
+    def load_annotations_from_xml(self, filename):
+        """Load an image and annotations from a Pascal VOC-format XML file."""
+        return self.merge_xml_file(PascalVOC.parse_xml_file(filename))
+
+    def load_annotated_images(self, image_loader):
+        """Load annotations, images from a directory in Pascal VOC format."""
+        return dict(self.iter_annotated_images(image_loader))
+
+    def iter_annotated_images(self, image_loader, lazy=False):
+        """Load annotations, images in Pascal VOC format, one at a time."""
+        annotation_files = glob.glob("{}/{}".format(self.annotations_folder,
+                                                    "*.xml"))
+
+        if self.pool is None:
+            parsed_files = map(PascalVOC.parse_xml_file, annotation_files)
+        else:
+            parsed_files = self.pool.imap(
+                PascalVOC.parse_xml_file, annotation_files,
+                max(1, min(PARSE_CHUNK_SIZE,
+                           len(annotation_files) // self.workers)))
+
+        # Class indices are assigned in the same order as when parsing
+        # every file in turn, regardless of the number of workers
+        annotations = [
+            self.merge_xml_file(parsed) for parsed in parsed_files
+        ]
+
+        images = load_images(image_loader,
+                             [image_name for image_name, _ in annotations],
+                             lazy)
+
+        for (image_name, bboxes), image in zip(annotations, images):
+
+            yield image_name, ImageWithAnnotations(image=image, bboxes=bboxes)
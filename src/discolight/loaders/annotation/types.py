@@ -3,7 +3,21 @@ from abc import ABC, abstractmethod
 import csv
 from collections import namedtuple
 from discolight.params.params import Params
-from discolight.annotations import ImageWithAnnotations
+from discolight.loaders.image.types import LazyImage
+from discolight.annotations import (AnnotationTable, BoundingBox,
+                                    ImageWithAnnotations, NO_INFO)
+
+
+def load_images(image_loader, image_names, lazy=False):
+    """Load the images with the given names for an annotation loader.
+
+    If lazy is True, LazyImage handles are returned instead of images, so
+    no image is decoded until its pixels are needed.
+    """
+    if lazy:
+        return image_loader.lazy_images(image_names)
+
+    return image_loader.load_images(image_names)
 
 
 class AnnotationLoader(ABC):
@@ -42,10 +56,39 @@ class AnnotationLoader(ABC):
 
         The loaded images and annotations should be returned in a
         dictionary where the image names are the keys, and the values
-        are ImageWithAnnotations named tuple objects.
+        are ImageWithAnnotations named tuple objects. The annotations of
+        each image should be an AnnotationTable, although a list of
+        BoundingBox objects is also accepted.
         """
         raise NotImplementedError
 
+    def iter_annotated_images(self, image_loader, lazy=False):
+        """Load annotations and images one image at a time.
+
+        This is a generator that yields (image_name, ImageWithAnnotations)
+        tuples in the same order as load_annotated_images. Each image is
+        only loaded when its tuple is yielded, so consumers can process a
+        dataset without holding every image in memory at once.
+
+        If lazy is True, the image in each tuple is a LazyImage handle
+        instead, and the consumer decides when (and if) the image is
+        loaded. Only the size of an image is read if an annotation loader
+        needs it, e.g., to unnormalize bounding boxes.
+
+        The default implementation iterates over the result of
+        load_annotated_images, so every image is loaded up front, and if
+        lazy is True, each image is wrapped in a LazyImage handle that
+        already holds its pixels. Annotation loaders should override this
+        method if they are able to load images lazily.
+        """
+        annotated_images = self.load_annotated_images(image_loader)
+
+        for image_name, (image, bboxes) in annotated_images.items():
+            if lazy:
+                image = LazyImage(image_loader, image_name, image)
+
+            yield image_name, ImageWithAnnotations(image, bboxes)
+
 
 CSVRow = namedtuple('CSVRow', 'image_name bbox')
 
@@ -93,13 +136,23 @@ class CSVAnnotationLoader(AnnotationLoader):
 
         The raw CSV row is passed as a dictionary object where the keys
         correspond to field names of the file. The CSVRow object must
-        be constructed with the image name, and a BoundingBox object.
+        be constructed with the image name, and either an (x_min, y_min,
+        x_max, y_max, class_idx) tuple or a BoundingBox object.
         """
         raise NotImplementedError
 
     def load_annotated_images(self, image_loader):
         """Load annotations and images from a CSV file."""
-        images = {}
+        return dict(self.iter_annotated_images(image_loader))
+
+    def iter_annotated_images(self, image_loader, lazy=False):
+        """Load annotations and images from a CSV file, one at a time.
+
+        Rows for an image do not need to be contiguous in the CSV file, so
+        all of the annotations are read before any images are loaded.
+        """
+        annotations = {}
+        additional_info = []
 
         reader = csv.DictReader(self.annotations_fp, skipinitialspace=True)
 
@@ -107,26 +160,30 @@ class CSVAnnotationLoader(AnnotationLoader):
 
             csv_row = self.get_csv_row(row)
 
-            if csv_row.image_name in images:
-                if self.normalized:
-                    height, width, _ = images[csv_row.image_name].image.shape
+            bboxes, info = annotations.setdefault(csv_row.image_name,
+                                                  ([], []))
+
+            if isinstance(csv_row.bbox, BoundingBox):
+                bboxes.append(csv_row.bbox.as_list())
 
-                    images[csv_row.image_name].bboxes.append(
-                        csv_row.bbox.unnormalize(width, height))
-                    continue
+                if csv_row.bbox.additional_info:
+                    info.append(len(additional_info))
+                    additional_info.append(csv_row.bbox.additional_info)
+                else:
+                    info.append(NO_INFO)
+            else:
+                bboxes.append(csv_row.bbox)
+                info.append(NO_INFO)
 
-                images[csv_row.image_name].bboxes.append(csv_row.bbox)
-                continue
+        images = load_images(image_loader, list(annotations), lazy)
 
-            image = image_loader.load_image(csv_row.image_name)
+        for (image_name, (bboxes, info)), image in zip(annotations.items(),
+                                                       images):
+
+            bboxes = AnnotationTable.from_numpy(bboxes, info, additional_info)
 
-            annotation = csv_row.bbox
             if self.normalized:
                 height, width, _ = image.shape
-                annotation = csv_row.bbox.unnormalize(width, height)
-
-            images[csv_row.image_name] = ImageWithAnnotations(
-                image=image_loader.load_image(csv_row.image_name),
-                bboxes=[annotation])
+                bboxes = bboxes.unnormalize(width, height)
 
-        return images
+            yield image_name, ImageWithAnnotations(image=image, bboxes=bboxes)
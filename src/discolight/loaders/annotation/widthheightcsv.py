@@ -1,5 +1,4 @@
 """A CSV annotation writer that reads the bbox in x, y, w, h format."""
-from discolight.annotations import BoundingBox
 from .types import CSVRow, CSVAnnotationLoader
 
 
@@ -22,7 +21,7 @@ class WidthHeightCSV(CSVAnnotationLoader):
         y_max = y_min + height
 
         image_name = row["image_name"]
-        class_idx = row["label"]
+        class_idx = int(row["label"])
 
         return CSVRow(image_name=image_name,
-                      bbox=BoundingBox(x_min, y_min, x_max, y_max, class_idx))
+                      bbox=(x_min, y_min, x_max, y_max, class_idx))
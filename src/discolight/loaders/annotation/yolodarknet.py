@@ -3,8 +3,8 @@ import glob
 import os
 import re
 from discolight.params.params import Params
-from discolight.annotations import BoundingBox, ImageWithAnnotations
-from .types import AnnotationLoader
+from discolight.annotations import AnnotationTable, ImageWithAnnotations
+from .types import AnnotationLoader, load_images
 
 
 class YOLODarknet(AnnotationLoader):
@@ -35,47 +35,56 @@ class YOLODarknet(AnnotationLoader):
 
     def load_annotated_images(self, image_loader):
         """Load annotations, images from a directory in YOLO Darknet format."""
-        images = {}
+        return dict(self.iter_annotated_images(image_loader))
 
-        for annotation_filename in glob.glob(
-                os.path.join(self.annotations_folder, "*.txt")):
+    @staticmethod
+    def load_normalized_annotations(annotation_filename):
+        """Load the normalized bounding boxes from an annotation file."""
+        annotations = []
 
-            image_name_no_ext = re.match(
-                rf"^{self.annotations_folder}{os.path.sep}(.+)\.txt$",
-                annotation_filename).group(1)
-            image_name = "{}.{}".format(image_name_no_ext, self.image_ext)
+        with open(annotation_filename, 'r') as annotation_file:
 
-            annotations = []
+            for line in annotation_file:
 
-            image = image_loader.load_image(image_name)
+                if line.strip() == "":
+                    continue
 
-            height, width, _ = image.shape
+                row = [
+                    float(col) for col in line.replace("\t", " ").split(" ")
+                    if col != ""
+                ]
 
-            with open(annotation_filename, 'r') as annotation_file:
+                class_idx = int(row[0])
+                x_min = row[1]
+                y_min = row[2]
+                x_max = x_min + row[3]
+                y_max = y_min + row[4]
 
-                for line in annotation_file:
+                annotations.append((x_min, y_min, x_max, y_max, class_idx))
 
-                    if line.strip() == "":
-                        continue
+        return AnnotationTable.from_numpy(annotations)
 
-                    row = [
-                        float(col)
-                        for col in line.replace("\t", " ").split(" ")
-                        if col != ""
-                    ]
+    def iter_annotated_images(self, image_loader, lazy=False):
+        """Load annotations, images in YOLO Darknet format, one at a time."""
+        annotations = {}
 
-                    class_idx = int(row[0])
-                    x_min = row[1]
-                    y_min = row[2]
-                    x_max = x_min + row[3]
-                    y_max = y_min + row[4]
+        for annotation_filename in glob.glob(
+                os.path.join(self.annotations_folder, "*.txt")):
+
+            image_name_no_ext = re.match(
+                rf"^{self.annotations_folder}{os.path.sep}(.+)\.txt$",
+                annotation_filename).group(1)
+            image_name = "{}.{}".format(image_name_no_ext, self.image_ext)
 
-                    normalized = BoundingBox(x_min, y_min, x_max, y_max,
-                                             class_idx)
-                    unnormalized = normalized.unnormalize(width, height)
+            annotations[image_name] = self.load_normalized_annotations(
+                annotation_filename)
 
-                    annotations.append(unnormalized)
+        images = load_images(image_loader, list(annotations), lazy)
 
-            images[image_name] = ImageWithAnnotations(image, annotations)
+        for (image_name, normalized), image in zip(annotations.items(),
+                                                   images):
+
+            height, width, _ = image.shape
 
-        return images
+            yield image_name, ImageWithAnnotations(
+                image, normalized.unnormalize(width, height))
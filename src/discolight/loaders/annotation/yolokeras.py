@@ -1,7 +1,7 @@
 """A YOLO Keras annotation loader."""
 from discolight.params.params import Params
-from discolight.annotations import BoundingBox, ImageWithAnnotations
-from .types import AnnotationLoader
+from discolight.annotations import AnnotationTable, ImageWithAnnotations
+from .types import AnnotationLoader, load_images
 
 
 class YOLOKeras(AnnotationLoader):
@@ -32,7 +32,11 @@ class YOLOKeras(AnnotationLoader):
             True)
 
     def load_annotated_images(self, image_loader):
-        """Load annotations and images from a CSV file."""
+        """Load annotations and images from a TXT file."""
+        return dict(self.iter_annotated_images(image_loader))
+
+    def iter_annotated_images(self, image_loader, lazy=False):
+        """Load annotations and images from a TXT file, one at a time."""
 
         def parse_annotation(annotation_str):
 
@@ -46,11 +50,11 @@ class YOLOKeras(AnnotationLoader):
             y_min = float(annotation_parts[1])
             x_max = float(annotation_parts[2])
             y_max = float(annotation_parts[3])
-            class_idx = float(annotation_parts[4])
+            class_idx = int(float(annotation_parts[4]))
 
-            return BoundingBox(x_min, y_min, x_max, y_max, class_idx)
+            return x_min, y_min, x_max, y_max, class_idx
 
-        images = {}
+        annotations = []
 
         for line in self.annotations_fp:
 
@@ -59,11 +63,15 @@ class YOLOKeras(AnnotationLoader):
 
             line_parts = line.strip().split(" ")
 
-            image_name = line_parts[0]
-            image = image_loader.load_image(image_name)
+            annotations.append((line_parts[0],
+                                AnnotationTable.from_numpy(
+                                    list(map(parse_annotation,
+                                             line_parts[1:])))))
 
-            annotations = list(map(parse_annotation, line_parts[1:]))
+        images = load_images(image_loader,
+                             [image_name for image_name, _ in annotations],
+                             lazy)
 
-            images[image_name] = ImageWithAnnotations(image, annotations)
+        for (image_name, bboxes), image in zip(annotations, images):
 
-        return images
+            yield image_name, ImageWithAnnotations(image, bboxes)
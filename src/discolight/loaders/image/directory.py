@@ -1,7 +1,11 @@
 """An image loader that loads images from the local filesystem."""
+import hashlib
 import os
+from concurrent.futures import ThreadPoolExecutor
 from discolight.params.params import Params
-from discolight.util.image import load_image
+from discolight.util.image import load_image, load_image_size
+from discolight.util.pipeline import ordered_map
+from discolight.augmentations.augmentation.types import BoundedNumber
 from .types import ImageLoader
 
 
@@ -11,28 +15,83 @@ class Directory(ImageLoader):
 
     The image name from the AnnotationLoader will be used to fetch a file with
     the same name in the given directory.
+
+    If threads is greater than 0, images requested together are read and
+    decoded on a pool of threads, with up to read_ahead images being
+    loaded ahead of the one currently being waited on. Images are always
+    returned in the order they were requested.
     """
 
-    def __init__(self, directory):
+    def __init__(self, directory, threads=0, read_ahead=16):
         """Construct a new Directory image loader."""
         self.directory = directory
+        self.threads = threads
+        self.read_ahead = read_ahead
+
+        self.executor = None
 
     def __enter__(self):
         """Initialize the image loader."""
+        if self.threads > 0:
+            self.executor = ThreadPoolExecutor(max_workers=self.threads)
+
         return self
 
     def __exit__(self, _exc_type, _exc_vale, _exc_tb):
-        """Close the image writer."""
+        """Close the image loader."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
 
     @staticmethod
     def params():
         """Return a Params object describing constructor parameters."""
-        return Params().add("directory",
-                            "The directory from which to load images", str, "",
-                            True)
+        return Params().add(
+            "directory", "The directory from which to load images", str, "",
+            True).add(
+                "threads",
+                "The number of threads to decode images on (0 to decode "
+                "images only when they are requested)", BoundedNumber(int, 0),
+                0).add(
+                    "read_ahead",
+                    "The maximum number of images to load ahead of time "
+                    "when threads is greater than 0", BoundedNumber(int, 1),
+                    16)
 
     def load_image(self, image_name):
         """Load an image with the given name."""
         image_path = os.path.join(self.directory, image_name)
 
         return load_image(image_path)
+
+    def load_image_size(self, image_name):
+        """Return the (width, height) of an image by reading its header."""
+        image_path = os.path.join(self.directory, image_name)
+
+        return load_image_size(image_path)
+
+    def image_fingerprint(self, image_name):
+        """Return a hash of the contents of an image file."""
+        image_path = os.path.join(self.directory, image_name)
+
+        digest = hashlib.sha256()
+
+        with open(image_path, "rb") as image_file:
+            for chunk in iter(lambda: image_file.read(1 << 20), b""):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    def load_images(self, image_names):
+        """Load the images with the given names, one at a time.
+
+        If threads is greater than 0, upcoming images are decoded in the
+        background. OpenCV releases the GIL while decoding, so several
+        images can be decoded at once.
+        """
+        if self.executor is None:
+            yield from super().load_images(image_names)
+            return
+
+        yield from ordered_map(self.executor, self.load_image, image_names,
+                               self.read_ahead)
@@ -1,5 +1,6 @@
 """Base types for image loaders."""
 from abc import ABC, abstractmethod
+import hashlib
 
 
 class ImageLoader(ABC):
@@ -35,3 +36,102 @@ class ImageLoader(ABC):
         RGB color space.
         """
         raise NotImplementedError
+
+    def load_images(self, image_names):
+        """Load the images with the given names, one at a time.
+
+        This is a generator that yields images in the same order as
+        image_names. Image loaders can override this method to load
+        upcoming images ahead of time, but by default each image is loaded
+        with load_image only when it is requested.
+        """
+        for image_name in image_names:
+            yield self.load_image(image_name)
+
+    def load_image_size(self, image_name):
+        """Return the (width, height) of the image with the given name.
+
+        By default, the image is loaded with load_image to determine its
+        size. Image loaders should override this method if they can read
+        the size of an image without decoding it.
+        """
+        height, width, _ = self.load_image(image_name).shape
+
+        return width, height
+
+    def image_fingerprint(self, image_name):
+        """Return a string that changes whenever the image changes.
+
+        By default, this is a hash of the pixels of the image, which are
+        loaded with load_image. Image loaders should override this method
+        if they can tell when an image changes without decoding it.
+        """
+        image = self.load_image(image_name)
+
+        digest = hashlib.sha256(repr(image.shape).encode("utf-8"))
+        digest.update(image.tobytes())
+
+        return digest.hexdigest()
+
+    def lazy_images(self, image_names):
+        """Return a LazyImage handle for each of the given image names."""
+        for image_name in image_names:
+            yield LazyImage(self, image_name)
+
+
+class LazyImage:
+
+    """A handle to an image that is only loaded when it is needed.
+
+    The shape of the image can be read without loading its pixels, as
+    long as the image loader is able to determine the size of an image
+    without decoding it. The pixels are loaded with load, and kept until
+    release is called.
+    """
+
+    def __init__(self, image_loader, image_name, image=None):
+        """Construct a handle to an image from the given image loader.
+
+        If the image has already been loaded, it can be given, and it is
+        kept until release is called.
+        """
+        self.image_loader = image_loader
+        self.image_name = image_name
+
+        self.image = image
+        self.size = None
+
+    @property
+    def shape(self):
+        """Return the shape of the image in HxWxC format."""
+        if self.image is not None:
+            return self.image.shape
+
+        if self.size is None:
+            self.size = self.image_loader.load_image_size(self.image_name)
+
+        width, height = self.size
+
+        return height, width, 3
+
+    @property
+    def loaded(self):
+        """Return whether the pixels of the image are currently loaded."""
+        return self.image is not None
+
+    def load(self):
+        """Load the image, if needed, and return it as an openCV image."""
+        if self.image is None:
+            self.image = self.image_loader.load_image(self.image_name)
+
+        return self.image
+
+    def release(self):
+        """Release the pixels of the image.
+
+        The image will be loaded again if load is called afterwards.
+        """
+        if self.image is not None:
+            height, width, _ = self.image.shape
+            self.size = (width, height)
+            self.image = None
@@ -0,0 +1,149 @@
+"""A record of the work completed by a generate run, used to resume it."""
+import hashlib
+import json
+import os
+
+import numpy as np
+
+MANIFEST_CHECKPOINT_INTERVAL = 64
+
+
+def hash_config(config):
+    """Return a hash of a JSON-serializable configuration."""
+    return hashlib.sha256(
+        json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def hash_input(image_fingerprint, bboxes):
+    """Return a hash of an input image and its annotations.
+
+    The image is identified by the fingerprint returned by the image
+    loader, and bboxes is the n x 5 numpy array of its annotations.
+    """
+    digest = hashlib.sha256(image_fingerprint.encode("utf-8"))
+    digest.update(np.ascontiguousarray(bboxes, dtype=np.float64).tobytes())
+
+    return digest.hexdigest()
+
+
+class Manifest:
+
+    """A manifest of the outputs written by a generate run.
+
+    The manifest is a file with one JSON object per line. An entry is
+    recorded for each augmentation of each image (where augmentation 0 is
+    the original image) once it has been written, along with a hash of
+    the input image and annotations, a hash of the configuration that
+    produced it, and the shape and annotations of the output image.
+
+    Entries are appended in checkpoints, after the image writer has been
+    flushed, so an entry is never recorded for an image that is not on
+    disk. A run that is interrupted can be resumed, and only the work that
+    is missing from the manifest, or whose input or configuration has
+    changed, is done again. Lines that cannot be parsed (e.g., because the
+    run was killed while a line was written) are ignored.
+
+    Manifests can be used in a with context.
+    """
+
+    def __init__(self, path):
+        """Construct a manifest stored in the file at path."""
+        self.path = path
+
+        self.seed = None
+        self.records = {}
+        self.pending = []
+
+        self.manifest_fp = None
+
+    def __enter__(self):
+        """Load the entries of the manifest, and open it for appending."""
+        needs_newline = False
+
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as manifest_fp:
+                for line in manifest_fp:
+                    needs_newline = not line.endswith("\n")
+                    self._load_line(line)
+
+        self.manifest_fp = open(self.path, "a", encoding="utf-8")
+
+        if needs_newline:
+            self.manifest_fp.write("\n")
+
+        return self
+
+    def __exit__(self, _exc_type, _exc_val, _exc_tb):
+        """Close the manifest file."""
+        self.manifest_fp.close()
+
+    def _load_line(self, line):
+        """Load one line of the manifest file."""
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            return
+
+        if not isinstance(entry, dict):
+            return
+
+        if "seed" in entry:
+            self.seed = entry["seed"]
+        elif "image" in entry and "augmentation" in entry:
+            self.records[(entry["image"], entry["augmentation"])] = entry
+
+    def start(self, seed):
+        """Start a run with the given seed."""
+        if seed != self.seed:
+            self.pending.append({"seed": seed})
+            self.seed = seed
+
+    def lookup(self, image_name, augmentation_idx, input_key, config_key):
+        """Return the entry for an output, if it can be reused.
+
+        None is returned if there is no entry for the output, or if it was
+        produced from a different input or configuration. Only entries
+        recorded by previous runs are returned.
+        """
+        record = self.records.get((image_name, augmentation_idx))
+
+        if (record is None or record["input"] != input_key
+                or record["config"] != config_key):
+            return None
+
+        return record
+
+    def record(self, image_name, augmentation_idx, input_key, config_key,
+               output_name, shape, bboxes):
+        """Record that an output has been passed to the writers.
+
+        The entry is only saved to the manifest file at the next
+        checkpoint.
+        """
+        self.pending.append({
+            "image": image_name,
+            "augmentation": augmentation_idx,
+            "input": input_key,
+            "config": config_key,
+            "output": output_name,
+            "shape": list(shape),
+            "bboxes": np.asarray(bboxes, dtype=np.float64).tolist()
+        })
+
+    def checkpoint_due(self):
+        """Return whether enough entries are pending to checkpoint."""
+        return len(self.pending) >= MANIFEST_CHECKPOINT_INTERVAL
+
+    def checkpoint(self):
+        """Save all pending entries to the manifest file.
+
+        Callers must make sure that the outputs of the pending entries have
+        been written before calling this method.
+        """
+        for entry in self.pending:
+            self.manifest_fp.write(json.dumps(entry) + "\n")
+
+        self.pending = []
+
+        self.manifest_fp.flush()
+        os.fsync(self.manifest_fp.fileno())
@@ -19,6 +19,13 @@ output:
 augmentations: list(include('augmentation'))
 save-original: bool()
 save-bbox: bool()
+read-ahead: int(min=0, required=False)
+workers: int(min=1, required=False)
+seed: int(min=0, required=False)
+manifest: str(required=False)
+cache: str(required=False)
+cache-size: int(min=0, required=False)
+profile: str(required=False)
 ---
 augmentation:
   name: str()
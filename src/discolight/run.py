@@ -24,15 +24,88 @@ def main(args=None):
 
     parser.add_argument("command",
                         metavar="COMMAND",
-                        help="The command to run")
+                        help="The command to run (generate or bench)")
     parser.add_argument("query_file",
                         metavar="QUERY_FILE",
                         nargs='?',
                         default=None,
                         help="The file to load the query from")
+    parser.add_argument("--workers",
+                        metavar="N",
+                        type=int,
+                        default=None,
+                        help="The number of worker processes to augment "
+                        "images with (overrides workers in the query)")
+    parser.add_argument("--seed",
+                        metavar="SEED",
+                        type=int,
+                        default=None,
+                        help="The seed for random augmentations (overrides "
+                        "seed in the query)")
+    parser.add_argument("--profile",
+                        metavar="FILE",
+                        default=None,
+                        help="Save a profile of the run to FILE, and a "
+                        "trace of the run next to it (overrides profile in "
+                        "the query)")
+
+    bench_group = parser.add_argument_group("bench options")
+
+    bench_group.add_argument("--quick",
+                             action="store_true",
+                             help="Only benchmark small images with one box "
+                             "count")
+    bench_group.add_argument("--repeats",
+                             metavar="N",
+                             type=int,
+                             default=None,
+                             help="The number of times to time each "
+                             "benchmark (10 by default)")
+    bench_group.add_argument("--filter",
+                             metavar="TEXT",
+                             default="",
+                             help="Only run benchmarks whose name contains "
+                             "TEXT")
+    bench_group.add_argument("--baseline",
+                             metavar="FILE",
+                             default=None,
+                             help="Compare the results to the results saved "
+                             "in FILE, and fail if any benchmark regressed")
+    bench_group.add_argument("--save",
+                             metavar="FILE",
+                             default=None,
+                             help="Save the results to FILE")
+    bench_group.add_argument("--tolerance",
+                             metavar="FRACTION",
+                             type=float,
+                             default=None,
+                             help="How much slower than the baseline a "
+                             "benchmark may be before it is reported as a "
+                             "regression (0.25 by default)")
 
     args = parser.parse_args(args)
 
+    if args.command == "bench":
+        if args.repeats is not None and args.repeats < 1:
+            parser.error("--repeats must be at least 1")
+
+        # bench builds every factory when it is imported, so it is only
+        # imported when it is needed
+        # pylint: disable=import-outside-toplevel
+        from .bench import run_benchmarks
+
+        regressions = run_benchmarks(quick=args.quick,
+                                     repeats=args.repeats,
+                                     name_filter=args.filter,
+                                     baseline_path=args.baseline,
+                                     save_path=args.save,
+                                     tolerance=args.tolerance)
+
+        if len(regressions) > 0:
+            sys.exit(1)
+
+        return
+
     if args.query_file is None:
 
         query = load_query(sys.stdin)
@@ -42,6 +115,21 @@ def main(args=None):
         with open(args.query_file, 'r') as query_file:
             query = load_query(query_file)
 
+    if args.workers is not None:
+        if args.workers < 1:
+            parser.error("--workers must be at least 1")
+
+        query["workers"] = args.workers
+
+    if args.seed is not None:
+        if args.seed < 0:
+            parser.error("--seed must not be negative")
+
+        query["seed"] = args.seed
+
+    if args.profile is not None:
+        query["profile"] = args.profile
+
     augmentor = Augmentor(query)
 
     run(augmentor, args.command)
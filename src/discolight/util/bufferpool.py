@@ -0,0 +1,150 @@
+"""A pool of reusable arrays for full-size image temporaries."""
+from collections import OrderedDict
+from contextlib import contextmanager
+import threading
+
+import numpy as np
+
+# The default cap on the memory held by each thread's pool while its
+# buffers are not borrowed, in bytes.
+DEFAULT_BUFFER_POOL_BYTES = 256 * 1024 * 1024
+
+
+class BufferPool:
+
+    """A pool of arrays that can be borrowed and given back for reuse.
+
+    Arrays are pooled by shape and dtype. Borrowing an array of a shape and
+    dtype that has been given back before reuses that array instead of
+    allocating a new one. Idle arrays are kept until their total size would
+    exceed max_bytes, at which point the least recently given back arrays
+    are evicted.
+
+    A BufferPool is not thread safe. Use get_buffer_pool to get a pool for
+    the current thread.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_BUFFER_POOL_BYTES):
+        """Construct an empty buffer pool."""
+        self.max_bytes = max_bytes
+
+        # Maps (shape, dtype) keys to lists of idle arrays, ordered from
+        # least to most recently used
+        self.idle = OrderedDict()
+
+        self.idle_bytes = 0
+        self.borrowed_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.peak_bytes = 0
+
+    def borrow(self, shape, dtype=np.uint8):
+        """Borrow an array of the given shape and dtype.
+
+        The contents of the array are undefined. Give the array back with
+        give_back once it is no longer used, so that it can be reused.
+        """
+        key = (tuple(shape), np.dtype(dtype))
+
+        buffers = self.idle.get(key)
+
+        if buffers:
+            self.hits += 1
+
+            buf = buffers.pop()
+            self.idle_bytes -= buf.nbytes
+
+            if not buffers:
+                del self.idle[key]
+        else:
+            self.misses += 1
+
+            buf = np.empty(key[0], dtype=key[1])
+
+        self.borrowed_bytes += buf.nbytes
+        self.peak_bytes = max(self.peak_bytes,
+                              self.idle_bytes + self.borrowed_bytes)
+
+        return buf
+
+    def give_back(self, buf):
+        """Give back an array borrowed from this pool.
+
+        The array must not be used again after it is given back.
+        """
+        self.borrowed_bytes -= buf.nbytes
+
+        if buf.nbytes > self.max_bytes:
+            self.evictions += 1
+            return
+
+        while self.idle_bytes + buf.nbytes > self.max_bytes:
+            self._evict_least_recently_used()
+
+        key = (buf.shape, buf.dtype)
+
+        self.idle.setdefault(key, []).append(buf)
+        self.idle.move_to_end(key)
+
+        self.idle_bytes += buf.nbytes
+
+    @contextmanager
+    def borrowed(self, shape, dtype=np.uint8):
+        """Borrow an array for the duration of a with block."""
+        buf = self.borrow(shape, dtype)
+
+        try:
+            yield buf
+        finally:
+            self.give_back(buf)
+
+    def _evict_least_recently_used(self):
+        """Drop the idle array that was given back the longest time ago."""
+        key, buffers = next(iter(self.idle.items()))
+
+        buf = buffers.pop(0)
+        self.idle_bytes -= buf.nbytes
+        self.evictions += 1
+
+        if not buffers:
+            del self.idle[key]
+
+    def clear(self):
+        """Drop all idle arrays from the pool."""
+        self.idle.clear()
+        self.idle_bytes = 0
+
+    def stats(self):
+        """Return a dictionary of statistics about the use of this pool.
+
+        hits and misses count the borrowed arrays that were and were not
+        reused, evictions counts the arrays dropped to stay within
+        max_bytes, and idle_bytes and peak_bytes give the current and peak
+        memory held by the pool (including borrowed arrays for the latter).
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "idle_bytes": self.idle_bytes,
+            "peak_bytes": self.peak_bytes
+        }
+
+
+_thread_state = threading.local()
+
+
+def get_buffer_pool():
+    """Return the buffer pool of the current thread.
+
+    Every thread has its own pool, so arrays can be borrowed without any
+    locking.
+    """
+    pool = getattr(_thread_state, "buffer_pool", None)
+
+    if pool is None:
+        pool = _thread_state.buffer_pool = BufferPool()
+
+    return pool
@@ -0,0 +1,65 @@
+"""Helpers for replacing files safely."""
+from contextlib import contextmanager
+import os
+import shutil
+import stat
+import tempfile
+
+# The umask of the process, read once since it can only be read by
+# changing it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextmanager
+def replacing(path):
+    """Write a file that replaces the file at path in a with block.
+
+    A temporary path in the same directory is yielded. Once the block
+    finishes, the file written to the temporary path replaces the file at
+    path in a single step, so path never holds a partially written file,
+    and other hard links to the file previously at path are not modified.
+    If the block raises an exception, the temporary file is removed.
+
+    The temporary file is given the mode of the file at path, or if there
+    is none, the mode a newly created file would have, rather than the
+    private mode temporary files are created with.
+    """
+    directory, name = os.path.split(path)
+
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        mode = 0o666 & ~_UMASK
+
+    fd, temp_path = tempfile.mkstemp(prefix=".{}.".format(name),
+                                     suffix=".tmp",
+                                     dir=directory or ".")
+    os.close(fd)
+
+    try:
+        os.chmod(temp_path, mode)
+
+        yield temp_path
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def link_or_copy(source_path, path):
+    """Hard link the file at source_path to path, replacing path.
+
+    If the file cannot be hard linked (e.g., because the paths are on
+    different file systems), it is copied instead.
+    """
+    with replacing(path) as temp_path:
+        os.remove(temp_path)
+
+        try:
+            os.link(source_path, temp_path)
+        except OSError:
+            shutil.copyfile(source_path, temp_path)
@@ -1,9 +1,17 @@
 """Image loading and saving utilities."""
+import functools
+import os
+
 import numpy as np
 import cv2
+from PIL import Image
 
 from discolight.annotations import annotations_to_numpy_array
 from discolight.augmentations.bbox_utilities.bbox_utilities import draw_rect
+from discolight.util.profiler import profiled
+from discolight.util.imageheader import (EXIF_ORIENTATION_TAG,
+                                         TRANSPOSED_EXIF_ORIENTATIONS,
+                                         read_image_size)
 
 
 def load_image_from_bytes(image_bytes):
@@ -13,9 +21,10 @@ def load_image_from_bytes(image_bytes):
     """
     np_bytes = np.array(bytearray(image_bytes))
 
-    image = cv2.imdecode(np_bytes, cv2.IMREAD_COLOR)
+    with profiled("decode"):
+        image = cv2.imdecode(np_bytes, cv2.IMREAD_COLOR)
 
-    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
 
 
 def load_image(image_path):
@@ -27,6 +36,44 @@ def load_image(image_path):
         return load_image_from_bytes(image_file.read())
 
 
+IMAGE_SIZE_CACHE_SIZE = 65536
+
+
+def load_image_size(image_path):
+    """Read the dimensions of an image file without decoding it.
+
+    The size is returned as a (width, height) tuple, matching the shape of
+    the image that load_image would return for the same file. For JPEG,
+    PNG and BMP images only the image header is parsed; other formats are
+    handed to Pillow, which also avoids decoding the image.
+
+    Sizes are cached by path and modification time, so probing the same
+    file again is free until the file changes.
+    """
+    image_path = os.fspath(image_path)
+
+    return cached_image_size(image_path, os.stat(image_path).st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=IMAGE_SIZE_CACHE_SIZE)
+def cached_image_size(image_path, _mtime_ns):
+    """Read the size of an image, caching it by path and mtime."""
+    with open(image_path, "rb") as image_file:
+        size = read_image_size(image_file)
+
+    if size is not None:
+        return size
+
+    with Image.open(image_path) as image:
+        width, height = image.size
+
+        if (image.getexif().get(EXIF_ORIENTATION_TAG)
+                in TRANSPOSED_EXIF_ORIENTATIONS):
+            return height, width
+
+        return width, height
+
+
 def save_image(path, image, annotations=None, color=(255, 0, 0), stroke=8.0):
     """Save an image loaded with load_image or load_image_from_bytes.
 
@@ -0,0 +1,167 @@
+"""Read the dimensions of images from their headers."""
+import struct
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+JPEG_SIGNATURE = b"\xff\xd8"
+BMP_SIGNATURE = b"BM"
+
+# JPEG start-of-frame markers, which hold the dimensions of the image.
+# 0xc4 (DHT), 0xc8 (JPG) and 0xcc (DAC) share the range but are not frames.
+JPEG_SOF_MARKERS = frozenset(range(0xc0, 0xd0)) - {0xc4, 0xc8, 0xcc}
+# JPEG markers that stand alone, without a segment length following them.
+JPEG_STANDALONE_MARKERS = frozenset(range(0xd0, 0xd8)) | {0x01}
+JPEG_APP1_MARKER = 0xe1
+JPEG_SOS_MARKER = 0xda
+
+EXIF_HEADER = b"Exif\x00\x00"
+EXIF_ORIENTATION_TAG = 0x0112
+
+# EXIF orientations that rotate the image by 90 or 270 degrees. OpenCV
+# applies the EXIF orientation when decoding, so the width and height of
+# these images are swapped compared to what is stored in the file.
+TRANSPOSED_EXIF_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def read_exact(image_file, size):
+    """Read exactly size bytes from image_file, or raise a ValueError."""
+    data = image_file.read(size)
+
+    if len(data) != size:
+        raise ValueError("Unexpected end of image header")
+
+    return data
+
+
+def read_exif_orientation(exif):
+    """Return the orientation stored in an EXIF block, or None."""
+    if len(exif) < 8 or exif[:2] not in (b"II", b"MM"):
+        return None
+
+    byte_order = "<" if exif[:2] == b"II" else ">"
+
+    (ifd_offset, ) = struct.unpack_from(byte_order + "I", exif, 4)
+
+    if ifd_offset + 2 > len(exif):
+        return None
+
+    (entries, ) = struct.unpack_from(byte_order + "H", exif, ifd_offset)
+
+    for entry in range(entries):
+        entry_offset = ifd_offset + 2 + 12 * entry
+
+        if entry_offset + 12 > len(exif):
+            return None
+
+        tag, _type, _count, value = struct.unpack_from(
+            byte_order + "HHIH", exif, entry_offset)
+
+        if tag == EXIF_ORIENTATION_TAG:
+            return value
+
+    return None
+
+
+def read_jpeg_size(image_file):
+    """Read the (width, height) of a JPEG image from its header.
+
+    The file should be positioned just after the JPEG signature.
+    """
+    orientation = None
+
+    while True:
+        if read_exact(image_file, 1) != b"\xff":
+            raise ValueError("Invalid JPEG marker")
+
+        marker = ord(read_exact(image_file, 1))
+
+        # Any number of 0xff fill bytes may precede a marker
+        while marker == 0xff:
+            marker = ord(read_exact(image_file, 1))
+
+        if marker in JPEG_STANDALONE_MARKERS:
+            continue
+
+        if marker == JPEG_SOS_MARKER:
+            raise ValueError("JPEG image data starts before its frame header")
+
+        (length, ) = struct.unpack(">H", read_exact(image_file, 2))
+
+        if length < 2:
+            raise ValueError("Invalid JPEG segment length")
+
+        if marker in JPEG_SOF_MARKERS:
+            _precision, height, width = struct.unpack(
+                ">BHH", read_exact(image_file, 5))
+
+            if orientation in TRANSPOSED_EXIF_ORIENTATIONS:
+                return height, width
+
+            return width, height
+
+        segment = read_exact(image_file, length - 2)
+
+        if (marker == JPEG_APP1_MARKER and orientation is None
+                and segment.startswith(EXIF_HEADER)):
+            orientation = read_exif_orientation(segment[len(EXIF_HEADER):])
+
+
+def read_png_size(image_file):
+    """Read the (width, height) of a PNG image from its header.
+
+    The file should be positioned just after the PNG signature.
+    """
+    _length, chunk_type, width, height = struct.unpack(
+        ">I4sII", read_exact(image_file, 16))
+
+    if chunk_type != b"IHDR":
+        raise ValueError("PNG image does not start with an IHDR chunk")
+
+    return width, height
+
+
+def read_bmp_size(image_file):
+    """Read the (width, height) of a BMP image from its header.
+
+    The file should be positioned just after the BMP signature.
+    """
+    read_exact(image_file, 12)
+
+    (header_size, ) = struct.unpack("<I", read_exact(image_file, 4))
+
+    if header_size == 12:
+        # OS/2 BITMAPCOREHEADER
+        return struct.unpack("<HH", read_exact(image_file, 4))
+
+    width, height = struct.unpack("<ii", read_exact(image_file, 8))
+
+    # Images stored top-down have a negative height
+    return width, abs(height)
+
+
+def read_image_size(image_file):
+    """Read the (width, height) of an image from its header.
+
+    image_file should be a binary file object positioned at the start of
+    the image. Only the header of the image is read; its pixels are never
+    decoded. The size matches the shape of the image as it would be
+    decoded by OpenCV, i.e., the EXIF orientation of JPEG images is taken
+    into account.
+
+    JPEG, PNG and BMP images are supported. None is returned for images
+    in any other format, and a ValueError is raised if the header of a
+    supported image is malformed.
+    """
+    signature = image_file.read(len(PNG_SIGNATURE))
+
+    if signature.startswith(JPEG_SIGNATURE):
+        image_file.seek(len(JPEG_SIGNATURE) - len(signature), 1)
+        return read_jpeg_size(image_file)
+
+    if signature == PNG_SIGNATURE:
+        return read_png_size(image_file)
+
+    if signature.startswith(BMP_SIGNATURE):
+        image_file.seek(len(BMP_SIGNATURE) - len(signature), 1)
+        return read_bmp_size(image_file)
+
+    return None
@@ -0,0 +1,145 @@
+"""Incremental parsing of large JSON files."""
+import json
+
+# The number of characters read from a JSON file at a time
+JSON_CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = " \t\n\r"
+
+_NUMBER = "0123456789.eE+-"
+
+
+class _JSONReader:
+
+    """Reads JSON values from a file one chunk at a time."""
+
+    def __init__(self, json_fp, chunk_size):
+        """Construct a reader for the JSON in json_fp."""
+        self.json_fp = json_fp
+        self.chunk_size = chunk_size
+
+        self.decoder = json.JSONDecoder()
+
+        self.buffer = ""
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+
+    def fill(self):
+        """Read another chunk of the file into the buffer.
+
+        False is returned if the end of the file has been reached.
+        """
+        if self.eof:
+            return False
+
+        if self.pos > 0:
+            self.offset += self.pos
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+
+        chunk = self.json_fp.read(self.chunk_size)
+
+        if chunk == "":
+            self.eof = True
+            return False
+
+        self.buffer += chunk
+
+        return True
+
+    def error(self, message):
+        """Return an error about the JSON at the current position."""
+        return ValueError("{} at offset {} of JSON file".format(
+            message, self.offset + self.pos))
+
+    def peek(self):
+        """Return the next character that is not whitespace.
+
+        An empty string is returned at the end of the file.
+        """
+        while True:
+            while (self.pos < len(self.buffer)
+                   and self.buffer[self.pos] in _WHITESPACE):
+                self.pos += 1
+
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+
+            if not self.fill():
+                return ""
+
+    def expect(self, characters):
+        """Consume the next character, which must be one of characters."""
+        character = self.peek()
+
+        if character == "" or character not in characters:
+            raise self.error("Expected one of '{}'".format(characters))
+
+        self.pos += 1
+
+        return character
+
+    def value(self):
+        """Decode the next JSON value."""
+        self.peek()
+
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+
+                # A number cut short by the end of the buffer (e.g., "1."
+                # or "1e") continues in the next chunk
+                if self.eof or (end < len(self.buffer)
+                                and self.buffer[end] not in _NUMBER):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as decode_error:
+                if self.eof:
+                    raise self.error(decode_error.msg)
+
+            self.fill()
+
+
+def iter_json_object(json_fp, streamed_keys, chunk_size=JSON_CHUNK_SIZE):
+    """Iterate over the members of the JSON object in a file.
+
+    This is a generator that yields a (key, value) tuple for each member
+    of the object, in file order. The value of a key in streamed_keys must
+    be an array, and a (key, element) tuple is yielded for each of its
+    elements instead, so that no more than one element of the array is
+    held in memory at a time.
+
+    A ValueError is raised if the file does not hold a JSON object.
+    """
+    reader = _JSONReader(json_fp, chunk_size)
+
+    reader.expect("{")
+
+    if reader.peek() == "}":
+        return
+
+    while True:
+        key = reader.value()
+
+        if not isinstance(key, str):
+            raise reader.error("Expected an object key")
+
+        reader.expect(":")
+
+        if key not in streamed_keys:
+            yield key, reader.value()
+        else:
+            reader.expect("[")
+
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield key, reader.value()
+
+                    if reader.expect(",]") == "]":
+                        break
+
+        if reader.expect(",}") == "}":
+            return
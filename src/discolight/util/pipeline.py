@@ -0,0 +1,147 @@
+"""Helpers for building bounded processing pipelines."""
+import collections
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+_END = object()
+
+
+def prefetch(iterable, size):
+    """Iterate over iterable, producing up to size items ahead of time.
+
+    Items are produced on a background thread and handed over through a
+    bounded queue, so the producer never gets more than size items ahead
+    of the consumer. Exceptions raised while producing an item are raised
+    again in the consumer. If size is less than 1, iterable is consumed
+    directly on the calling thread.
+    """
+    if size < 1:
+        yield from iterable
+        return
+
+    items = queue.Queue(maxsize=size)
+    stopped = threading.Event()
+
+    def put(entry):
+        while not stopped.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+
+            put((_END, None))
+        except Exception as e:  # pylint: disable=broad-except
+            put((None, e))
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            item, error = items.get()
+
+            if error is not None:
+                raise error
+
+            if item is _END:
+                return
+
+            yield item
+    finally:
+        stopped.set()
+        producer.join()
+
+
+def ordered_map(executor, func, iterable, window):
+    """Map func over iterable on an executor, yielding results in order.
+
+    At most window calls are submitted to the executor ahead of the result
+    that is being waited on, so the amount of work (and memory) in flight
+    stays bounded even if iterable is very long.
+    """
+    pending = collections.deque()
+
+    try:
+        for item in iterable:
+            pending.append(executor.submit(func, item))
+
+            if len(pending) >= window:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+class JobQueue:
+
+    """Run jobs on a pool of background threads with backpressure.
+
+    At most max_pending jobs can be unfinished at once; submitting another
+    job blocks until the oldest one is done. If a job fails, its exception
+    is raised again from a later call to submit, or from close.
+
+    If threads is 0, jobs are run immediately on the calling thread.
+    """
+
+    def __init__(self, threads, max_pending):
+        """Construct a new job queue."""
+        self.max_pending = max_pending
+
+        self.executor = (ThreadPoolExecutor(max_workers=threads)
+                         if threads > 0 else None)
+        self.pending = collections.deque()
+
+    def submit(self, func, *args):
+        """Run func with the given arguments in the background."""
+        if self.executor is None:
+            func(*args)
+            return
+
+        while self.pending and (self.pending[0].done()
+                                or len(self.pending) >= self.max_pending):
+            self.pending.popleft().result()
+
+        self.pending.append(self.executor.submit(func, *args))
+
+    def drain(self):
+        """Wait for all submitted jobs to finish.
+
+        The first exception raised by any outstanding job is raised again
+        once every job has finished.
+        """
+        error = None
+
+        while self.pending:
+            try:
+                self.pending.popleft().result()
+            except Exception as e:  # pylint: disable=broad-except
+                error = e if error is None else error
+
+        if error is not None:
+            raise error
+
+    def close(self):
+        """Wait for all submitted jobs to finish, and stop the threads.
+
+        As with drain, the first exception raised by any outstanding job is
+        raised again once every job has finished.
+        """
+        try:
+            self.drain()
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
@@ -0,0 +1,333 @@
+"""Hierarchical timing, counters, and memory use for profiling runs."""
+from collections import Counter
+from contextlib import contextmanager
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+# The maximum number of spans kept for the trace of a run. Timings are
+# still aggregated for spans beyond this limit.
+MAX_TRACE_EVENTS = 1000000
+
+_active_profiler = None
+
+
+def peak_rss_mb():
+    """Return the peak resident set size of this process in MB.
+
+    None is returned on platforms where it cannot be determined.
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss is in bytes on macOS, and in kilobytes elsewhere
+    if sys.platform == "darwin":
+        peak /= 1024
+
+    return peak / 1024
+
+
+class _Span:
+
+    """A context manager timing a block of code for a profiler."""
+
+    __slots__ = ["profiler", "name", "path", "start"]
+
+    def __init__(self, profiler, name):
+        """Construct a span with the given name."""
+        self.profiler = profiler
+        self.name = name
+        self.path = None
+        self.start = None
+
+    def __enter__(self):
+        """Start timing the span."""
+        stack = self.profiler.stack()
+
+        self.path = (self.name
+                     if len(stack) == 0 else stack[-1] + "/" + self.name)
+
+        stack.append(self.path)
+
+        self.start = time.perf_counter()
+
+    def __exit__(self, _exc_type, _exc_val, _exc_tb):
+        """Stop timing the span, and record it."""
+        end = time.perf_counter()
+
+        self.profiler.stack().pop()
+        self.profiler.record(self.path, self.start, end - self.start)
+
+
+class _NullSpan:
+
+    """A context manager that does nothing, used when not profiling."""
+
+    __slots__ = []
+
+    def __enter__(self):
+        """Do nothing."""
+
+    def __exit__(self, _exc_type, _exc_val, _exc_tb):
+        """Do nothing."""
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+
+    """Collects timings, counters, and memory use while profiling.
+
+    Spans are named blocks of code. A span started while another span is
+    running on the same thread is nested in it, and its path is the path
+    of the outer span, followed by a slash and its name. For each path,
+    the number of spans and their total and maximum duration are
+    aggregated, and each span is kept as an event for a trace of the run.
+
+    Profilers in other processes can send what they have collected with
+    take, to be merged into this profiler with merge.
+    """
+
+    def __init__(self, max_trace_events=MAX_TRACE_EVENTS):
+        """Construct a profiler."""
+        self.max_trace_events = max_trace_events
+
+        self.origin = time.perf_counter()
+
+        self.spans = {}
+        self.counters = Counter()
+        self.events = []
+        self.dropped_events = 0
+
+        self.gauges = {}
+
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def stack(self):
+        """Return the paths of the spans running on this thread."""
+        stack = getattr(self.local, "stack", None)
+
+        if stack is None:
+            stack = self.local.stack = []
+
+        return stack
+
+    def span(self, name):
+        """Return a context manager timing a span with the given name."""
+        return _Span(self, name)
+
+    def record(self, path, start, duration, pid=None, tid=None):
+        """Record a span that started at the given perf_counter time."""
+        with self.lock:
+            aggregate = self.spans.get(path)
+
+            if aggregate is None:
+                self.spans[path] = [1, duration, duration]
+            else:
+                aggregate[0] += 1
+                aggregate[1] += duration
+                aggregate[2] = max(aggregate[2], duration)
+
+            if len(self.events) >= self.max_trace_events:
+                self.dropped_events += 1
+                return
+
+            self.events.append(
+                (path, start, duration, os.getpid() if pid is None else pid,
+                 threading.get_ident() if tid is None else tid))
+
+    def count(self, name, amount=1):
+        """Add amount to the counter with the given name."""
+        with self.lock:
+            self.counters[name] += amount
+
+    def high_water_mark(self, name, value):
+        """Keep the maximum of the values given for a gauge."""
+        if value is None:
+            return
+
+        with self.lock:
+            self.gauges[name] = max(self.gauges.get(name, value), value)
+
+    def take(self):
+        """Return and reset everything collected so far.
+
+        The result can be sent to another process, and passed to merge.
+        """
+        self.high_water_mark("peak_rss_mb", peak_rss_mb())
+
+        with self.lock:
+            taken = {
+                "pid": os.getpid(),
+                "spans": self.spans,
+                "counters": dict(self.counters),
+                "events": self.events,
+                "dropped_events": self.dropped_events,
+                "gauges": self.gauges
+            }
+
+            self.spans = {}
+            self.counters = Counter()
+            self.events = []
+            self.dropped_events = 0
+            self.gauges = {}
+
+        return taken
+
+    def merge(self, taken):
+        """Merge what another profiler has collected into this profiler.
+
+        Gauges from other processes are kept separately, with the process
+        ID of the other profiler appended to their name.
+        """
+        with self.lock:
+            for path, (calls, total, maximum) in taken["spans"].items():
+
+                aggregate = self.spans.setdefault(path, [0, 0.0, 0.0])
+
+                aggregate[0] += calls
+                aggregate[1] += total
+                aggregate[2] = max(aggregate[2], maximum)
+
+            self.counters.update(taken["counters"])
+
+            room = max(0, self.max_trace_events - len(self.events))
+
+            self.events.extend(taken["events"][:room])
+            self.dropped_events += (taken["dropped_events"] +
+                                    max(0,
+                                        len(taken["events"]) - room))
+
+        for name, value in taken["gauges"].items():
+            self.high_water_mark("{}/{}".format(name, taken["pid"]), value)
+
+    def report(self):
+        """Return a summary of everything collected, for a JSON report.
+
+        Span timings are given in milliseconds.
+        """
+        self.high_water_mark("peak_rss_mb", peak_rss_mb())
+
+        with self.lock:
+            return {
+                "spans": {
+                    path: {
+                        "count": calls,
+                        "total_ms": total * 1000,
+                        "mean_ms": total * 1000 / calls,
+                        "max_ms": maximum * 1000
+                    }
+                    for path, (calls, total, maximum) in sorted(
+                        self.spans.items())
+                },
+                "counters": dict(sorted(self.counters.items())),
+                "memory": dict(sorted(self.gauges.items())),
+                "dropped_trace_events": self.dropped_events
+            }
+
+    def trace(self):
+        """Return the spans collected in Chrome's trace event format.
+
+        The trace can be opened in chrome://tracing or Perfetto.
+        """
+        with self.lock:
+            events = list(self.events)
+
+        return {
+            "traceEvents": [{
+                "name": path.rsplit("/", 1)[-1],
+                "cat": path,
+                "ph": "X",
+                "ts": (start - self.origin) * 1e6,
+                "dur": duration * 1e6,
+                "pid": pid,
+                "tid": tid
+            } for path, start, duration, pid, tid in events],
+            "displayTimeUnit":
+            "ms"
+        }
+
+    def save(self, path):
+        """Save the report of this profiler to path, and its trace.
+
+        The trace is saved next to the report, with .trace.json in place
+        of the extension of path.
+        """
+        with open(path, "w", encoding="utf-8") as report_file:
+            json.dump(self.report(), report_file, indent=2)
+
+        with open(os.path.splitext(path)[0] + ".trace.json",
+                  "w",
+                  encoding="utf-8") as trace_file:
+            json.dump(self.trace(), trace_file)
+
+
+def get_profiler():
+    """Return the profiler that is active in this process, or None."""
+    return _active_profiler
+
+
+@contextmanager
+def profiling(profiler):
+    """Make a profiler the active profiler of this process in a with block.
+
+    Spans and counters from every thread go to the active profiler.
+    """
+    global _active_profiler  # pylint: disable=global-statement
+
+    previous_profiler = _active_profiler
+    _active_profiler = profiler
+
+    try:
+        yield profiler
+    finally:
+        _active_profiler = previous_profiler
+
+
+def profiled(name):
+    """Return a context manager timing a span with the active profiler.
+
+    If no profiler is active, the context manager does nothing.
+    """
+    profiler = _active_profiler
+
+    if profiler is None:
+        return _NULL_SPAN
+
+    return _Span(profiler, name)
+
+
+def profiled_iter(iterable, name):
+    """Iterate over iterable, timing how long each item takes to produce.
+
+    Producing each item is timed as a span with the active profiler.
+    """
+    iterator = iter(iterable)
+
+    while True:
+        with profiled(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+
+        yield item
+
+
+def count(name, amount=1):
+    """Add amount to a counter of the active profiler, if there is one."""
+    profiler = _active_profiler
+
+    if profiler is not None:
+        profiler.count(name, amount)
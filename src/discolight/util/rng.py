@@ -0,0 +1,61 @@
+"""Reproducible random number streams for augmentations."""
+from contextlib import contextmanager
+import hashlib
+import random
+import threading
+
+import numpy as np
+
+_thread_state = threading.local()
+
+
+def get_rng():
+    """Return the numpy random number generator augmentations should use.
+
+    Inside a random_stream block, this is the generator of that stream.
+    Otherwise, a new generator is seeded from the random module, so that
+    augmentations are still deterministic after random.seed is called.
+    """
+    rng = getattr(_thread_state, "rng", None)
+
+    if rng is None:
+        return np.random.default_rng(random.getrandbits(64))
+
+    return rng
+
+
+@contextmanager
+def random_stream(seed_sequence):
+    """Draw all random numbers from a numpy SeedSequence in a with block.
+
+    The random module is seeded from the sequence, and get_rng returns a
+    generator for it, so that any augmentation applied in the block draws
+    the same random numbers no matter what was drawn before. The previous
+    state of the random module is restored afterwards.
+    """
+    previous_rng = getattr(_thread_state, "rng", None)
+    previous_state = random.getstate()
+
+    random.seed(int.from_bytes(seed_sequence.generate_state(4).tobytes(),
+                               "little"))
+    _thread_state.rng = np.random.default_rng(seed_sequence)
+
+    try:
+        yield _thread_state.rng
+    finally:
+        _thread_state.rng = previous_rng
+        random.setstate(previous_state)
+
+
+def image_seed_sequence(seed, image_name):
+    """Return the SeedSequence for augmenting an image.
+
+    The sequence depends only on the seed and the name of the image, so an
+    image is augmented the same way no matter in which order, in which
+    process, or alongside which other images it is processed. Spawn a
+    child sequence from it for each augmentation of the image.
+    """
+    image_key = int.from_bytes(
+        hashlib.sha256(image_name.encode("utf-8")).digest()[:16], "little")
+
+    return np.random.SeedSequence(seed, spawn_key=(image_key, ))
@@ -1,13 +1,72 @@
 """A COCO annotation writer."""
 import datetime
 import json
+import os
+import shutil
+import tempfile
+from discolight.annotations import AnnotationTable
 from discolight.params.params import Params
+from discolight.util.files import replacing
 from .types import AnnotationWriter
 
 
+class JSONArraySegment:
+
+    """A JSON array written to a temporary file one element at a time.
+
+    Once every element has been appended, the array is copied into
+    another file with copy_to, and the temporary file is removed with
+    close.
+    """
+
+    def __init__(self, directory, name):
+        """Create the temporary file for the array in directory."""
+        fd, self.path = tempfile.mkstemp(prefix=".{}.".format(name),
+                                         suffix=".segment",
+                                         dir=directory or ".")
+        self.segment_fp = os.fdopen(fd, "w+")
+        self.length = 0
+
+    def append(self, element):
+        """Append an element to the array."""
+        if self.length > 0:
+            self.segment_fp.write(", ")
+
+        self.segment_fp.write(json.dumps(element))
+        self.length += 1
+
+    def copy_to(self, output_fp):
+        """Write the whole array to output_fp."""
+        self.segment_fp.flush()
+        self.segment_fp.seek(0)
+
+        output_fp.write("[")
+        shutil.copyfileobj(self.segment_fp, output_fp)
+        output_fp.write("]")
+
+        self.segment_fp.seek(0, os.SEEK_END)
+
+    def close(self):
+        """Close and remove the temporary file."""
+        self.segment_fp.close()
+
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
 class COCO(AnnotationWriter):
 
-    """A COCO annotation writer."""
+    """A COCO annotation writer.
+
+    Images and annotations are streamed to temporary segment files next to
+    the annotations file as they are written, and only the categories and
+    licenses are kept in memory. The annotations file is assembled from
+    the segments when the writer is closed. If an exception was raised,
+    the segments are removed, and any existing annotations file is left
+    as it was.
+    """
 
     def __init__(self, annotations_file):
         """Construct a COCO annotation writer."""
@@ -30,11 +89,11 @@ class COCO(AnnotationWriter):
                     tzinfo=datetime.timezone.utc).isoformat(),
             },
             "categories": [],
-            "images": [],
-            "annotations": [],
             "licenses": [],
         }
 
+        self.segments = None
+
         self.image_counter = 0
         self.annotation_counter = 0
         self.category_counter = 0
@@ -48,12 +107,43 @@ class COCO(AnnotationWriter):
 
     def __enter__(self):
         """Open the annotation writer for writing."""
+        directory, name = os.path.split(self.annotations_file)
+
+        self.segments = {}
+
+        for key in ["images", "annotations"]:
+            self.segments[key] = JSONArraySegment(directory,
+                                                  "{}.{}".format(name, key))
+
         return self
 
-    def __exit__(self, _exc_type, _exc_val, _exc_tb):
-        """Close the annotation writer for writing."""
-        with open(self.annotations_file, "w") as annotations_fp:
-            json.dump(self.coco_json, annotations_fp)
+    def __exit__(self, exc_type, _exc_val, _exc_tb):
+        """Assemble the annotations file, and remove the segments."""
+        try:
+            if exc_type is not None:
+                return
+
+            with replacing(self.annotations_file) as temp_path:
+                with open(temp_path, "w",
+                          encoding="utf-8") as annotations_fp:
+                    annotations_fp.write("{")
+
+                    for key_idx, key in enumerate([
+                            "info", "categories", "images", "annotations",
+                            "licenses"
+                    ]):
+                        annotations_fp.write("{}{}: ".format(
+                            ", " if key_idx > 0 else "", json.dumps(key)))
+
+                        if key in self.segments:
+                            self.segments[key].copy_to(annotations_fp)
+                        else:
+                            json.dump(self.coco_json[key], annotations_fp)
+
+                    annotations_fp.write("}")
+        finally:
+            for segment in self.segments.values():
+                segment.close()
 
     @staticmethod
     def params():
@@ -68,9 +158,7 @@ class COCO(AnnotationWriter):
         licens = None
 
         if len(annotations) > 1:
-            licens = annotations[0].additional_info[
-                "image_license"] if "image_license" in annotations[
-                    0].additional_info else None
+            licens = annotations.info(0).get("image_license", None)
 
         if licens is None and self.unknown_license_id is None:
 
@@ -108,11 +196,14 @@ class COCO(AnnotationWriter):
 
         return new_license_id
 
-    def get_annotation_category_id(self, annotation):
-        """Retrieve the category ID of an annotation."""
-        if "category" in annotation.additional_info:
+    def get_annotation_category_id(self, additional_info, class_idx):
+        """Retrieve the category ID of an annotation.
 
-            category = annotation.additional_info["category"]
+        The annotation is given by its additional info and class index.
+        """
+        if "category" in additional_info:
+
+            category = additional_info["category"]
 
             new_category_id = self.old_category_id_to_new.get(
                 str(category["id"]), None)
@@ -138,21 +229,20 @@ class COCO(AnnotationWriter):
 
             return new_category_id
 
-        category_id = self.class_idx_category_id.get(str(annotation.class_idx),
-                                                     None)
+        category_id = self.class_idx_category_id.get(str(class_idx), None)
 
         if category_id is None:
 
             category_id = self.category_counter
             self.category_counter += 1
 
-            self.class_idx_category_id[str(annotation.class_idx)] = category_id
+            self.class_idx_category_id[str(class_idx)] = category_id
 
             self.coco_json["categories"].append({
                 "id":
                 category_id,
                 "name":
-                "class{}".format(annotation.class_idx),
+                "class{}".format(class_idx),
                 "supercategory":
                 "none"
             })
@@ -165,10 +255,13 @@ class COCO(AnnotationWriter):
         """Write annotations for the given image."""
         height, width, _ = image.shape
 
+        annotations = AnnotationTable.from_bounding_boxes(annotations)
+        rows = annotations.rows
+
         image_id = self.image_counter
         self.image_counter += 1
 
-        self.coco_json["images"].append({
+        self.segments["images"].append({
             "id":
             image_id,
             "license":
@@ -184,25 +277,24 @@ class COCO(AnnotationWriter):
                 tzinfo=datetime.timezone.utc).isoformat()
         })
 
-        for annotation in annotations:
+        for idx, (x_min, y_min, x_max, y_max, class_idx) in enumerate(
+                zip(rows["x_min"].tolist(), rows["y_min"].tolist(),
+                    rows["x_max"].tolist(), rows["y_max"].tolist(),
+                    rows["class_idx"].tolist())):
 
             annotation_id = self.annotation_counter
             self.annotation_counter += 1
 
-            self.coco_json["annotations"].append({
+            self.segments["annotations"].append({
                 "id":
                 annotation_id,
                 "image_id":
                 image_id,
                 "category_id":
-                self.get_annotation_category_id(annotation),
-                "bbox": [
-                    annotation.x_min, annotation.y_min,
-                    annotation.x_max - annotation.x_min,
-                    annotation.y_max - annotation.y_min
-                ],
-                "area": (annotation.x_max - annotation.x_min) *
-                (annotation.y_max - annotation.y_max),
+                self.get_annotation_category_id(annotations.info(idx),
+                                                class_idx),
+                "bbox": [x_min, y_min, x_max - x_min, y_max - y_min],
+                "area": (x_max - x_min) * (y_max - y_max),
                 "segmentation": [],
                 "iscrowd":
                 0
@@ -23,3 +23,19 @@ class FourCornersCSV(CSVAnnotationWriter):
             "y_max": annotation.y_max,
             "label": annotation.class_idx
         }
+
+    def get_csv_rows(self, image_name, _image, annotations):
+        """Return the CSV rows for the annotations of an image."""
+        rows = annotations.rows
+
+        return [{
+            "image_name": image_name,
+            "x_min": x_min,
+            "y_min": y_min,
+            "x_max": x_max,
+            "y_max": y_max,
+            "label": class_idx
+        } for x_min, y_min, x_max, y_max, class_idx in zip(
+            rows["x_min"].tolist(), rows["y_min"].tolist(),
+            rows["x_max"].tolist(), rows["y_max"].tolist(),
+            rows["class_idx"].tolist())]
@@ -1,50 +1,44 @@
 """A Pascal VOC annotation writer."""
-import os
-import shutil
 import xml.etree.cElementTree as ET
 import defusedxml
-from discolight.params.params import Params
-from .types import AnnotationWriter
+from .types import FolderAnnotationWriter
 
 defusedxml.defuse_stdlib()
 
 
-class PascalVOC(AnnotationWriter):
+class PascalVOC(FolderAnnotationWriter):
 
-    """A Pascal VOC annotation writer."""
+    """A Pascal VOC annotation writer.
 
-    def __init__(self, annotations_folder, database, clean_directory):
+    An XML file named after each image, with .xml appended, is written to
+    annotations_folder.
+    """
+
+    def __init__(self,
+                 annotations_folder,
+                 database,
+                 clean_directory,
+                 threads=0,
+                 queue_size=256,
+                 shard_levels=0,
+                 archive=""):
         """Construct a new Pascal VOC annotation writer."""
-        self.annotations_folder = annotations_folder
+        super().__init__(annotations_folder, clean_directory, threads,
+                         queue_size, shard_levels, archive)
         self.database = database
-        self.clean_directory = clean_directory
-
-    def __enter__(self):
-        """Open the annotation writer for writing."""
-        if os.path.isdir(self.annotations_folder) and self.clean_directory:
-            shutil.rmtree(self.annotations_folder)
-
-        if not os.path.isdir(self.annotations_folder):
-            os.mkdir(self.annotations_folder)
-
-        return self
 
     @staticmethod
     def params():
         """Return a Params object describing constructor parameters."""
-        return Params().add(
-            "annotations_folder",
-            "the directory to save annotation files to", str, "", True).add(
-                "database", "The name of the source database", str, "").add(
-                    "clean_directory",
-                    "whether to forcibly ensure the output directory is empty",
-                    bool, True)
-
-    def __exit__(self, _exc_type, _exc_val, _exc_tb):
-        """Close the annotation writer."""
-
-    def write_annotations_for_image(self, image_name, image, annotations):
-        """Write the XML annotations file for the given image."""
+        return FolderAnnotationWriter.params().add(
+            "database", "The name of the source database", str, "")
+
+    def get_annotation_file_name(self, image_name):
+        """Return the name of the XML file for the given image."""
+        return "{}.xml".format(image_name)
+
+    def get_annotation_file_content(self, image_name, image, annotations):
+        """Return the XML annotations for the given image."""
         root = ET.Element("annotation")
 
         ET.SubElement(root, "folder").text = ""
@@ -62,15 +56,21 @@ class PascalVOC(AnnotationWriter):
 
         ET.SubElement(root, "segmented").text = "0"
 
-        for annotation in annotations:
+        rows = annotations.rows
+
+        for idx, (x_min, y_min, x_max, y_max, class_idx) in enumerate(
+                zip(rows["x_min"].tolist(), rows["y_min"].tolist(),
+                    rows["x_max"].tolist(), rows["y_max"].tolist(),
+                    rows["class_idx"].tolist())):
 
             obj = ET.SubElement(root, "object")
 
-            name = annotation.additional_info.get("name",
-                                                  str(annotation.class_idx))
-            pose = annotation.additional_info.get("pose", "")
-            truncated = annotation.additional_info.get("truncated", "0")
-            difficult = annotation.additional_info.get("difficult", "0")
+            additional_info = annotations.info(idx)
+
+            name = additional_info.get("name", str(class_idx))
+            pose = additional_info.get("pose", "")
+            truncated = additional_info.get("truncated", "0")
+            difficult = additional_info.get("difficult", "0")
 
             ET.SubElement(obj, "name").text = name
             ET.SubElement(obj, "pose").text = pose
@@ -79,10 +79,9 @@ class PascalVOC(AnnotationWriter):
 
             bndbox = ET.SubElement(obj, "bndbox")
 
-            ET.SubElement(bndbox, "xmin").text = str(annotation.x_min)
-            ET.SubElement(bndbox, "ymin").text = str(annotation.y_min)
-            ET.SubElement(bndbox, "xmax").text = str(annotation.x_max)
-            ET.SubElement(bndbox, "ymax").text = str(annotation.y_max)
+            ET.SubElement(bndbox, "xmin").text = str(x_min)
+            ET.SubElement(bndbox, "ymin").text = str(y_min)
+            ET.SubElement(bndbox, "xmax").text = str(x_max)
+            ET.SubElement(bndbox, "ymax").text = str(y_max)
 
-        tree = ET.ElementTree(root)
-        tree.write("{}/{}.xml".format(self.annotations_folder, image_name))
+        return ET.tostring(root)
@@ -0,0 +1,72 @@
+"""An annotation writer that packs annotations into tar shards."""
+import json
+import os
+from discolight.annotations import AnnotationTable
+from discolight.params.params import Params
+from discolight.augmentations.augmentation.types import BoundedNumber
+from discolight.writers.shards import attach_shard_set, detach_shard_set
+from .types import AnnotationWriter
+
+
+class Shards(AnnotationWriter):
+
+    """Writes annotations to a directory of tar shards of about the same size.
+
+    The annotations of each image are stored in a shard as a JSON file
+    named after the image, but with a .json extension. When used with the
+    Shards image writer with the same directory and shard size, each
+    image and its annotations are stored next to each other. The JSON
+    file holds the name, width, and height of the image, the unnormalized
+    x_min, y_min, x_max, y_max, and class_idx of each bounding box, and the
+    additional info of each bounding box.
+
+    Existing shards in the directory are removed when the writer is
+    opened. This writer can still be used when resuming a run from a
+    manifest, since the annotations of every output are written again,
+    but the Shards image writer cannot.
+    """
+
+    def __init__(self, directory, shard_size_mb=1024):
+        """Construct a new Shards annotation writer."""
+        self.directory = directory
+        self.shard_size_mb = shard_size_mb
+
+        self.shard_set = None
+
+    def __enter__(self):
+        """Initialize the annotation writer."""
+        self.shard_set = attach_shard_set(self.directory,
+                                          int(self.shard_size_mb * (1 << 20)))
+
+        return self
+
+    def __exit__(self, _exc_type, _exc_val, _exc_tb):
+        """Close the annotation writer."""
+        detach_shard_set(self.shard_set)
+
+    @staticmethod
+    def params():
+        """Return a Params object describing constructor parameters."""
+        return Params().add(
+            "directory", "the directory to save shards to", str, "",
+            True).add("shard_size_mb", "the size of each shard in MB",
+                      BoundedNumber(float, 0), 1024)
+
+    def write_annotations_for_image(self, image_name, image, annotations):
+        """Add the annotations for the given image to the shards."""
+        annotations = AnnotationTable.from_bounding_boxes(annotations)
+
+        height, width, _ = image.shape
+
+        content = json.dumps({
+            "image": image_name,
+            "width": width,
+            "height": height,
+            "bboxes": annotations.to_numpy().tolist(),
+            "additional_info": [
+                annotations.info(idx) for idx in range(len(annotations))
+            ]
+        })
+
+        self.shard_set.add(
+            os.path.splitext(image_name)[0], "json", content.encode("utf-8"))
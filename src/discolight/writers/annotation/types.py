@@ -1,7 +1,21 @@
 """Base types for annotation writers."""
 from abc import ABC, abstractmethod
 import csv
+import hashlib
+import io
+import os
+import shutil
+import tarfile
+import time
+import zipfile
+from discolight.annotations import AnnotationTable
 from discolight.params.params import Params
+from discolight.util.pipeline import JobQueue
+from discolight.util.profiler import profiled
+from discolight.augmentations.augmentation.types import BoundedNumber
+
+# The archive formats that folder annotation writers can write to
+ARCHIVE_FORMATS = ["", "tar", "zip"]
 
 
 class AnnotationWriter(ABC):
@@ -33,8 +47,9 @@ class AnnotationWriter(ABC):
     def write_annotations_for_image(self, image_name, image, annotations):
         """Write the annotations for the given image.
 
-        Annotations are passed as a list of unnormalized BoundingBox
-        objects.
+        Annotations are passed as an unnormalized AnnotationTable, or as a
+        list of unnormalized BoundingBox objects, which can be converted
+        with AnnotationTable.from_bounding_boxes.
         """
         raise NotImplementedError
 
@@ -45,7 +60,9 @@ class CSVAnnotationWriter(AnnotationWriter):
 
     Concrete implementations of this class determine the columns and content
     of the CSV file by implementing the get_csv_fieldnames and get_csv_row
-    methods. Normalization is taken care of for you.
+    methods. Normalization is taken care of for you. Implementations can
+    also override get_csv_rows to make the rows for every annotation of an
+    image from the columns of its AnnotationTable at once.
     """
 
     def __init__(self, annotations_file, normalized):
@@ -96,14 +113,210 @@ class CSVAnnotationWriter(AnnotationWriter):
         """
         raise NotImplementedError
 
+    def get_csv_rows(self, image_name, image, annotations):
+        """Return the CSV rows for the annotations in an AnnotationTable.
+
+        By default, get_csv_row is invoked with each annotation as a
+        BoundingBox object.
+        """
+        return [
+            self.get_csv_row(image_name, image, annotation)
+            for annotation in annotations
+        ]
+
     def write_annotations_for_image(self, image_name, image, annotations):
         """Write the CSV rows for the given image and annotations."""
-        for annotation in annotations:
+        annotations = AnnotationTable.from_bounding_boxes(annotations)
+
+        if self.normalized:
+            height, width, _ = image.shape
+            annotations = annotations.normalize(width, height)
+
+        self.writer.writerows(
+            self.get_csv_rows(image_name, image, annotations))
+
+
+class FolderAnnotationWriter(AnnotationWriter):
+
+    """An abstract annotation writer that writes a file for each image.
+
+    Concrete implementations of this class determine the name and content
+    of the file for each image by implementing the get_annotation_file_name
+    and get_annotation_file_content methods. Creating and cleaning the
+    folder, writing in the background, sharding, and archiving are taken
+    care of for you.
+
+    If threads is greater than 0, files are written on a pool of threads
+    in the background, with up to queue_size files waiting to be written
+    at once. Errors encountered while writing a file are raised by a later
+    call to write_annotations_for_image, or when the writer is closed.
+
+    If shard_levels is greater than 0, each file is written to nested
+    subdirectories named after the first bytes of a hash of its name
+    (e.g., 3f/a2/image.jpg.xml with two levels), so that no directory
+    holds too many files.
+
+    If archive is "tar" or "zip", the files are written to an archive
+    named after annotations_folder, with the extension of the archive
+    format appended, instead of to annotations_folder. Files are added to
+    the archive in order, on at most one background thread.
+    """
+
+    def __init__(self,
+                 annotations_folder,
+                 clean_directory,
+                 threads=0,
+                 queue_size=256,
+                 shard_levels=0,
+                 archive=""):
+        """Construct a new folder annotation writer."""
+        self.annotations_folder = annotations_folder
+        self.clean_directory = clean_directory
+        self.threads = threads
+        self.queue_size = queue_size
+        self.shard_levels = shard_levels
+        self.archive = archive
+
+        self.archive_file = None
+        self.created_directories = set()
+        self.jobs = None
+
+    def __enter__(self):
+        """Open the annotation writer for writing."""
+        if self.archive == "tar":
+            self.archive_file = tarfile.open(self.archive_path(), "w|")
+        elif self.archive == "zip":
+            self.archive_file = zipfile.ZipFile(self.archive_path(), "w",
+                                                zipfile.ZIP_DEFLATED)
+        else:
+            if (os.path.isdir(self.annotations_folder)
+                    and self.clean_directory):
+                shutil.rmtree(self.annotations_folder)
+
+            if not os.path.isdir(self.annotations_folder):
+                os.mkdir(self.annotations_folder)
+
+        self.jobs = JobQueue(
+            min(self.threads, 1) if self.archive else self.threads,
+            self.queue_size)
+
+        return self
+
+    def __exit__(self, exc_type, _exc_val, _exc_tb):
+        """Close the annotation writer.
+
+        Any files still waiting to be written are written out first.
+        """
+        try:
+            self.jobs.close()
+        except Exception:  # pylint: disable=broad-except
+            # Don't mask an exception that is already being raised
+            if exc_type is None:
+                raise
+        finally:
+            if self.archive_file is not None:
+                self.archive_file.close()
+                self.archive_file = None
+
+    @staticmethod
+    def params():
+        """Return a Params object describing constructor parameters."""
+        return Params().add(
+            "annotations_folder", "the directory to save annotation files to",
+            str, "", True).add(
+                "clean_directory",
+                "whether to forcibly ensure the output directory is empty",
+                bool, True).add(
+                    "threads",
+                    "the number of threads to write annotation files on (0 "
+                    "to write files immediately)", BoundedNumber(int, 0),
+                    0).add(
+                        "queue_size",
+                        "the maximum number of annotation files waiting to be "
+                        "written when threads is greater than 0",
+                        BoundedNumber(int, 1), 256).add(
+                            "shard_levels",
+                            "the number of levels of hashed subdirectories to "
+                            "spread annotation files over",
+                            BoundedNumber(int, 0, 4), 0).add(
+                                "archive",
+                                "the archive format to write annotation "
+                                "files to instead of a directory (tar or "
+                                "zip, or empty to write a directory)", str,
+                                "").ensure(
+                                    lambda params: params["archive"] in
+                                    ARCHIVE_FORMATS,
+                                    "archive must be one of tar, zip, or an "
+                                    "empty string")
+
+    @abstractmethod
+    def get_annotation_file_name(self, image_name):
+        """Return the name of the annotation file for the given image."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_annotation_file_content(self, image_name, image, annotations):
+        """Return the content of the annotation file for the given image.
+
+        Annotations are passed as an unnormalized AnnotationTable, and the
+        content should be returned as bytes.
+        """
+        raise NotImplementedError
+
+    def archive_path(self):
+        """Return the path of the archive files are written to."""
+        return "{}.{}".format(
+            str(self.annotations_folder).rstrip(os.path.sep), self.archive)
+
+    def shard_directory(self, file_name):
+        """Return the subdirectories an annotation file is written to.
+
+        The subdirectories are returned as a list of names, one for each
+        level of sharding.
+        """
+        digest = hashlib.sha256(file_name.encode("utf-8")).hexdigest()
+
+        return [
+            digest[2 * level:2 * level + 2]
+            for level in range(self.shard_levels)
+        ]
+
+    def write_file(self, file_name, content):
+        """Write an annotation file to the folder or the archive."""
+        shard_directory = self.shard_directory(file_name)
+
+        with profiled("write_file"):
+            if self.archive == "tar":
+                info = tarfile.TarInfo("/".join(shard_directory +
+                                                [file_name]))
+                info.size = len(content)
+                info.mtime = time.time()
+
+                self.archive_file.addfile(info, io.BytesIO(content))
+                return
+
+            if self.archive == "zip":
+                self.archive_file.writestr(
+                    "/".join(shard_directory + [file_name]), content)
+                return
+
+            directory = os.path.join(self.annotations_folder,
+                                     *shard_directory)
+
+            if directory not in self.created_directories:
+                os.makedirs(directory, exist_ok=True)
+                self.created_directories.add(directory)
+
+            with open(os.path.join(directory, file_name),
+                      "wb") as annotations_file:
+                annotations_file.write(content)
+
+    def write_annotations_for_image(self, image_name, image, annotations):
+        """Write the annotation file for the given image."""
+        annotations = AnnotationTable.from_bounding_boxes(annotations)
 
-            processed_annotation = annotation
-            if self.normalized:
-                height, width, _ = image.shape
-                processed_annotation = annotation.normalize(width, height)
+        content = self.get_annotation_file_content(image_name, image,
+                                                   annotations)
 
-            self.writer.writerow(
-                self.get_csv_row(image_name, image, processed_annotation))
+        self.jobs.submit(self.write_file,
+                         self.get_annotation_file_name(image_name), content)
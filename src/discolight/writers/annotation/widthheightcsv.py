@@ -23,3 +23,20 @@ class WidthHeightCSV(CSVAnnotationWriter):
             "height": annotation.y_max - annotation.y_min,
             "label": annotation.class_idx
         }
+
+    def get_csv_rows(self, image_name, _image, annotations):
+        """Return the CSV rows for the annotations of an image."""
+        rows = annotations.rows
+
+        return [{
+            "image_name": image_name,
+            "x_min": x_min,
+            "y_min": y_min,
+            "width": width,
+            "height": height,
+            "label": class_idx
+        } for x_min, y_min, width, height, class_idx in zip(
+            rows["x_min"].tolist(), rows["y_min"].tolist(),
+            (rows["x_max"] - rows["x_min"]).tolist(),
+            (rows["y_max"] - rows["y_min"]).tolist(),
+            rows["class_idx"].tolist())]
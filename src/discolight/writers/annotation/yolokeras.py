@@ -1,4 +1,5 @@
 """A YOLO Keras annotation writer."""
+from discolight.annotations import AnnotationTable
 from discolight.params.params import Params
 from .types import AnnotationWriter
 
@@ -32,10 +33,13 @@ class YOLOKeras(AnnotationWriter):
 
     def write_annotations_for_image(self, image_name, _image, annotations):
         """Write the annotations for the given image."""
+        rows = AnnotationTable.from_bounding_boxes(annotations).rows
+
         annotation_strs = [
-            "{},{},{},{},{}".format(annot.x_min, annot.y_min, annot.x_max,
-                                    annot.y_max, annot.class_idx)
-            for annot in annotations
+            "{},{},{},{},{}".format(*annot)
+            for annot in zip(rows["x_min"].tolist(), rows["y_min"].tolist(),
+                             rows["x_max"].tolist(), rows["y_max"].tolist(),
+                             rows["class_idx"].tolist())
         ]
 
         self.annotations_fp.write("{} {}\n".format(image_name,
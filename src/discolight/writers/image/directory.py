@@ -3,20 +3,50 @@ import os
 import shutil
 import cv2
 from discolight.params.params import Params
+from discolight.util.files import link_or_copy, replacing
+from discolight.util.pipeline import JobQueue
+from discolight.util.profiler import profiled
+from discolight.augmentations.augmentation.types import BoundedNumber
 from .types import ImageWriter
 
 
+def write_image_file(path, image):
+    """Encode an image in BGR color space and write it to a file.
+
+    The image is encoded in the format given by the extension of path,
+    and the file at path is only replaced once the image has been written
+    in full.
+    """
+    with profiled("encode"):
+        success, encoded = cv2.imencode(os.path.splitext(path)[1], image)
+
+    if not success:
+        raise IOError("Could not write image to {}".format(path))
+
+    with profiled("write_file"), replacing(path) as temp_path:
+        encoded.tofile(temp_path)
+
+
 class Directory(ImageWriter):
 
     """Writes images to a directory in the filesystem.
 
     Images will be saved to a file with the given name in the given directory.
+
+    If threads is greater than 0, images are encoded and written on a pool
+    of threads in the background, with up to queue_size images waiting to
+    be written at once. Errors encountered while writing an image are
+    raised by a later call to write_image, or when the writer is closed.
     """
 
-    def __init__(self, directory, clean_directory):
+    def __init__(self, directory, clean_directory, threads=0, queue_size=16):
         """Construct a new Directory image writer."""
         self.directory = directory
         self.clean_directory = clean_directory
+        self.threads = threads
+        self.queue_size = queue_size
+
+        self.jobs = None
 
     def __enter__(self):
         """Initialize the image writer.
@@ -29,10 +59,21 @@ class Directory(ImageWriter):
         if not os.path.isdir(self.directory):
             os.mkdir(self.directory)
 
+        self.jobs = JobQueue(self.threads, self.queue_size)
+
         return self
 
-    def __exit__(self, _exc_type, _exc_val, _exc_tb):
-        """Close the image writer."""
+    def __exit__(self, exc_type, _exc_val, _exc_tb):
+        """Close the image writer.
+
+        Any images still waiting to be written are written out first.
+        """
+        try:
+            self.jobs.close()
+        except Exception:  # pylint: disable=broad-except
+            # Don't mask an exception that is already being raised
+            if exc_type is None:
+                raise
 
     @staticmethod
     def params():
@@ -41,10 +82,46 @@ class Directory(ImageWriter):
             "directory", "the directory to save images to", str, "", True).add(
                 "clean_directory",
                 "whether to forcibly ensure the output directory is empty",
-                bool, True)
+                bool, True).add(
+                    "threads",
+                    "the number of threads to encode and write images on "
+                    "(0 to write images immediately)", BoundedNumber(int, 0),
+                    0).add(
+                        "queue_size",
+                        "the maximum number of images waiting to be written "
+                        "when threads is greater than 0",
+                        BoundedNumber(int, 1), 16)
+
+    @staticmethod
+    def resume_options(options):
+        """Return the options to construct the writer with to resume a run.
+
+        The output directory is not cleaned, so that the images written by
+        earlier runs are kept.
+        """
+        return dict(options, clean_directory=False)
+
+    def flush(self):
+        """Wait until every image passed to write_image has been written."""
+        self.jobs.drain()
+
+    def image_path(self, image_name):
+        """Return the path of the file an image is written to."""
+        return os.path.join(self.directory, image_name)
+
+    def copy_image(self, image_name, image_path):
+        """Write an image with the given name from an encoded image file.
+
+        The file is hard linked into the output directory if possible.
+        """
+        self.jobs.submit(link_or_copy, image_path,
+                         self.image_path(image_name))
 
     def write_image(self, image_name, image):
         """Write an image with the given name to the output directory."""
+        # The color conversion makes a copy of the image, so the caller is
+        # free to modify the image as soon as this method returns.
         cc_image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
 
-        cv2.imwrite(os.path.join(self.directory, image_name), cc_image)
+        self.jobs.submit(write_image_file, self.image_path(image_name),
+                         cc_image)
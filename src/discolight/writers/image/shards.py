@@ -0,0 +1,67 @@
+"""An image writer that packs images into tar shards."""
+import os
+import cv2
+from discolight.params.params import Params
+from discolight.util.profiler import profiled
+from discolight.augmentations.augmentation.types import BoundedNumber
+from discolight.writers.shards import attach_shard_set, detach_shard_set
+from .types import ImageWriter
+
+
+class Shards(ImageWriter):
+
+    """Writes images to a directory of tar shards of about the same size.
+
+    Each image is encoded in the format given by the extension of its
+    name, and stored in a shard as a file named after the image. Use the
+    Shards annotation writer with the same directory and shard size to
+    store the annotations of each image next to it, as a JSON file with
+    the same name as the image, but with a .json extension, as in
+    WebDataset. Shards can then be read sequentially, or files can be read
+    directly using the JSON index written for each shard.
+
+    Existing shards in the directory are removed when the writer is
+    opened, so a run writing images to shards cannot be resumed: generate
+    raises an error, leaving the shards untouched, if the manifest of the
+    query already records outputs.
+    """
+
+    def __init__(self, directory, shard_size_mb=1024):
+        """Construct a new Shards image writer."""
+        self.directory = directory
+        self.shard_size_mb = shard_size_mb
+
+        self.shard_set = None
+
+    def __enter__(self):
+        """Initialize the image writer."""
+        self.shard_set = attach_shard_set(self.directory,
+                                          int(self.shard_size_mb * (1 << 20)))
+
+        return self
+
+    def __exit__(self, _exc_type, _exc_val, _exc_tb):
+        """Close the image writer."""
+        detach_shard_set(self.shard_set)
+
+    @staticmethod
+    def params():
+        """Return a Params object describing constructor parameters."""
+        return Params().add(
+            "directory", "the directory to save shards to", str, "",
+            True).add("shard_size_mb", "the size of each shard in MB",
+                      BoundedNumber(float, 0), 1024)
+
+    def write_image(self, image_name, image):
+        """Encode an image, and add it to the shards."""
+        key, ext = os.path.splitext(image_name)
+
+        with profiled("encode"):
+            success, encoded = cv2.imencode(
+                ext, cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
+
+        if not success:
+            raise IOError("Could not encode image {}".format(image_name))
+
+        with profiled("write_file"):
+            self.shard_set.add(key, ext[1:].lower(), encoded.tobytes())
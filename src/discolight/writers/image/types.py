@@ -1,5 +1,6 @@
 """Base types for image writers."""
 from abc import ABC, abstractmethod
+from discolight.util.image import load_image
 
 
 class ImageWriter(ABC):
@@ -31,3 +32,43 @@ class ImageWriter(ABC):
     def write_image(self, image_name, image):
         """Write an image with the given name."""
         raise NotImplementedError
+
+    @staticmethod
+    def resume_options(_options):
+        """Return the options to construct the writer with to resume a run.
+
+        A resumed run only writes the images that earlier runs did not
+        write, so the image writer must keep the images they wrote. Image
+        writers that can do so should override this method to return the
+        given options, changed so that existing images are kept. By
+        default, None is returned, and runs writing images with the image
+        writer cannot be resumed.
+        """
+        return None
+
+    def image_path(self, _image_name):
+        """Return the path of the file an image is written to, if any.
+
+        Image writers that write each image to its own file should
+        override this method, so that the files they write can be reused
+        (e.g., by the augmentation cache). By default, None is returned.
+        """
+        return None
+
+    def copy_image(self, image_name, image_path):
+        """Write an image with the given name from an encoded image file.
+
+        The file must have been written by an image writer of the same
+        type. By default, the image is decoded and passed to write_image.
+        Image writers that override image_path should override this method
+        to copy the file without decoding it.
+        """
+        self.write_image(image_name, load_image(image_path))
+
+    def flush(self):
+        """Wait until every image passed to write_image has been written.
+
+        Image writers that write images in the background must override
+        this method. By default, images are assumed to be written by the
+        time write_image returns.
+        """
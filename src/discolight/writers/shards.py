@@ -0,0 +1,216 @@
+"""Sequential tar shards shared by the Shards image and annotation writers."""
+from collections import OrderedDict
+import contextlib
+import glob
+import io
+import json
+import os
+import tarfile
+import threading
+import time
+
+# The maximum number of samples waiting for the rest of their members
+MAX_PENDING_SAMPLES = 64
+
+_shard_sets = {}
+_shard_sets_lock = threading.Lock()
+
+
+def tar_padded_size(size):
+    """Return the number of bytes the data of a file takes in a tar."""
+    return -(-size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+
+
+def shard_name(shard_idx):
+    """Return the name of a shard, without an extension."""
+    return "shard-{:06d}".format(shard_idx)
+
+
+class ShardSet:
+
+    """A directory of tar shards holding the samples of a dataset.
+
+    A sample is a group of files with the same key (e.g., an encoded image
+    and its annotations), named after the key with the extension of each
+    file appended, as in WebDataset. Each writer attached to a shard set
+    adds one file to every sample, and once every attached writer has
+    added its file, the sample is appended to the current shard. Samples
+    that are still incomplete once MAX_PENDING_SAMPLES samples are
+    waiting, or when the shard set is closed, are appended as they are.
+
+    A new shard is started whenever appending a sample would make the
+    current shard larger than about shard_size bytes. Each shard is written
+    along with a JSON index giving the offset and size of every file in
+    it, and an index.json file listing the shards is written when the
+    shard set is closed.
+    """
+
+    def __init__(self, directory, shard_size):
+        """Construct a shard set writing to the given directory."""
+        self.directory = directory
+        self.shard_size = shard_size
+
+        self.writers = 0
+        self.pending = OrderedDict()
+
+        self.shards = []
+        self.shard = None
+        self.shard_samples = None
+
+        # Closes the current shard if the shard set is closed early
+        self.stack = contextlib.ExitStack()
+
+        self.lock = threading.Lock()
+
+    def open(self):
+        """Create the directory, removing any shards already in it."""
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        for path in (glob.glob(os.path.join(self.directory, "shard-*")) +
+                     [os.path.join(self.directory, "index.json")]):
+            if os.path.isfile(path):
+                os.remove(path)
+
+    def add(self, key, extension, content):
+        """Add a file with the given extension to the sample with a key."""
+        with self.lock:
+            sample = self.pending.setdefault(key, {})
+
+            if extension in sample:
+                raise ValueError("Sample {} already has a .{} file".format(
+                    key, extension))
+
+            sample[extension] = content
+
+            if len(sample) >= self.writers:
+                self.write_sample(key, self.pending.pop(key))
+
+            while len(self.pending) > MAX_PENDING_SAMPLES:
+                self.write_sample(*self.pending.popitem(last=False))
+
+    def write_sample(self, key, sample):
+        """Append a sample to the current shard.
+
+        This must be called with the lock held.
+        """
+        sample_size = sum(
+            tarfile.BLOCKSIZE + tar_padded_size(len(content))
+            for content in sample.values())
+
+        if (self.shard is not None and self.shard.offset + sample_size >
+                self.shard_size):
+            self.close_shard()
+
+        if self.shard is None:
+            self.shard = self.stack.enter_context(
+                tarfile.open(os.path.join(self.directory,
+                                          shard_name(len(self.shards)) +
+                                          ".tar"),
+                             "w",
+                             format=tarfile.PAX_FORMAT))
+            self.shard_samples = []
+
+        members = {}
+
+        for extension, content in sorted(sample.items()):
+            info = tarfile.TarInfo("{}.{}".format(key, extension))
+            info.size = len(content)
+            info.mtime = int(time.time())
+
+            self.shard.addfile(info, io.BytesIO(content))
+
+            # The data of the file ends the shard so far
+            members[extension] = [
+                self.shard.offset - tar_padded_size(len(content)),
+                len(content)
+            ]
+
+        self.shard_samples.append({"key": key, "files": members})
+
+    def close_shard(self):
+        """Finish the current shard, and write its index.
+
+        This must be called with the lock held.
+        """
+        name = shard_name(len(self.shards))
+
+        # This closes the tar file of the shard
+        self.stack.close()
+
+        with open(os.path.join(self.directory, name + ".json"),
+                  "w",
+                  encoding="utf-8") as index_file:
+            json.dump({"samples": self.shard_samples}, index_file)
+
+        self.shards.append({
+            "tar": name + ".tar",
+            "index": name + ".json",
+            "samples": len(self.shard_samples),
+            "bytes": os.path.getsize(
+                os.path.join(self.directory, name + ".tar"))
+        })
+
+        self.shard = None
+        self.shard_samples = None
+
+    def close(self):
+        """Write out every pending sample, and the index of the shards."""
+        with self.lock, self.stack:
+            while self.pending:
+                self.write_sample(*self.pending.popitem(last=False))
+
+            if self.shard is not None:
+                self.close_shard()
+
+            with open(os.path.join(self.directory, "index.json"),
+                      "w",
+                      encoding="utf-8") as index_file:
+                json.dump(
+                    {
+                        "shard_size": self.shard_size,
+                        "shards": self.shards
+                    }, index_file)
+
+
+def attach_shard_set(directory, shard_size):
+    """Return the shard set writing to directory, attaching a writer to it.
+
+    Writers with the same directory share a shard set, which is created
+    when the first writer is attached. All of them must use the same
+    shard size.
+    """
+    path = os.path.abspath(directory)
+
+    with _shard_sets_lock:
+        shard_set = _shard_sets.get(path)
+
+        if shard_set is None:
+            shard_set = ShardSet(directory, shard_size)
+            shard_set.open()
+
+            _shard_sets[path] = shard_set
+        elif shard_set.shard_size != shard_size:
+            raise ValueError(
+                "Writers to the shards in {} use different shard sizes".format(
+                    directory))
+
+        with shard_set.lock:
+            shard_set.writers += 1
+
+    return shard_set
+
+
+def detach_shard_set(shard_set):
+    """Detach a writer from a shard set, closing it after the last writer."""
+    with _shard_sets_lock:
+        with shard_set.lock:
+            shard_set.writers -= 1
+            last_writer = shard_set.writers == 0
+
+        if not last_writer:
+            return
+
+        del _shard_sets[os.path.abspath(shard_set.directory)]
+
+    shard_set.close()
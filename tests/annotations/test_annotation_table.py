@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from discolight.annotations import (AnnotationTable, BoundingBox,
+                                    annotations_to_numpy_array)
+
+
+def test_annotation_table_acts_like_a_list_of_bounding_boxes():
+
+    bboxes = [
+        BoundingBox(1, 2, 3, 4, 0, {"name": "wheat"}),
+        BoundingBox(5, 6, 7, 8, 1)
+    ]
+
+    table = AnnotationTable.from_bounding_boxes(bboxes)
+
+    assert len(table) == 2
+    assert np.array_equal(table.to_numpy(),
+                          annotations_to_numpy_array(bboxes))
+    assert np.array_equal(annotations_to_numpy_array(table),
+                          annotations_to_numpy_array(bboxes))
+
+    for bbox, table_bbox in zip(bboxes, table):
+        assert table_bbox.as_list() == bbox.as_list()
+        assert table_bbox.additional_info == bbox.additional_info
+
+    assert table[1:][0].as_list() == [5, 6, 7, 8, 1]
+    assert AnnotationTable.from_bounding_boxes(table) is table
+
+
+def test_normalizing_keeps_additional_info():
+
+    table = AnnotationTable.from_numpy([[10, 20, 30, 40, 2.0]], [0],
+                                       [{"name": "wheat"}])
+
+    normalized = table.normalize(100, 50)
+
+    assert normalized.to_numpy().tolist() == [[0.1, 0.4, 0.3, 0.8, 2.0]]
+    assert normalized.info(0) == {"name": "wheat"}
+    assert normalized.additional_info is table.additional_info
+    assert np.allclose(
+        normalized.unnormalize(100, 50).to_numpy(), table.to_numpy())
+    assert normalized.unnormalize(100, 50).info(0) == {"name": "wheat"}
+    assert table.to_numpy().tolist() == [[10, 20, 30, 40, 2.0]]
+
+
+def test_empty_annotation_table():
+
+    table = AnnotationTable.from_numpy(np.empty((0, 5)))
+
+    assert len(table) == 0
+    assert table.to_numpy().shape == (0, 5)
+    assert list(table) == []
+
+
+@pytest.mark.usefixtures("coco_imageset")
+def test_coco_annotations_share_additional_info(coco_imageset):
+
+    tables = [annotations for _, annotations in coco_imageset.values()]
+
+    additional_info = tables[0].additional_info
+
+    assert all(table.additional_info is additional_info for table in tables)
+    assert len(additional_info) < sum(len(table) for table in tables)
@@ -0,0 +1,154 @@
+import random
+
+import numpy as np
+import pytest
+
+from discolight.disco import disco
+from discolight.augmentations.factory import make_augmentations_factory
+
+
+@pytest.fixture
+def images():
+    rng = np.random.RandomState(0)
+
+    return rng.randint(0, 256, (6, 24, 32, 3), dtype=np.uint8)
+
+
+def empty_bboxes(images):
+    return [np.empty((0, 5)) for _ in images]
+
+
+def augment_each(augmentation, images):
+    return np.stack([
+        augmentation.augment(img.copy(), np.empty((0, 5)))[0]
+        for img in images
+    ])
+
+
+@pytest.mark.parametrize("name,options", [
+    ("GrayScale", {}),
+    ("Sepia", {}),
+    ("ColorTemperature", {
+        "kelvin": 4500
+    }),
+    ("RandomHSV", {
+        "hue": (5, 5),
+        "saturation": (-10, -10),
+        "brightness": (20, 20)
+    }),
+    ("Rotate", {
+        "angle": 15
+    }),
+])
+def test_batch_matches_single_image_augmentation(images, name, options):
+
+    augmentation = make_augmentations_factory()(name, **options)
+
+    expected = augment_each(augmentation, images)
+
+    aug_images, aug_bboxes_list = augmentation.augment_batch(
+        images.copy(), empty_bboxes(images))
+
+    assert isinstance(aug_images, np.ndarray)
+    assert np.array_equal(aug_images, expected)
+    assert len(aug_bboxes_list) == len(images)
+
+
+@pytest.mark.parametrize("name,options", [
+    ("RandomHSV", {
+        "hue": (-20, 20),
+        "saturation": (-20, 20),
+        "brightness": (-20, 20)
+    }),
+    ("GaussianNoise", {}),
+    ("SaltAndPepperNoise", {
+        "noise_type": "SnP"
+    }),
+    ("SaltAndPepperNoise", {
+        "noise_type": "RGB"
+    }),
+])
+def test_random_batch_augmentations_differ_per_image(images, name, options):
+
+    augmentation = make_augmentations_factory()(name, **options)
+
+    same_images = np.repeat(images[:1], len(images), axis=0)
+
+    random.seed(0)
+    aug_images, _ = augmentation.augment_batch(same_images.copy(),
+                                               empty_bboxes(same_images))
+
+    assert aug_images.shape == same_images.shape
+    assert aug_images.dtype == np.uint8
+    assert not all(
+        np.array_equal(aug_images[0], aug_img) for aug_img in aug_images[1:])
+
+
+def test_batch_with_probs_only_augments_some_images(images):
+
+    augmentation = make_augmentations_factory()("GrayScale", probs=0.5)
+
+    random.seed(0)
+    aug_images, _ = augmentation.augment_batch(images.copy(),
+                                               empty_bboxes(images))
+
+    grayscale = augment_each(make_augmentations_factory()("GrayScale"),
+                             images)
+
+    unchanged = [
+        np.array_equal(aug_img, img)
+        for aug_img, img in zip(aug_images, images)
+    ]
+
+    assert any(unchanged) and not all(unchanged)
+
+    for aug_img, img, gray_img, is_unchanged in zip(aug_images, images,
+                                                    grayscale, unchanged):
+        assert np.array_equal(aug_img, img if is_unchanged else gray_img)
+
+
+def test_batch_of_differently_sized_images_is_a_list(images):
+
+    factory = make_augmentations_factory()
+
+    sequence = factory(
+        "Sequence",
+        augmentations=[factory("Sepia"),
+                       factory("HorizontalFlip")])
+
+    batch = [images[0], images[1, :12], images[2, :, :16]]
+    bboxes_list = [np.array([[1, 2, 10, 8, 0]], dtype=float)] * 3
+
+    aug_images, aug_bboxes_list = sequence.augment_batch(
+        [img.copy() for img in batch],
+        [bboxes.copy() for bboxes in bboxes_list])
+
+    assert isinstance(aug_images, list)
+
+    for img, bboxes, aug_img, aug_bboxes in zip(batch, bboxes_list,
+                                                aug_images, aug_bboxes_list):
+        expected_img, expected_bboxes = sequence.augment(
+            img.copy(), bboxes.copy())
+
+        assert np.array_equal(aug_img, expected_img)
+        assert np.array_equal(aug_bboxes, expected_bboxes)
+
+
+def test_disco_batch(images):
+
+    aug = disco.Sequence(augmentations=[disco.GrayScale(), disco.Sepia()])
+
+    original = images.copy()
+
+    aug_images = aug.batch(images)
+
+    assert np.array_equal(images, original)
+    assert np.array_equal(aug_images, np.stack([aug(img) for img in images]))
+
+    annotations_list = [[]] * len(images)
+
+    aug_images, aug_annotations_list = aug.batch(list(images),
+                                                 annotations_list)
+
+    assert isinstance(aug_images, list)
+    assert aug_annotations_list == annotations_list
@@ -0,0 +1,144 @@
+import random
+
+import cv2
+import numpy as np
+import pytest
+
+from discolight.augmentations.factory import make_augmentations_factory
+from discolight.augmentations.augmentation.color import ColorLUT, ColorMatrix
+
+sepia_matrix = np.array([[0.393, 0.769, 0.189], [0.349, 0.686, 0.168],
+                         [0.272, 0.534, 0.131]])
+
+
+@pytest.fixture
+def image():
+    rng = np.random.RandomState(0)
+
+    return rng.randint(0, 256, (48, 64, 3), dtype=np.uint8)
+
+
+def augment(name, img, **options):
+    augmentation = make_augmentations_factory()(name, **options)
+
+    aug_img, _ = augmentation.augment(img.copy(), np.empty((0, 5)))
+
+    return aug_img
+
+
+def test_color_lut_maps_each_channel(image):
+
+    lut = ColorLUT.from_function(lambda values: 255 - values * [1, 0, 2])
+
+    expected = np.clip(255 - image.astype(float) * [1, 0, 2], 0, 255)
+
+    assert np.array_equal(lut.apply(image), expected)
+
+
+def test_color_matrix_applies_to_batches(image):
+
+    matrix = ColorMatrix(sepia_matrix)
+    batch = np.stack([image, image[::-1]])
+
+    aug_batch = matrix.apply(batch)
+
+    assert aug_batch.shape == batch.shape
+    assert np.array_equal(aug_batch[0], matrix.apply(image))
+    assert np.array_equal(aug_batch[1], matrix.apply(image[::-1]))
+
+
+def test_grayscale_matches_reference(image):
+
+    expected = np.round(image.astype(float) @ [0.299, 0.587, 0.114])
+
+    aug_img = augment("GrayScale", image)
+
+    assert aug_img.dtype == np.uint8
+    for i in range(3):
+        assert np.abs(aug_img[..., i] - expected).max() <= 1
+
+
+def test_sepia_matches_reference(image):
+
+    expected = np.clip(np.round(image.astype(float) @ sepia_matrix.T), 0, 255)
+
+    aug_img = augment("Sepia", image)
+
+    assert aug_img.dtype == np.uint8
+    assert np.abs(aug_img - expected).max() <= 1
+
+
+def test_color_temperature_matches_reference(image):
+
+    augmentation = make_augmentations_factory()("ColorTemperature",
+                                                kelvin=4500)
+
+    multiplier = np.float32([255, 219, 186]) / 255.0
+    expected = np.round(image.astype(np.float32) * multiplier)
+
+    aug_img, _ = augmentation.augment(image.copy(), np.empty((0, 5)))
+
+    assert aug_img.dtype == np.uint8
+    assert np.array_equal(aug_img, expected)
+
+
+def test_random_hsv_matches_reference(image):
+
+    random.seed(0)
+    aug_img = augment("RandomHSV",
+                      image,
+                      hue=(-30, 30),
+                      saturation=(-30, 30),
+                      brightness=(-30, 30))
+
+    random.seed(0)
+    random.random()  # The roll for whether to apply the augmentation
+    shift = np.array([random.randint(-30, 30) for _ in range(3)])
+
+    expected = np.clip(image.astype(int) + shift, 0, 255)
+    expected[..., 0] = np.clip(expected[..., 0], 0, 179)
+
+    assert np.array_equal(aug_img, expected)
+
+
+@pytest.mark.parametrize("name,options", [
+    ("GrayScale", {}),
+    ("Sepia", {}),
+    ("ColorTemperature", {
+        "kelvin": 8000
+    }),
+    ("RandomHSV", {
+        "hue": (10, 10)
+    }),
+])
+def test_uint8_color_augmentations_make_no_float_temporaries(
+        image, monkeypatch, name, options):
+
+    augmentation = make_augmentations_factory()(name, **options)
+
+    calls = []
+
+    def counting(func):
+        def wrapped(*args, **kwargs):
+            calls.append(func.__name__)
+            return func(*args, **kwargs)
+
+        return wrapped
+
+    monkeypatch.setattr(cv2, "LUT", counting(cv2.LUT))
+    monkeypatch.setattr(cv2, "transform", counting(cv2.transform))
+
+    aug_img, _ = augmentation.augment(image, np.empty((0, 5)))
+
+    assert len(calls) == 1
+    assert aug_img.dtype == np.uint8
+
+
+@pytest.mark.parametrize("name", ["GrayScale", "Sepia"])
+def test_float_images_are_still_supported(image, name):
+
+    float_img = image.astype(np.float32)
+
+    aug_img = augment(name, float_img)
+
+    assert np.abs(aug_img.astype(float) - augment(name, image)).max() <= 1
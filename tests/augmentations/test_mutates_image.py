@@ -0,0 +1,136 @@
+import random
+
+import numpy as np
+import pytest
+import yamale
+
+from discolight.annotations import annotations_to_numpy_array
+from discolight.augmentations.augmentation.color import ColorLUT
+from discolight.augmentor import augment_image
+from discolight.disco import disco
+import discolight.augmentations.factory as factory
+
+augmentations_factory = factory.make_augmentations_factory()
+
+
+def make_augmentation(name):
+
+    options = {}
+
+    try:
+        with open("./fixtures/{}.yml".format(name)) as aug_options_yml:
+            options = yamale.make_data(
+                content=aug_options_yml.read())[0][0]["options"]
+    except IOError:
+        pass
+
+    return augmentations_factory(name, **options)
+
+
+@pytest.mark.usefixtures("sample_image")
+@pytest.mark.parametrize("name", sorted(factory.get_augmentations_set()))
+def test_augmentations_only_mutate_images_if_declared(sample_image, name):
+
+    augmentation = make_augmentation(name)
+
+    if augmentation.mutates_image:
+        pytest.skip("{} declares that it mutates images".format(name))
+
+    img, annotations = sample_image
+    bboxes = annotations_to_numpy_array(annotations)
+
+    original = img.copy()
+
+    random.seed(0)
+    augmentation.augment(img, bboxes.copy())
+
+    assert np.array_equal(img, original)
+
+
+def test_composite_augmentations_mutate_if_any_child_does():
+
+    rotate = augmentations_factory("Rotate")
+    eraser = augmentations_factory("RandomEraser")
+
+    assert not rotate.mutates_image
+    assert eraser.mutates_image
+
+    for name in ["Sequence", "OneOf"]:
+        assert not augmentations_factory(name,
+                                         augmentations=[rotate]).mutates_image
+        assert augmentations_factory(name,
+                                     augmentations=[rotate,
+                                                    eraser]).mutates_image
+
+
+@pytest.mark.usefixtures("sample_image")
+def test_augment_preserving_input_copies_only_when_needed(sample_image):
+
+    img, annotations = sample_image
+    bboxes = annotations_to_numpy_array(annotations)
+
+    original_img, original_bboxes = img.copy(), bboxes.copy()
+
+    skipped = augmentations_factory("HorizontalFlip", probs=0)
+
+    aug_img, _ = skipped.augment_preserving_input(img, bboxes)
+
+    assert aug_img is img
+
+    noise = augmentations_factory("SaltAndPepperNoise")
+
+    aug_img, _ = noise.augment_preserving_input(img, bboxes)
+
+    assert not np.array_equal(aug_img, img)
+
+    flip = augmentations_factory("HorizontalFlip")
+
+    flip.augment_preserving_input(img, bboxes)
+
+    assert np.array_equal(img, original_img)
+    assert np.array_equal(bboxes, original_bboxes)
+
+
+@pytest.mark.usefixtures("sample_image")
+def test_pipeline_leaves_original_image_untouched(sample_image):
+
+    img, annotations = sample_image
+    bboxes = annotations_to_numpy_array(annotations)
+
+    original_img = img.copy()
+
+    augmentations = [
+        augmentations_factory("RandomEraser"),
+        augmentations_factory("GrayScale"),
+        augmentations_factory("SaltAndPepperNoise")
+    ]
+
+    results = list(
+        augment_image(augmentations, "image.jpg", img, bboxes, True, 0))
+
+    assert len(results) == 3
+    assert np.array_equal(img, original_img)
+
+    aug_img = disco.RandomEraser()(img)
+
+    assert np.array_equal(img, original_img)
+    assert not np.array_equal(aug_img, img)
+
+
+def test_color_lut_writes_to_out():
+
+    img = np.arange(48, dtype=np.uint8).reshape(4, 4, 3)
+
+    lut = ColorLUT.from_function(lambda values: 255 - values)
+
+    out = np.empty_like(img)
+
+    assert lut.apply(img, out=out) is out
+    assert np.array_equal(out, 255 - img)
+
+    lut.apply(img, out=img)
+
+    assert np.array_equal(img, out)
+
+    with pytest.raises(ValueError):
+        lut.apply(img, out=np.empty((4, 4, 3), dtype=np.float32))
@@ -0,0 +1,97 @@
+import random
+
+import numpy as np
+import pytest
+
+from discolight.augmentations.factory import make_augmentations_factory
+from discolight.augmentations.randomcrop import get_bboxes_in_cropped_area
+
+
+@pytest.fixture
+def image():
+    return np.zeros((200, 300, 3), dtype=np.uint8)
+
+
+def random_bboxes(count, width, height, max_size, seed=0):
+    rng = np.random.RandomState(seed)
+
+    sizes = rng.uniform(1, max_size, (count, 2))
+    x_min = rng.uniform(0, width - sizes[:, 0])
+    y_min = rng.uniform(0, height - sizes[:, 1])
+
+    return np.column_stack((x_min, y_min, x_min + sizes[:, 0],
+                            y_min + sizes[:, 1], rng.randint(0, 5, count)))
+
+
+def test_bboxes_in_cropped_area_matches_reference():
+
+    bboxes = random_bboxes(200, 300, 200, 60)
+
+    for x, y, w, h in [(0, 0, 300, 200), (50, 20, 100, 80), (10, 10, 5, 5)]:
+
+        expected = [
+            bbox for bbox in bboxes if bbox[0] >= x and bbox[1] >= y
+            and bbox[2] <= x + w and bbox[3] <= y + h
+        ]
+
+        assert np.array_equal(get_bboxes_in_cropped_area(x, y, w, h, bboxes),
+                              np.array(expected).reshape(-1, 5))
+
+
+def test_crop_always_keeps_a_box(image):
+
+    # A single small box in the bottom right corner is rarely inside a
+    # crop positioned at random
+    bboxes = np.array([[260, 170, 270, 180, 1]], dtype=float)
+
+    crop = make_augmentations_factory()("RandomCrop")
+
+    for seed in range(50):
+        random.seed(seed)
+
+        _, aug_bboxes = crop.augment(image, bboxes.copy())
+
+        assert len(aug_bboxes) == 1
+
+
+def test_crop_of_dense_boxes_keeps_boxes(image):
+
+    bboxes = random_bboxes(600, 300, 200, 20)
+
+    crop = make_augmentations_factory()("RandomCrop",
+                                        min_width=0.1,
+                                        min_height=0.1,
+                                        max_width=0.2,
+                                        max_height=0.2)
+
+    for seed in range(20):
+        random.seed(seed)
+
+        aug_img, aug_bboxes = crop.augment(image, bboxes.copy())
+
+        assert aug_img.shape == image.shape
+        assert len(aug_bboxes) > 0
+        assert np.all(aug_bboxes[:, :4] >= 0)
+        assert np.all(aug_bboxes[:, [0, 2]] <= 300)
+        assert np.all(aug_bboxes[:, [1, 3]] <= 200)
+
+
+def test_crop_without_boxes(image):
+
+    crop = make_augmentations_factory()("RandomCrop")
+
+    random.seed(0)
+    aug_img, aug_bboxes = crop.augment(image, np.empty((0, 5)))
+
+    assert aug_img.shape == image.shape
+    assert aug_bboxes.shape == (0, 5)
+
+
+def test_crop_fails_if_no_box_can_fit(image):
+
+    bboxes = np.array([[0, 0, 290, 190, 1]], dtype=float)
+
+    crop = make_augmentations_factory()("RandomCrop")
+
+    with pytest.raises(RuntimeError):
+        crop.augment(image, bboxes)
@@ -0,0 +1,94 @@
+import random
+
+import numpy as np
+import pytest
+
+from discolight.augmentations.factory import make_augmentations_factory
+
+
+@pytest.fixture
+def image():
+    rng = np.random.RandomState(0)
+
+    return rng.randint(0, 256, (120, 160, 3), dtype=np.uint8)
+
+
+def erased_mask(img, aug_img):
+    return np.any(img != aug_img, axis=2)
+
+
+def test_random_eraser_erases_a_rectangle_in_range(image):
+
+    eraser = make_augmentations_factory()("RandomEraser",
+                                          x_range=(0.25, 0.75),
+                                          y_range=(0.5, 1.0),
+                                          fill_mode="CONSTANT",
+                                          fill_value=7)
+
+    for seed in range(10):
+        random.seed(seed)
+
+        aug_img = eraser.get_img(image.copy())
+
+        rows, cols = np.nonzero(np.all(aug_img == 7, axis=2))
+
+        assert rows.min() >= 60 and rows.max() < 120
+        assert cols.min() >= 40 and cols.max() < 120
+
+        rectangle = aug_img[rows.min():rows.max() + 1,
+                            cols.min():cols.max() + 1]
+
+        assert np.all(rectangle == 7)
+        assert erased_mask(image, aug_img).sum() <= rectangle[..., 0].size
+
+
+def test_random_eraser_mean_fill(image):
+
+    eraser = make_augmentations_factory()("RandomEraser", fill_mode="MEAN")
+
+    random.seed(0)
+    aug_img = eraser.get_img(image.copy())
+
+    mean_color = np.round(image.reshape(-1, 3).mean(axis=0))
+
+    assert np.all(aug_img[erased_mask(image, aug_img)] == mean_color)
+
+
+def test_random_eraser_noise_is_reproducible(image):
+
+    eraser = make_augmentations_factory()("RandomEraser")
+
+    random.seed(3)
+    first = eraser.get_img(image.copy())
+
+    random.seed(3)
+    second = eraser.get_img(image.copy())
+
+    random.seed(4)
+    third = eraser.get_img(image.copy())
+
+    assert np.array_equal(first, second)
+    assert not np.array_equal(first, third)
+
+
+def test_random_eraser_draws_few_random_numbers(image, monkeypatch):
+
+    draws = []
+    uniform = random.uniform
+
+    def counting_uniform(*args):
+        draws.append(args)
+        return uniform(*args)
+
+    monkeypatch.setattr(random, "uniform", counting_uniform)
+
+    eraser = make_augmentations_factory()("RandomEraser",
+                                          x_range=(0.0, 1.0),
+                                          y_range=(0.0, 1.0))
+
+    random.seed(0)
+    aug_img = eraser.get_img(image.copy())
+
+    # The number of random draws no longer depends on the erased area
+    assert erased_mask(image, aug_img).sum() > 100
+    assert len(draws) < 20
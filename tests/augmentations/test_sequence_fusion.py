@@ -0,0 +1,185 @@
+import random
+
+import cv2
+import numpy as np
+import pytest
+
+from discolight.disco import disco
+from discolight.augmentations.factory import make_augmentations_factory
+from discolight.augmentations.augmentation.affine import AffineTransform
+from discolight.augmentations.augmentation.types import AffineAugmentation
+from discolight.params.params import Params
+
+bboxes = np.array([[100, 200, 300, 400, 1], [500, 600, 700, 900, 2]],
+                  dtype=float)
+
+
+def augment(augmentations, img, fuse, seed=3):
+
+    factory = make_augmentations_factory()
+
+    random.seed(seed)
+
+    sequence = factory("Sequence", augmentations=augmentations, fuse=fuse)
+
+    aug_img, aug_bboxes = sequence.augment(img.copy(), bboxes.copy())
+
+    return aug_img, aug_bboxes, random.random()
+
+
+@pytest.fixture
+def count_resamples(monkeypatch):
+
+    calls = []
+
+    def counting(func):
+        def wrapped(*args, **kwargs):
+            calls.append(func.__name__)
+            return func(*args, **kwargs)
+
+        return wrapped
+
+    monkeypatch.setattr(cv2, "warpAffine", counting(cv2.warpAffine))
+    monkeypatch.setattr(cv2, "resize", counting(cv2.resize))
+
+    return calls
+
+
+@pytest.mark.usefixtures("sample_image")
+def test_fused_pixel_aligned_sequence_is_exact(sample_image):
+
+    img, _ = sample_image
+    factory = make_augmentations_factory()
+
+    augmentations = [
+        factory("HorizontalFlip"),
+        factory("Translate", translate_x=0.1, translate_y=0.2),
+        factory("VerticalFlip")
+    ]
+
+    img_unfused, bboxes_unfused, _ = augment(augmentations, img, False)
+    img_fused, bboxes_fused, _ = augment(augmentations, img, True)
+
+    assert np.array_equal(img_unfused, img_fused)
+    assert np.allclose(bboxes_unfused, bboxes_fused)
+
+
+@pytest.mark.usefixtures("sample_image")
+def test_fused_sequence_resamples_once(sample_image, count_resamples):
+
+    img, _ = sample_image
+    factory = make_augmentations_factory()
+
+    augmentations = [
+        factory("Rotate", angle=20),
+        factory("Shear", shear_factor=-0.2),
+        factory("Scale", scale_x=0.1, scale_y=0.1),
+        factory("Translate", translate_x=0.05, translate_y=0.05)
+    ]
+
+    img_unfused, _, _ = augment(augmentations, img, False)
+
+    count_resamples.clear()
+
+    img_fused, _, _ = augment(augmentations, img, True)
+
+    assert count_resamples == ["warpAffine"]
+    assert img_fused.shape == img_unfused.shape
+
+
+@pytest.mark.usefixtures("sample_image")
+def test_fused_sequence_draws_same_random_numbers(sample_image):
+
+    img, _ = sample_image
+    factory = make_augmentations_factory()
+
+    augmentations = [
+        factory("RandomRotate"),
+        factory("RandomShear", probs=0.5),
+        factory("GrayScale"),
+        factory("RandomScale"),
+        factory("RandomTranslate", probs=0.5)
+    ]
+
+    for seed in range(5):
+
+        img_unfused, bboxes_unfused, next_unfused = augment(
+            augmentations, img, False, seed)
+        img_fused, bboxes_fused, next_fused = augment(augmentations, img,
+                                                      True, seed)
+
+        assert next_unfused == next_fused
+        assert img_unfused.shape == img_fused.shape
+
+
+@pytest.mark.usefixtures("sample_image")
+def test_fused_rotation_matches_unfused_bboxes(sample_image):
+
+    img, _ = sample_image
+    factory = make_augmentations_factory()
+
+    augmentations = [factory("Rotate", angle=30)]
+
+    _, bboxes_unfused, _ = augment(augmentations, img, False)
+    _, bboxes_fused, _ = augment(augmentations, img, True)
+
+    assert np.allclose(bboxes_unfused, bboxes_fused, atol=1)
+
+
+@pytest.mark.usefixtures("sample_image")
+def test_skipped_affine_augmentations_leave_image_untouched(
+        sample_image, count_resamples):
+
+    img, _ = sample_image
+    factory = make_augmentations_factory()
+
+    sequence = factory(
+        "Sequence",
+        augmentations=[factory("Rotate", probs=0),
+                       factory("Shear", probs=0)],
+        fuse=True)
+
+    aug_img, aug_bboxes = sequence.augment(img, bboxes)
+
+    assert aug_img is img
+    assert aug_bboxes is bboxes
+    assert count_resamples == []
+
+
+@pytest.mark.usefixtures("sample_image")
+def test_affine_augmentation_default_augment(sample_image):
+
+    class HalfSize(AffineAugmentation):
+
+        _include_in_factory = False
+
+        @staticmethod
+        def params():
+            return Params()
+
+        def get_transform(self, height, width):
+            return AffineTransform.scaling(0.5, 0.5, width // 2, height // 2)
+
+    img, _ = sample_image
+
+    aug_img, aug_bboxes = HalfSize().augment(img, bboxes.copy())
+
+    assert aug_img.shape == (img.shape[0] // 2, img.shape[1] // 2, 3)
+    assert np.allclose(aug_bboxes[:, :4], bboxes[:, :4] / 2)
+
+
+@pytest.mark.usefixtures("sample_image")
+def test_disco_sequence_can_be_fused(sample_image, count_resamples):
+
+    img, annotations = sample_image
+
+    aug = disco.Sequence(
+        augmentations=[disco.HorizontalFlip(),
+                       disco.Rotate(angle=10)],
+        fuse=True)
+
+    aug_img, aug_annotations = aug(img, annotations)
+
+    assert count_resamples == ["warpAffine"]
+    assert aug_img.shape == img.shape
+    assert len(aug_annotations) > 0
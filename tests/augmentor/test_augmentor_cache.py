@@ -0,0 +1,167 @@
+import os
+import filecmp
+
+import numpy as np
+import pytest
+
+from discolight.cache import AugmentationCache
+from discolight.loaders.image.directory import Directory
+from discolight.run import main
+from discolight.util.files import link_or_copy
+from discolight.writers.image.directory import write_image_file
+
+
+def generate(query, tmp_path, name, cache=None):
+
+    output_directory = os.path.join(tmp_path, name)
+    os.makedirs(output_directory, exist_ok=True)
+
+    query = query.replace(str(tmp_path), output_directory) + "seed: 7\n"
+
+    if cache is not None:
+        query += "cache: {}\n".format(cache)
+
+    with open(os.path.join(tmp_path, "query.yml"), "w") as query_file:
+        query_file.write(query)
+
+    main(['generate', os.path.join(tmp_path, "query.yml")])
+
+    return output_directory
+
+
+def same_output(left, right):
+
+    comparison = filecmp.dircmp(left, right)
+
+    _, mismatch, errors = filecmp.cmpfiles(left,
+                                           right,
+                                           comparison.common_files,
+                                           shallow=False)
+
+    return (len(comparison.left_list) > 0 and comparison.left_only == []
+            and comparison.right_only == [] and mismatch == []
+            and errors == [])
+
+
+@pytest.fixture
+def count_loads(monkeypatch):
+
+    loaded = []
+
+    load_image = Directory.load_image
+
+    def counting_load_image(self, image_name):
+        loaded.append(image_name)
+        return load_image(self, image_name)
+
+    monkeypatch.setattr(Directory, "load_image", counting_load_image)
+
+    return loaded
+
+
+@pytest.mark.usefixtures("sample_query")
+def test_cached_augmentations_are_not_recomputed(sample_query, tmp_path,
+                                                 count_loads, capsys):
+
+    cache = os.path.join(tmp_path, "cache")
+
+    expected = generate(sample_query, tmp_path, "expected")
+
+    capsys.readouterr()
+
+    first = generate(sample_query, tmp_path, "first", cache)
+
+    assert "0 hits, 21 misses" in capsys.readouterr().out
+    assert same_output(expected, first)
+
+    del count_loads[:]
+
+    # The original images are still saved, so only they are loaded
+    second = generate(sample_query, tmp_path, "second", cache)
+
+    assert "21 hits, 0 misses" in capsys.readouterr().out
+    assert same_output(expected, second)
+    assert len(count_loads) == 3
+
+    with AugmentationCache(cache) as augmentation_cache:
+        assert augmentation_cache.stats()["entries"] == 21
+
+    changed_query = sample_query.replace("shear_factor: -0.5",
+                                         "shear_factor: -0.2")
+
+    generate(changed_query, tmp_path, "changed", cache)
+
+    assert "18 hits, 3 misses" in capsys.readouterr().out
+
+
+def test_cache_evicts_least_recently_used_entries(tmp_path):
+
+    images = os.path.join(tmp_path, "images")
+    os.mkdir(images)
+
+    image_paths = []
+
+    for i in range(4):
+        image_path = os.path.join(images, "{}.png".format(i))
+        write_image_file(image_path, np.zeros((8, 8, 3), dtype=np.uint8))
+        image_paths.append(image_path)
+
+    bboxes = np.array([[0, 0, 1, 1, 0]])
+
+    with AugmentationCache(os.path.join(tmp_path, "cache")) as cache:
+        for i, image_path in enumerate(image_paths):
+            cache.add(str(i), image_path, (8, 8, 3), bboxes)
+
+        cache.commit()
+
+        entry_bytes = cache.stats()["bytes"] // 4
+
+    with AugmentationCache(os.path.join(tmp_path, "cache"),
+                           max_bytes=3 * entry_bytes) as cache:
+
+        assert cache.stats()["evictions"] == 1
+
+        entry = cache.lookup("1")
+
+        assert entry.shape == [8, 8, 3]
+        assert np.array_equal(entry.bboxes, bboxes)
+        assert cache.lookup("0") is None
+
+        # Entries in use are never evicted
+        cache.max_bytes = entry_bytes
+
+        cache.lookup("3")
+        cache.release("3")
+
+        assert cache.stats()["entries"] == 1
+        assert os.path.exists(entry.image_path)
+
+        cache.release("1")
+
+        assert cache.stats() == {
+            "hits": 2,
+            "misses": 1,
+            "evictions": 3,
+            "entries": 1,
+            "bytes": entry_bytes
+        }
+
+
+def test_rewriting_a_linked_image_leaves_the_source_intact(tmp_path):
+
+    source = os.path.join(tmp_path, "source.png")
+    output = os.path.join(tmp_path, "output.png")
+
+    write_image_file(source, np.zeros((8, 8, 3), dtype=np.uint8))
+
+    with open(source, "rb") as source_file:
+        source_bytes = source_file.read()
+
+    link_or_copy(source, output)
+
+    write_image_file(output, np.ones((8, 8, 3), dtype=np.uint8))
+
+    with open(source, "rb") as source_file:
+        assert source_file.read() == source_bytes
+
+    assert sorted(os.listdir(tmp_path)) == ["output.png", "source.png"]
@@ -0,0 +1,208 @@
+import os
+import filecmp
+import json
+import tarfile
+
+import pytest
+
+from discolight.loaders.image.directory import Directory
+from discolight.manifest import Manifest
+from discolight.run import main
+
+
+def generate(query, tmp_path, name, manifest=None, *args):
+
+    output_directory = os.path.join(tmp_path, name)
+    os.makedirs(output_directory, exist_ok=True)
+
+    query = query.replace(str(tmp_path), output_directory) + "seed: 7\n"
+
+    if manifest is not None:
+        query += "manifest: {}\n".format(manifest)
+
+    with open(os.path.join(tmp_path, "query.yml"), "w") as query_file:
+        query_file.write(query)
+
+    main(['generate', os.path.join(tmp_path, "query.yml")] + list(args))
+
+    return output_directory
+
+
+def same_output(left, right):
+
+    comparison = filecmp.dircmp(left, right)
+
+    _, mismatch, errors = filecmp.cmpfiles(left,
+                                           right,
+                                           comparison.common_files,
+                                           shallow=False)
+
+    return (len(comparison.left_list) > 0 and comparison.left_only == []
+            and comparison.right_only == [] and mismatch == []
+            and errors == [])
+
+
+def manifest_entries(manifest):
+
+    with open(manifest) as manifest_file:
+        entries = [json.loads(line) for line in manifest_file]
+
+    return [(entry["image"], entry["augmentation"]) for entry in entries
+            if "image" in entry]
+
+
+@pytest.fixture
+def count_loads(monkeypatch):
+
+    loaded = []
+
+    load_image = Directory.load_image
+
+    def counting_load_image(self, image_name):
+        loaded.append(image_name)
+        return load_image(self, image_name)
+
+    monkeypatch.setattr(Directory, "load_image", counting_load_image)
+
+    return loaded
+
+
+@pytest.mark.usefixtures("sample_query")
+def test_rerun_with_manifest_skips_completed_work(sample_query, tmp_path,
+                                                  count_loads):
+
+    manifest = os.path.join(tmp_path, "manifest.jsonl")
+
+    expected = generate(sample_query, tmp_path, "expected")
+
+    output = generate(sample_query, tmp_path, "output", manifest)
+
+    assert same_output(expected, output)
+
+    entries = manifest_entries(manifest)
+
+    assert len(entries) == 3 * 8
+    assert len(count_loads) == 6
+
+    generate(sample_query, tmp_path, "output", manifest)
+
+    assert same_output(expected, output)
+    assert manifest_entries(manifest) == entries
+    assert len(count_loads) == 6
+
+
+@pytest.mark.usefixtures("sample_query")
+def test_changed_augmentation_is_recomputed(sample_query, tmp_path):
+
+    manifest = os.path.join(tmp_path, "manifest.jsonl")
+
+    output = generate(sample_query, tmp_path, "output", manifest)
+
+    entries = manifest_entries(manifest)
+
+    changed_query = sample_query.replace("shear_factor: -0.5",
+                                         "shear_factor: -0.2")
+
+    generate(changed_query, tmp_path, "output", manifest)
+
+    assert manifest_entries(manifest)[len(entries):] == [
+        ("wheat1.jpg", 4), ("wheat2.jpg", 4), ("wheat3.jpg", 4)
+    ]
+
+    expected = generate(changed_query, tmp_path, "expected")
+
+    assert same_output(expected, output)
+
+
+@pytest.mark.usefixtures("sample_query")
+def test_interrupted_run_is_resumed(sample_query, tmp_path):
+
+    manifest = os.path.join(tmp_path, "manifest.jsonl")
+
+    expected = generate(sample_query, tmp_path, "expected")
+
+    output = generate(sample_query, tmp_path, "output", manifest)
+
+    with open(manifest) as manifest_file:
+        lines = manifest_file.readlines()
+
+    # Simulate a run that was killed while writing the manifest
+    with open(manifest, "w") as manifest_file:
+        manifest_file.writelines(lines[:10])
+        manifest_file.write(lines[10][:20])
+
+    os.remove(os.path.join(output, "wheat3--1.jpg"))
+
+    generate(sample_query, tmp_path, "output", manifest, "--workers", "2")
+
+    assert same_output(expected, output)
+
+    with Manifest(manifest) as resumed:
+        assert len(resumed.records) == 3 * 8
+
+
+def test_manifest_only_reuses_matching_entries(tmp_path):
+
+    manifest_path = os.path.join(tmp_path, "manifest.jsonl")
+
+    with Manifest(manifest_path) as manifest:
+        manifest.start(3)
+        manifest.record("a.jpg", 1, "input", "config", "a--1.jpg",
+                        (4, 4, 3), [[0, 0, 1, 1, 0]])
+        manifest.checkpoint()
+
+        assert manifest.lookup("a.jpg", 1, "input", "config") is None
+
+    with Manifest(manifest_path) as manifest:
+        assert manifest.seed == 3
+
+        record = manifest.lookup("a.jpg", 1, "input", "config")
+
+        assert record["output"] == "a--1.jpg"
+        assert record["shape"] == [4, 4, 3]
+
+        assert manifest.lookup("a.jpg", 1, "other", "config") is None
+        assert manifest.lookup("a.jpg", 1, "input", "other") is None
+        assert manifest.lookup("a.jpg", 2, "input", "config") is None
+
+
+def read_archive(path):
+
+    with tarfile.open(path) as archive:
+        return {
+            member.name: archive.extractfile(member).read()
+            for member in archive.getmembers()
+        }
+
+
+@pytest.mark.usefixtures("sample_query")
+def test_resumed_run_rewrites_archived_annotations(sample_query, tmp_path):
+
+    manifest = os.path.join(tmp_path, "manifest.jsonl")
+
+    query = sample_query.replace(
+        """    writer: FourCornersCSV
+    options:
+      annotations_file: {}/aug_annotations.csv
+      normalized: true""".format(tmp_path), """    writer: YOLODarknet
+    options:
+      annotations_folder: {}/annotations
+      clean_directory: true
+      archive: tar""".format(tmp_path))
+
+    expected = generate(query, tmp_path, "expected")
+    expected_annotations = read_archive(
+        os.path.join(expected, "annotations.tar"))
+
+    assert len(expected_annotations) == 3 * 8
+
+    output = generate(query, tmp_path, "output", manifest)
+    generate(query, tmp_path, "output", manifest)
+
+    assert read_archive(os.path.join(
+        output, "annotations.tar")) == expected_annotations
+
+    images = [name for name in os.listdir(expected) if name.endswith(".jpg")]
+
+    assert filecmp.cmpfiles(expected, output, images,
+                            shallow=False)[0] == images
@@ -0,0 +1,43 @@
+import os
+import json
+
+import pytest
+
+from discolight.run import main
+
+
+@pytest.mark.usefixtures("sample_query")
+@pytest.mark.parametrize("workers", [1, 2])
+def test_generate_saves_profile(sample_query, tmp_path, workers):
+
+    with open(os.path.join(tmp_path, "query.yml"), "w") as query_file:
+        query_file.write(sample_query)
+
+    profile = os.path.join(tmp_path, "profile.json")
+
+    main([
+        'generate',
+        os.path.join(tmp_path, "query.yml"), "--profile", profile,
+        "--workers",
+        str(workers)
+    ])
+
+    with open(profile) as profile_file:
+        report = json.load(profile_file)
+
+    for span in [
+            "load", "validate", "augment", "augment/Sequence",
+            "augment/Sequence/Rotate", "augment/Sequence/Sequence/Shear",
+            "draw_rect", "write_image", "write_annotations"
+    ]:
+        assert report["spans"][span]["count"] > 0
+
+    assert report["counters"]["images"] == 3
+    assert report["counters"]["outputs_written"] == 21
+    assert report["counters"]["boxes_dropped_by_clip_box"] > 0
+    assert report["memory"]["peak_rss_mb"] > 0
+
+    with open(os.path.join(tmp_path, "profile.trace.json")) as trace_file:
+        trace = json.load(trace_file)
+
+    assert len(trace["traceEvents"]) > 0
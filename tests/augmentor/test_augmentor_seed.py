@@ -0,0 +1,102 @@
+import os
+import filecmp
+import random
+
+import numpy as np
+import pytest
+
+from discolight.run import main
+from discolight.util.rng import get_rng, image_seed_sequence, random_stream
+
+
+def generate(sample_query, tmp_path, name, *args):
+
+    output_directory = os.path.join(tmp_path, name)
+    os.mkdir(output_directory)
+
+    query = sample_query.replace(str(tmp_path), output_directory)
+
+    with open(os.path.join(tmp_path, "query.yml"), "w") as query_file:
+        query_file.write(query)
+
+    main(['generate', os.path.join(tmp_path, "query.yml")] + list(args))
+
+    return output_directory
+
+
+def same_output(left, right):
+
+    comparison = filecmp.dircmp(left, right)
+
+    _, mismatch, errors = filecmp.cmpfiles(left,
+                                           right,
+                                           comparison.common_files,
+                                           shallow=False)
+
+    return (len(comparison.left_list) > 0 and comparison.left_only == []
+            and comparison.right_only == [] and mismatch == []
+            and errors == [])
+
+
+@pytest.mark.usefixtures("sample_query")
+def test_serial_and_parallel_output_identical_with_seed(
+        sample_query, tmp_path):
+
+    random.seed(1)
+    serial = generate(sample_query, tmp_path, "serial", "--seed", "7")
+
+    random.seed(2)
+    parallel = generate(sample_query, tmp_path, "parallel", "--seed", "7",
+                        "--workers", "2")
+
+    random.seed(3)
+    other_seed = generate(sample_query, tmp_path, "other", "--seed", "8")
+
+    assert same_output(serial, parallel)
+    assert not same_output(serial, other_seed)
+
+
+def test_random_stream_is_reproducible():
+
+    def draw(seed, image_name, augmentation_idx):
+        seed_sequence = image_seed_sequence(
+            seed, image_name).spawn(augmentation_idx + 1)[augmentation_idx]
+
+        with random_stream(seed_sequence):
+            return random.random(), get_rng().random()
+
+    assert draw(1, "a.jpg", 0) == draw(1, "a.jpg", 0)
+
+    draws = {
+        draw(seed, image_name, augmentation_idx)
+        for seed in [1, 2] for image_name in ["a.jpg", "b.jpg"]
+        for augmentation_idx in [0, 1]
+    }
+
+    assert len(draws) == 8
+
+
+def test_random_stream_restores_random_state():
+
+    random.seed(0)
+    expected = random.random()
+
+    random.seed(0)
+
+    with random_stream(np.random.SeedSequence(5)) as rng:
+        random.random()
+        assert get_rng() is rng
+
+    assert random.random() == expected
+    assert get_rng() is not rng
+
+
+def test_rng_is_seeded_from_random_outside_of_streams():
+
+    random.seed(0)
+    first = get_rng().random(4)
+
+    random.seed(0)
+    second = get_rng().random(4)
+
+    assert np.array_equal(first, second)
@@ -0,0 +1,98 @@
+import os
+import itertools
+from pathlib import Path
+
+import pytest
+
+from discolight.loaders.image.directory import Directory
+from discolight.loaders.annotation.fourcornerscsv import FourCornersCSV
+from discolight.util.pipeline import prefetch
+
+fixtures_directory = Path(__file__).resolve().parent.parent.parent.joinpath(
+    "fixtures", "augmentor")
+
+
+class CountingDirectory(Directory):
+
+    _include_in_factory = False
+
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.loaded = []
+
+    def load_image(self, image_name):
+        self.loaded.append(image_name)
+        return super().load_image(image_name)
+
+
+def test_iter_annotated_images_loads_images_lazily():
+
+    with FourCornersCSV(annotations_file=os.path.join(fixtures_directory,
+                                                      "annotations.csv"),
+                        normalized=True) as annotation_loader, \
+            CountingDirectory(directory=fixtures_directory) as image_loader:
+
+        images = annotation_loader.iter_annotated_images(image_loader)
+
+        image_name, _ = next(images)
+
+        assert image_loader.loaded == [image_name]
+
+        remaining = [name for name, _ in images]
+
+        assert image_loader.loaded == [image_name] + remaining
+
+
+def test_iter_annotated_images_matches_load_annotated_images():
+
+    with FourCornersCSV(annotations_file=os.path.join(fixtures_directory,
+                                                      "annotations.csv"),
+                        normalized=True) as annotation_loader, Directory(
+                            directory=fixtures_directory) as image_loader:
+        loaded = annotation_loader.load_annotated_images(image_loader)
+
+    with FourCornersCSV(annotations_file=os.path.join(fixtures_directory,
+                                                      "annotations.csv"),
+                        normalized=True) as annotation_loader, Directory(
+                            directory=fixtures_directory) as image_loader:
+        streamed = list(annotation_loader.iter_annotated_images(image_loader))
+
+    assert [name for name, _ in streamed] == list(loaded)
+
+    for image_name, (image, annotations) in streamed:
+
+        loaded_image, loaded_annotations = loaded[image_name]
+
+        assert (image == loaded_image).all()
+        assert [bbox.as_list() for bbox in annotations
+                ] == [bbox.as_list() for bbox in loaded_annotations]
+
+
+def test_prefetch_is_bounded():
+
+    produced = []
+
+    def produce():
+        for i in itertools.count():
+            produced.append(i)
+            yield i
+
+    items = prefetch(produce(), 2)
+
+    assert next(items) == 0
+
+    # One item in the consumer's hands, at most two in the queue, and at
+    # most one more being held by the producer thread.
+    assert len(produced) <= 4
+
+    items.close()
+
+
+def test_prefetch_raises_producer_errors():
+
+    def produce():
+        yield 1
+        raise ValueError("bad item")
+
+    with pytest.raises(ValueError):
+        list(prefetch(produce(), 2))
@@ -0,0 +1,51 @@
+import os
+import filecmp
+import random
+import pytest
+
+from discolight.run import main
+
+
+@pytest.mark.usefixtures("sample_query")
+def test_parallel_output_independent_of_worker_count(sample_query, tmp_path):
+
+    for workers in [2, 3]:
+
+        output_directory = os.path.join(tmp_path, "workers{}".format(workers))
+        os.mkdir(output_directory)
+
+        query = sample_query.replace(str(tmp_path), output_directory)
+
+        with open(os.path.join(tmp_path, "query.yml"), "w") as query_file:
+            query_file.write(query)
+
+        random.seed(1)
+        main([
+            'generate',
+            os.path.join(tmp_path, "query.yml"), '--workers',
+            str(workers)
+        ])
+
+    comparison = filecmp.dircmp(os.path.join(tmp_path, "workers2"),
+                                os.path.join(tmp_path, "workers3"))
+
+    assert len(comparison.left_list) > 0
+    assert comparison.left_only == [] and comparison.right_only == []
+
+    _, mismatch, errors = filecmp.cmpfiles(os.path.join(tmp_path, "workers2"),
+                                           os.path.join(tmp_path, "workers3"),
+                                           comparison.common_files,
+                                           shallow=False)
+
+    assert mismatch == [] and errors == []
+
+
+@pytest.mark.usefixtures("query_bad_bboxes")
+def test_parallel_augmentor_raises_error_on_bad_bboxes(query_bad_bboxes,
+                                                       tmp_path):
+
+    with open(os.path.join(tmp_path, "query.yml"), "w") as query_file:
+        query_file.write(query_bad_bboxes + "workers: 2\n")
+
+    with pytest.raises(ValueError):
+        main(['generate', os.path.join(tmp_path, "query.yml")])
@@ -0,0 +1,120 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from discolight.augmentations.factory import get_augmentations_set
+from discolight.bench import find_regressions
+from discolight.loaders.annotation.factory import get_annotation_loader_set
+from discolight.run import main
+from discolight.writers.annotation.factory import get_annotation_writer_set
+
+
+def test_quick_benchmarks_cover_everything(tmp_path):
+
+    results_path = os.path.join(tmp_path, "results.json")
+
+    main(["bench", "--quick", "--repeats", "1", "--save", results_path])
+
+    with open(results_path) as results_file:
+        results = json.load(results_file)["results"]
+
+    expected = (
+        ["augmentation/{}/256x256/10".format(name)
+         for name in get_augmentations_set()] +
+        ["annotation-writer/{}/10".format(name)
+         for name in get_annotation_writer_set()] +
+        ["annotation-loader/{}/10".format(name)
+         for name in get_annotation_loader_set()] + ["generate/256x256"])
+
+    assert sorted(results) == sorted(expected)
+
+    for name, result in results.items():
+        assert "error" not in result, name
+        assert result["p50_ms"] <= result["p90_ms"] <= result["p99_ms"]
+        assert result["throughput"] > 0
+
+
+def test_bench_fails_on_regression(tmp_path, capsys):
+
+    baseline_path = os.path.join(tmp_path, "baseline.json")
+
+    main([
+        "bench", "--quick", "--repeats", "1", "--filter",
+        "augmentation/GaussianNoise", "--save", baseline_path
+    ])
+
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+
+    assert list(
+        baseline["results"]) == ["augmentation/GaussianNoise/256x256/10"]
+
+    main([
+        "bench", "--quick", "--repeats", "1", "--filter",
+        "augmentation/GaussianNoise", "--baseline", baseline_path,
+        "--tolerance", "100"
+    ])
+
+    for result in baseline["results"].values():
+        result["p50_ms"] /= 1000
+
+    with open(baseline_path, "w") as baseline_file:
+        json.dump(baseline, baseline_file)
+
+    capsys.readouterr()
+
+    with pytest.raises(SystemExit):
+        main([
+            "bench", "--quick", "--repeats", "1", "--filter",
+            "augmentation/GaussianNoise", "--baseline", baseline_path
+        ])
+
+    assert "REGRESSION: augmentation/GaussianNoise" in capsys.readouterr().out
+
+
+def test_find_regressions():
+
+    baseline = {
+        "a": {
+            "p50_ms": 10.0
+        },
+        "b": {
+            "p50_ms": 10.0
+        },
+        "c": {
+            "error": "RuntimeError"
+        }
+    }
+
+    results = {
+        "a": {
+            "p50_ms": 12.0
+        },
+        "b": {
+            "p50_ms": 13.0
+        },
+        "c": {
+            "p50_ms": 100.0
+        },
+        "d": {
+            "p50_ms": 100.0
+        }
+    }
+
+    assert find_regressions(results, baseline,
+                            0.25) == [("b", pytest.approx(1.3))]
+
+
+def test_generate_does_not_import_bench():
+
+    # Importing bench builds every factory, which would slow down the
+    # start of every run
+    subprocess.run([
+        sys.executable, "-c", "import sys, discolight.run; "
+        "assert 'discolight.bench' not in sys.modules; "
+        "assert 'discolight.doc' not in sys.modules"
+    ],
+                   check=True)
@@ -1,7 +1,12 @@
+import json
+import os
+
 import pytest
 import numpy as np
 
 from discolight.annotations import annotations_to_numpy_array
+from discolight.loaders.annotation.coco import COCO
+from discolight.loaders.image.directory import Directory
 
 
 @pytest.mark.usefixtures("coco_imageset", "coco_equiv_csv_imageset")
@@ -18,3 +23,92 @@ def test_coco_loader(coco_imageset, coco_equiv_csv_imageset):
         assert np.allclose(
             cc_bboxes, csv_bboxes
         ), "Same bboxes loaded with COCO, FourCornersCSV not equal." ""
+
+
+@pytest.mark.usefixtures("coco_imageset")
+def test_coco_loader_reads_files_in_any_order(tmp_path, coco_imageset):
+
+    fixture_directory = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "..", "fixtures",
+        "coco")
+
+    with open(os.path.join(fixture_directory,
+                           "annotations.coco.json")) as coco_fp:
+        coco_json = json.load(coco_fp)
+
+    # Annotations come first, and images are listed in reverse order
+    reordered = {
+        "annotations": coco_json["annotations"][::-1],
+        "licenses": coco_json["licenses"],
+        "images": coco_json["images"][::-1],
+        "categories": coco_json["categories"],
+        "info": coco_json["info"]
+    }
+
+    annotations_file = os.path.join(tmp_path, "annotations.coco.json")
+
+    with open(annotations_file, "w") as coco_fp:
+        json.dump(reordered, coco_fp, indent=1)
+
+    with Directory(directory=fixture_directory) as image_loader, COCO(
+            annotations_file=annotations_file) as annotation_loader:
+        loaded = list(
+            annotation_loader.iter_annotated_images(image_loader, lazy=True))
+
+    assert [image_name for image_name, _ in loaded] == [
+        image["file_name"] for image in reordered["images"]
+    ]
+
+    for image_name, (_, annotations) in loaded:
+
+        _, expected = coco_imageset[image_name]
+
+        assert np.array_equal(annotations.to_numpy(),
+                              expected.to_numpy()[::-1])
+        assert [bbox.additional_info for bbox in annotations
+                ] == [bbox.additional_info for bbox in expected][::-1]
+
+
+@pytest.mark.usefixtures("coco_imageset")
+def test_coco_loader_accepts_string_ids_and_missing_licenses(
+        tmp_path, coco_imageset):
+
+    fixture_directory = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "..", "fixtures",
+        "coco")
+
+    with open(os.path.join(fixture_directory,
+                           "annotations.coco.json")) as coco_fp:
+        coco_json = json.load(coco_fp)
+
+    # Image IDs are strings in the images array, category IDs are strings
+    # in the annotations, and no image has a license
+    for image in coco_json["images"]:
+        image["id"] = "image-{}".format(image["id"])
+        del image["license"]
+
+    for annotation in coco_json["annotations"]:
+        annotation["image_id"] = "image-{}".format(annotation["image_id"])
+        annotation["category_id"] = str(annotation["category_id"])
+
+    annotations_file = os.path.join(tmp_path, "annotations.coco.json")
+
+    with open(annotations_file, "w") as coco_fp:
+        json.dump(coco_json, coco_fp)
+
+    with Directory(directory=fixture_directory) as image_loader, COCO(
+            annotations_file=annotations_file) as annotation_loader:
+        loaded = list(
+            annotation_loader.iter_annotated_images(image_loader, lazy=True))
+
+    assert len(loaded) > 0
+
+    for image_name, (_, annotations) in loaded:
+
+        _, expected = coco_imageset[image_name]
+
+        assert np.array_equal(annotations.to_numpy(), expected.to_numpy())
+        assert [bbox.additional_info for bbox in annotations] == [
+            dict(bbox.additional_info, image_license=None)
+            for bbox in expected
+        ]
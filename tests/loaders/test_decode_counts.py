@@ -0,0 +1,125 @@
+import os
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from discolight.loaders.image.directory import Directory
+from discolight.loaders.annotation.coco import COCO
+from discolight.loaders.annotation.fourcornerscsv import FourCornersCSV
+from discolight.loaders.annotation.pascalvoc import PascalVOC
+from discolight.loaders.annotation.widthheightcsv import WidthHeightCSV
+from discolight.loaders.annotation.yolodarknet import YOLODarknet
+from discolight.loaders.annotation.yolokeras import YOLOKeras
+
+fixtures_directory = Path(__file__).resolve().parent.parent.parent.joinpath(
+    "fixtures")
+
+
+class DecodeCountingDirectory(Directory):
+
+    _include_in_factory = False
+
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.decodes = Counter()
+
+    def load_image(self, image_name):
+        self.decodes[image_name] += 1
+        return super().load_image(image_name)
+
+
+def fixture_path(*parts):
+    return os.path.join(fixtures_directory, *parts)
+
+
+def make_annotation_loader(loader_name):
+    """Return an annotation loader and the directory of its images."""
+    if loader_name == "FourCornersCSV":
+        return FourCornersCSV(annotations_file=fixture_path(
+            "augmentor", "annotations.csv"),
+                              normalized=True), fixture_path("augmentor")
+
+    if loader_name == "FourCornersCSV-unnormalized":
+        return FourCornersCSV(annotations_file=fixture_path(
+            "augmentor", "annotations.csv"),
+                              normalized=False), fixture_path("augmentor")
+
+    if loader_name == "WidthHeightCSV":
+        return WidthHeightCSV(annotations_file=fixture_path(
+            "annotations-wh.csv"),
+                              normalized=True), fixture_path()
+
+    if loader_name == "COCO":
+        return COCO(annotations_file=fixture_path(
+            "coco", "annotations.coco.json")), fixture_path("coco")
+
+    if loader_name == "PascalVOC":
+        return PascalVOC(
+            annotations_folder=fixture_path("pascalvoc")), fixture_path(
+                "pascalvoc")
+
+    if loader_name == "YOLODarknet":
+        return YOLODarknet(annotations_folder=fixture_path("yolodarknet"),
+                           image_ext="jpg"), fixture_path("yolodarknet")
+
+    return YOLOKeras(annotations_file=fixture_path(
+        "yolokeras", "annotations.txt")), fixture_path("yolokeras")
+
+
+annotation_loaders = [
+    "FourCornersCSV", "FourCornersCSV-unnormalized", "WidthHeightCSV",
+    "COCO", "PascalVOC", "YOLODarknet", "YOLOKeras"
+]
+
+
+@pytest.mark.parametrize("loader_name", annotation_loaders)
+def test_each_image_is_decoded_once(loader_name):
+
+    annotation_loader, images_directory = make_annotation_loader(loader_name)
+
+    with annotation_loader, \
+            DecodeCountingDirectory(images_directory) as image_loader:
+        images = annotation_loader.load_annotated_images(image_loader)
+
+    assert len(images) > 0
+    assert image_loader.decodes == Counter(images.keys())
+
+
+@pytest.mark.parametrize("loader_name", annotation_loaders)
+def test_lazy_images_are_never_decoded(loader_name):
+
+    annotation_loader, images_directory = make_annotation_loader(loader_name)
+
+    with annotation_loader, \
+            DecodeCountingDirectory(images_directory) as image_loader:
+        images = list(
+            annotation_loader.iter_annotated_images(image_loader, lazy=True))
+
+    assert len(images) > 0
+    assert image_loader.decodes == Counter()
+
+
+def test_csv_images_with_interleaved_rows_are_decoded_once(tmp_path):
+
+    with open(fixture_path("augmentor", "annotations.csv")) as csv_file:
+        header, *rows = csv_file.readlines()
+
+    # Alternate rows from the start and the end of the file, so that the
+    # rows for each image are no longer contiguous.
+    interleaved = [
+        row for pair in zip(rows, reversed(rows)) for row in pair
+    ][:len(rows)]
+
+    annotations_file = os.path.join(tmp_path, "annotations.csv")
+
+    with open(annotations_file, "w") as csv_file:
+        csv_file.writelines([header] + interleaved)
+
+    with FourCornersCSV(annotations_file=annotations_file,
+                        normalized=True) as annotation_loader, \
+            DecodeCountingDirectory(fixture_path("augmentor")) as image_loader:
+        images = annotation_loader.load_annotated_images(image_loader)
+
+    assert image_loader.decodes == Counter(images.keys())
+    assert sum(len(bboxes) for _, bboxes in images.values()) == len(rows)
@@ -0,0 +1,81 @@
+import os
+from pathlib import Path
+
+import numpy as np
+
+from discolight.loaders.image.directory import Directory
+from discolight.loaders.annotation.fourcornerscsv import FourCornersCSV
+
+fixtures_directory = Path(__file__).resolve().parent.parent.parent.joinpath(
+    "fixtures", "augmentor")
+
+image_names = ["wheat3.jpg", "wheat1.jpg", "wheat2.jpg", "wheat1.jpg"]
+
+
+def test_threaded_directory_loader_returns_images_in_order():
+
+    with Directory(directory=fixtures_directory) as image_loader:
+        expected = [
+            image_loader.load_image(image_name) for image_name in image_names
+        ]
+
+    with Directory(directory=fixtures_directory, threads=3,
+                   read_ahead=2) as image_loader:
+        loaded = list(image_loader.load_images(image_names))
+
+    assert len(loaded) == len(expected)
+
+    for image, expected_image in zip(loaded, expected):
+        assert np.array_equal(image, expected_image)
+
+
+def test_threaded_directory_loader_reads_ahead_within_window():
+
+    class CountingDirectory(Directory):
+
+        _include_in_factory = False
+
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.loaded = 0
+
+        def load_image(self, image_name):
+            self.loaded += 1
+            return super().load_image(image_name)
+
+    with CountingDirectory(directory=fixtures_directory,
+                           threads=4,
+                           read_ahead=2) as image_loader:
+        images = image_loader.load_images(image_names * 10)
+
+        next(images)
+
+        assert image_loader.loaded <= 3
+
+        images.close()
+
+
+def test_annotation_loader_with_threaded_directory_loader():
+
+    annotations_file = os.path.join(fixtures_directory, "annotations.csv")
+
+    with FourCornersCSV(annotations_file=annotations_file,
+                        normalized=True) as annotation_loader, Directory(
+                            directory=fixtures_directory) as image_loader:
+        expected = annotation_loader.load_annotated_images(image_loader)
+
+    with FourCornersCSV(annotations_file=annotations_file,
+                        normalized=True) as annotation_loader, Directory(
+                            directory=fixtures_directory,
+                            threads=2) as image_loader:
+        loaded = annotation_loader.load_annotated_images(image_loader)
+
+    assert list(loaded) == list(expected)
+
+    for image_name, (image, annotations) in loaded.items():
+
+        expected_image, expected_annotations = expected[image_name]
+
+        assert np.array_equal(image, expected_image)
+        assert [bbox.as_list() for bbox in annotations
+                ] == [bbox.as_list() for bbox in expected_annotations]
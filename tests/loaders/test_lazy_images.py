@@ -0,0 +1,193 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from discolight.run import main
+from discolight.loaders.image.directory import Directory
+from discolight.loaders.image.types import LazyImage
+from discolight.loaders.annotation.types import AnnotationLoader
+from discolight.loaders.annotation.fourcornerscsv import FourCornersCSV
+from discolight.loaders.annotation.yolodarknet import YOLODarknet
+from discolight.util.image import load_image, load_image_size
+
+fixtures_directory = Path(__file__).resolve().parent.parent.parent.joinpath(
+    "fixtures")
+
+
+class CountingDirectory(Directory):
+
+    _include_in_factory = False
+
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.loaded = []
+
+    def load_image(self, image_name):
+        self.loaded.append(image_name)
+        return super().load_image(image_name)
+
+
+def assert_same_annotations(lazy_images, images):
+
+    assert list(lazy_images) == list(images)
+
+    for image_name, (lazy_image, annotations) in lazy_images.items():
+
+        image, expected_annotations = images[image_name]
+
+        assert lazy_image.shape == image.shape
+        assert [bbox.as_list() for bbox in annotations
+                ] == [bbox.as_list() for bbox in expected_annotations]
+
+
+def test_normalized_csv_loader_does_not_decode_lazy_images():
+
+    annotations_file = os.path.join(fixtures_directory, "augmentor",
+                                    "annotations.csv")
+    images_directory = os.path.join(fixtures_directory, "augmentor")
+
+    with FourCornersCSV(annotations_file=annotations_file,
+                        normalized=True) as annotation_loader, \
+            CountingDirectory(images_directory) as image_loader:
+        lazy_images = dict(
+            annotation_loader.iter_annotated_images(image_loader, lazy=True))
+
+        assert image_loader.loaded == []
+
+    with FourCornersCSV(annotations_file=annotations_file,
+                        normalized=True) as annotation_loader, \
+            Directory(images_directory) as image_loader:
+        images = annotation_loader.load_annotated_images(image_loader)
+
+    assert_same_annotations(lazy_images, images)
+
+
+def test_yolodarknet_loader_does_not_decode_lazy_images():
+
+    annotations_folder = os.path.join(fixtures_directory, "yolodarknet")
+
+    with YOLODarknet(annotations_folder=annotations_folder,
+                     image_ext="jpg") as annotation_loader, \
+            CountingDirectory(annotations_folder) as image_loader:
+        lazy_images = dict(
+            annotation_loader.iter_annotated_images(image_loader, lazy=True))
+
+        assert image_loader.loaded == []
+
+    with YOLODarknet(annotations_folder=annotations_folder,
+                     image_ext="jpg") as annotation_loader, \
+            Directory(annotations_folder) as image_loader:
+        images = annotation_loader.load_annotated_images(image_loader)
+
+    assert_same_annotations(lazy_images, images)
+
+
+class EagerFourCornersCSV(FourCornersCSV):
+
+    _include_in_factory = False
+
+    # Use the default implementation, which only has load_annotated_images
+    iter_annotated_images = AnnotationLoader.iter_annotated_images
+
+    def load_annotated_images(self, image_loader):
+        return dict(super().iter_annotated_images(image_loader))
+
+
+def test_default_loader_returns_loaded_lazy_images():
+
+    annotations_file = os.path.join(fixtures_directory, "augmentor",
+                                    "annotations.csv")
+    images_directory = os.path.join(fixtures_directory, "augmentor")
+
+    with EagerFourCornersCSV(annotations_file=annotations_file,
+                             normalized=True) as annotation_loader, \
+            CountingDirectory(images_directory) as image_loader:
+        lazy_images = dict(
+            annotation_loader.iter_annotated_images(image_loader, lazy=True))
+
+        loaded = list(image_loader.loaded)
+
+        assert len(loaded) == 3
+        assert all(
+            isinstance(image, LazyImage) and image.loaded
+            for image, _ in lazy_images.values())
+
+        for image, _ in lazy_images.values():
+            image.load()
+
+        assert image_loader.loaded == loaded
+
+    with FourCornersCSV(annotations_file=annotations_file,
+                        normalized=True) as annotation_loader, \
+            Directory(images_directory) as image_loader:
+        images = annotation_loader.load_annotated_images(image_loader)
+
+    assert_same_annotations(lazy_images, images)
+
+
+def test_lazy_image_load_and_release():
+
+    with CountingDirectory(fixtures_directory) as image_loader:
+
+        image = LazyImage(image_loader, "wheat1.jpg")
+
+        assert not image.loaded
+
+        pixels = image.load()
+
+        assert image.loaded
+        assert image.load() is pixels
+        assert image_loader.loaded == ["wheat1.jpg"]
+
+        image.release()
+
+        assert not image.loaded
+        assert image.shape == pixels.shape
+        assert image_loader.loaded == ["wheat1.jpg"]
+
+        assert np.array_equal(image.load(), pixels)
+        assert image_loader.loaded == ["wheat1.jpg", "wheat1.jpg"]
+
+
+def test_load_image_size_applies_exif_orientation(tmp_path):
+
+    image_path = os.path.join(tmp_path, "rotated.jpg")
+
+    exif = Image.Exif()
+    exif[0x0112] = 6
+
+    Image.fromarray(np.zeros((20, 40, 3), dtype=np.uint8)).save(
+        image_path, exif=exif.tobytes())
+
+    height, width, _ = load_image(image_path).shape
+
+    assert load_image_size(image_path) == (width, height)
+
+
+@pytest.mark.usefixtures("sample_query")
+def test_annotation_conversion_does_not_decode_images(sample_query, tmp_path,
+                                                      monkeypatch):
+
+    def fail_to_load(_self, image_name):
+        raise AssertionError("{} was decoded".format(image_name))
+
+    monkeypatch.setattr(Directory, "load_image", fail_to_load)
+
+    query = sample_query[:sample_query.index("augmentations:")]
+
+    with open(os.path.join(tmp_path, "query.yml"), "w") as query_file:
+        query_file.write(query + "augmentations: []\n"
+                         "save-original: false\n"
+                         "save-bbox: false\n")
+
+    main(['generate', os.path.join(tmp_path, "query.yml")])
+
+    with open(os.path.join(fixtures_directory, "augmentor",
+                           "annotations.csv")) as annotations_file:
+        expected_rows = len(annotations_file.readlines())
+
+    with open(os.path.join(tmp_path, "aug_annotations.csv")) as output_file:
+        assert len(output_file.readlines()) == expected_rows
@@ -1,7 +1,11 @@
+import os
+
 import pytest
 import numpy as np
 
 from discolight.annotations import annotations_to_numpy_array
+from discolight.loaders.annotation.pascalvoc import PascalVOC
+from discolight.loaders.image.directory import Directory
 
 
 @pytest.mark.usefixtures("pascalvoc_imageset", "pascalvoc_equiv_csv_imageset")
@@ -32,3 +36,49 @@ def test_pascalvoc_loader_additional_values(
     assert annotation.additional_info["name"] == "test"
     assert annotation.additional_info["truncated"] == "1"
     assert annotation.additional_info["difficult"] == "2"
+
+
+def write_xml_files(directory, count):
+
+    names = ["wheat", "7", "barley", "2", "wheat", "oats"]
+
+    for file_idx in range(count):
+
+        objects = "".join(
+            "<object><name>{}</name><pose>{}</pose><bndbox><xmin>{}</xmin>"
+            "<ymin>1</ymin><xmax>{}</xmax><ymax>5.5</ymax></bndbox>"
+            "</object>".format(names[(file_idx + obj_idx) % len(names)],
+                               obj_idx % 2, obj_idx, obj_idx + 2.5)
+            for obj_idx in range(file_idx % 4))
+
+        with open(os.path.join(directory, "{}.xml".format(file_idx)),
+                  "w") as xml_file:
+            xml_file.write("<annotation><filename>{}.jpg</filename>{}"
+                           "</annotation>".format(file_idx, objects))
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_parallel_pascalvoc_loader_matches_serial_loader(tmp_path, workers):
+
+    write_xml_files(tmp_path, 50)
+
+    loaded = {}
+
+    for loader_workers in [0, workers]:
+        with Directory(directory=tmp_path) as image_loader, PascalVOC(
+                annotations_folder=tmp_path,
+                workers=loader_workers) as annotation_loader:
+            loaded[loader_workers] = [
+                (image_name, annotations.to_numpy(),
+                 [bbox.additional_info for bbox in annotations])
+                for image_name, (_, annotations) in
+                annotation_loader.iter_annotated_images(image_loader,
+                                                        lazy=True)
+            ]
+
+    assert len(loaded[0]) == 50
+
+    for serial, parallel in zip(loaded[0], loaded[workers]):
+        assert serial[0] == parallel[0]
+        assert np.array_equal(serial[1], parallel[1])
+        assert serial[2] == parallel[2]
@@ -0,0 +1,97 @@
+import threading
+
+import numpy as np
+import pytest
+
+from discolight.augmentations.factory import make_augmentations_factory
+from discolight.util.bufferpool import BufferPool, get_buffer_pool
+
+
+def test_buffers_are_reused_by_shape_and_dtype():
+
+    pool = BufferPool()
+
+    buf = pool.borrow((4, 5, 3))
+    pool.give_back(buf)
+
+    assert pool.borrow((4, 5, 3)) is buf
+    assert pool.borrow((4, 5, 3)) is not buf
+    assert pool.borrow((4, 5, 3), np.float32).dtype == np.float32
+
+    assert pool.stats()["hits"] == 1
+    assert pool.stats()["misses"] == 3
+
+
+def test_least_recently_used_buffers_are_evicted():
+
+    pool = BufferPool(max_bytes=250)
+
+    first, second, third = (pool.borrow((100, )) for _ in range(3))
+
+    pool.give_back(first)
+    pool.give_back(second)
+    pool.give_back(third)
+
+    stats = pool.stats()
+
+    assert stats["evictions"] == 1
+    assert stats["idle_bytes"] == 200
+    assert stats["peak_bytes"] == 300
+
+    assert pool.borrow((100, )) is third
+    assert pool.borrow((100, )) is second
+    assert pool.borrow((100, )) is not first
+
+
+def test_buffers_larger_than_the_budget_are_not_kept():
+
+    pool = BufferPool(max_bytes=10)
+
+    with pool.borrowed((100, )):
+        pass
+
+    assert pool.stats()["idle_bytes"] == 0
+    assert pool.stats()["evictions"] == 1
+
+
+def test_each_thread_has_its_own_pool():
+
+    pools = []
+
+    thread = threading.Thread(target=lambda: pools.append(get_buffer_pool()))
+    thread.start()
+    thread.join()
+
+    assert pools[0] is not get_buffer_pool()
+    assert get_buffer_pool() is get_buffer_pool()
+
+
+@pytest.mark.parametrize("name,options", [
+    ("Rotate", {
+        "angle": 10
+    }),
+    ("Scale", {
+        "scale_x": 0.3,
+        "scale_y": -0.2
+    }),
+    ("ResizeMaintainAspectRatio", {
+        "input_dim": 64
+    }),
+])
+def test_augmentations_reuse_pooled_temporaries(name, options):
+
+    augmentation = make_augmentations_factory()(name, **options)
+
+    rng = np.random.RandomState(0)
+    img = rng.randint(0, 256, (90, 120, 3), dtype=np.uint8)
+
+    pool = get_buffer_pool()
+
+    first, _ = augmentation.augment(img.copy(), np.empty((0, 5)))
+
+    hits = pool.stats()["hits"]
+
+    second, _ = augmentation.augment(img.copy(), np.empty((0, 5)))
+
+    assert pool.stats()["hits"] == hits + 1
+    assert np.array_equal(first, second)
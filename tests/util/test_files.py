@@ -0,0 +1,74 @@
+import os
+import stat
+
+import numpy as np
+import pytest
+
+from discolight.util.files import link_or_copy, replacing
+from discolight.writers.image.directory import write_image_file
+
+
+def file_mode(path):
+
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def default_mode():
+
+    umask = os.umask(0)
+    os.umask(umask)
+
+    return 0o666 & ~umask
+
+
+def test_replaced_files_get_the_default_mode(tmp_path):
+
+    path = os.path.join(tmp_path, "image.png")
+
+    write_image_file(path, np.zeros((8, 8, 3), dtype=np.uint8))
+
+    assert file_mode(path) == default_mode()
+
+
+def test_replaced_files_keep_the_mode_of_the_file_they_replace(tmp_path):
+
+    path = os.path.join(tmp_path, "annotations.json")
+
+    with open(path, "w") as existing_file:
+        existing_file.write("{}")
+
+    os.chmod(path, 0o640)
+
+    with replacing(path) as temp_path:
+        with open(temp_path, "w") as temp_file:
+            temp_file.write("[]")
+
+    assert file_mode(path) == 0o640
+
+
+def test_copied_files_get_the_default_mode(tmp_path, monkeypatch):
+
+    source = os.path.join(tmp_path, "source.png")
+    output = os.path.join(tmp_path, "output.png")
+
+    write_image_file(source, np.zeros((8, 8, 3), dtype=np.uint8))
+
+    def fail_link(_source, _path):
+        raise OSError("Cross-device link")
+
+    monkeypatch.setattr(os, "link", fail_link)
+
+    link_or_copy(source, output)
+
+    assert file_mode(output) == default_mode()
+
+
+def test_failed_replacement_leaves_no_temporary_file(tmp_path):
+
+    path = os.path.join(tmp_path, "image.png")
+
+    with pytest.raises(RuntimeError):
+        with replacing(path):
+            raise RuntimeError("Interrupted")
+
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,92 @@
+import io
+import os
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from discolight.util.image import load_image, load_image_size
+from discolight.util.imageheader import read_image_size
+
+fixtures_directory = Path(__file__).resolve().parent.parent.parent.joinpath(
+    "fixtures", "augmentor")
+
+
+def decoded_size(image_path):
+    height, width, _ = load_image(image_path).shape
+
+    return width, height
+
+
+@pytest.mark.parametrize("image_name",
+                         ["wheat1.jpg", "wheat2.jpg", "wheat3.jpg"])
+def test_jpeg_header_size_matches_decoded_size(image_name):
+
+    image_path = os.path.join(fixtures_directory, image_name)
+
+    with open(image_path, "rb") as image_file:
+        assert read_image_size(image_file) == decoded_size(image_path)
+
+
+@pytest.mark.parametrize("ext,save_options,exif_orientation", [
+    (".png", {}, None),
+    (".bmp", {}, None),
+    (".jpg", {"progressive": True}, None),
+    (".jpg", {}, 6),
+    (".jpg", {}, 3),
+    (".tiff", {}, None),
+    (".webp", {}, None),
+])
+def test_load_image_size_matches_decoded_size(tmp_path, ext, save_options,
+                                              exif_orientation):
+
+    image_path = os.path.join(tmp_path, "image" + ext)
+
+    if exif_orientation is not None:
+        exif = Image.Exif()
+        exif[0x0112] = exif_orientation
+        save_options = dict(save_options, exif=exif.tobytes())
+
+    Image.fromarray(np.zeros((30, 50, 3), dtype=np.uint8)).save(
+        image_path, **save_options)
+
+    assert load_image_size(image_path) == decoded_size(image_path)
+
+
+def test_bmp_top_down_header_size(tmp_path):
+
+    image_path = os.path.join(tmp_path, "image.bmp")
+
+    cv2.imwrite(image_path, np.zeros((30, 50, 3), dtype=np.uint8))
+
+    with open(image_path, "rb") as image_file:
+        header = bytearray(image_file.read())
+
+    # Store the image top-down by negating its height
+    header[22:26] = (-30).to_bytes(4, "little", signed=True)
+
+    assert read_image_size(io.BytesIO(bytes(header))) == (50, 30)
+
+
+def test_unsupported_and_malformed_headers():
+
+    assert read_image_size(io.BytesIO(b"GIF89a\x01\x00\x01\x00")) is None
+
+    with pytest.raises(ValueError):
+        read_image_size(io.BytesIO(b"\xff\xd8\xff\xe0\x00"))
+
+
+def test_load_image_size_cache_is_invalidated_on_change(tmp_path):
+
+    image_path = os.path.join(tmp_path, "image.png")
+
+    cv2.imwrite(image_path, np.zeros((30, 50, 3), dtype=np.uint8))
+    assert load_image_size(image_path) == (50, 30)
+
+    cv2.imwrite(image_path, np.zeros((40, 20, 3), dtype=np.uint8))
+    stat = os.stat(image_path)
+    os.utime(image_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+
+    assert load_image_size(image_path) == (20, 40)
@@ -0,0 +1,49 @@
+import io
+import json
+
+import pytest
+
+from discolight.util.jsonstream import iter_json_object
+
+document = {
+    "info": {
+        "description": "a \"quoted\" ]}, string",
+        "year": 2020
+    },
+    "images": [{
+        "id": 1234567,
+        "width": 1.5e3
+    }, {
+        "id": -7,
+        "nested": [[], {}, [1, [2]]]
+    }],
+    "empty": [],
+    "annotations": [12345, 0.000125, None, True, "é"],
+    "licenses": []
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 4])
+def test_json_members_are_streamed(chunk_size, indent):
+
+    json_fp = io.StringIO(json.dumps(document, indent=indent))
+
+    members = list(
+        iter_json_object(json_fp, ["images", "annotations", "licenses"],
+                         chunk_size))
+
+    assert members == (
+        [("info", document["info"])] +
+        [("images", image) for image in document["images"]] +
+        [("empty", [])] +
+        [("annotations", value) for value in document["annotations"]])
+
+
+@pytest.mark.parametrize("malformed",
+                         ['', '[]', '{"images": 1}', '{"images": [1 2]}',
+                          '{"info": {}', '{1: 2}', '{"a": [1, 2}'])
+def test_malformed_json_raises_value_error(malformed):
+
+    with pytest.raises(ValueError):
+        list(iter_json_object(io.StringIO(malformed), ["images"], 2))
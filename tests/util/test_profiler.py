@@ -0,0 +1,99 @@
+import threading
+
+import numpy as np
+
+from discolight.augmentations.bbox_utilities.bbox_utilities import clip_box
+from discolight.util.profiler import (Profiler, count, get_profiler,
+                                      profiled, profiled_iter, profiling)
+
+
+def test_spans_are_nested_per_thread():
+
+    with profiling(Profiler()) as profiler:
+
+        with profiled("outer"):
+            with profiled("inner"):
+                pass
+
+            def other_thread():
+                with profiled("other"):
+                    pass
+
+            thread = threading.Thread(target=other_thread)
+            thread.start()
+            thread.join()
+
+            with profiled("inner"):
+                pass
+
+        list(profiled_iter(range(3), "item"))
+
+    report = profiler.report()
+
+    assert report["spans"]["outer"]["count"] == 1
+    assert report["spans"]["outer/inner"]["count"] == 2
+    assert report["spans"]["item"]["count"] == 4
+    assert report["spans"]["other"]["count"] == 1
+    assert (report["spans"]["outer"]["total_ms"] >=
+            report["spans"]["outer/inner"]["total_ms"])
+
+
+def test_nothing_is_recorded_without_an_active_profiler():
+
+    assert get_profiler() is None
+
+    with profiled("span"):
+        count("counter")
+
+    profiler = Profiler()
+
+    with profiling(profiler):
+        assert get_profiler() is profiler
+
+    assert get_profiler() is None
+    assert profiler.report()["spans"] == {}
+
+
+def test_clip_box_counts_dropped_boxes():
+
+    bboxes = np.array([[0, 0, 10, 10, 1], [15, 15, 35, 35, 1],
+                       [5, 5, 25, 25, 1]],
+                      dtype=float)
+
+    with profiling(Profiler()) as profiler:
+        clipped = clip_box(bboxes, [0, 0, 20, 20], 0.25)
+
+    assert len(clipped) == 2
+    assert profiler.report()["counters"] == {"boxes_dropped_by_clip_box": 1}
+
+
+def test_merge_and_trace():
+
+    worker = Profiler()
+
+    with profiling(worker):
+        with profiled("augment"):
+            count("images", 2)
+
+    main = Profiler(max_trace_events=1)
+
+    with profiling(main):
+        with profiled("write_image"):
+            count("images")
+
+    main.merge(worker.take())
+
+    report = main.report()
+
+    assert set(report["spans"]) == {"augment", "write_image"}
+    assert report["counters"] == {"images": 3}
+    assert report["dropped_trace_events"] == 1
+
+    assert worker.report()["spans"] == {}
+
+    events = main.trace()["traceEvents"]
+
+    assert len(events) == 1
+    assert events[0]["name"] == "write_image"
+    assert events[0]["ph"] == "X"
+    assert events[0]["dur"] >= 0
@@ -1,6 +1,11 @@
+import json
 import os
+
+import numpy as np
 import pytest
 
+from discolight.annotations import AnnotationTable
+
 from discolight.loaders.image.directory import (Directory as DirectoryLoader)
 from discolight.loaders.annotation.coco import (COCO as COCOLoader)
 
@@ -59,3 +64,60 @@ def test_identical_img_bboxes_recovered_using_coco_writer(
             assert annotation.additional_info["category"][
                 "supercategory"] == loaded_annotation.additional_info[
                     "category"]["supercategory"]
+
+
+def write_coco(annotations_file, image, annotations, images, fail=False):
+
+    with COCOWriter(annotations_file=annotations_file) as writer:
+        for image_idx in range(images):
+            writer.write_annotations_for_image("{}.jpg".format(image_idx),
+                                               image, annotations)
+
+        if fail:
+            raise RuntimeError
+
+
+def test_coco_writer_assembles_segments(tmp_path):
+
+    annotations_file = os.path.join(tmp_path, "annotations.coco.json")
+
+    image = np.zeros((10, 20, 3), dtype=np.uint8)
+    annotations = AnnotationTable.from_numpy([[1, 2, 3, 4, 0],
+                                              [5, 6, 7, 8, 1]])
+
+    write_coco(annotations_file, image, annotations, 100)
+
+    assert os.listdir(tmp_path) == ["annotations.coco.json"]
+
+    with open(annotations_file) as annotations_fp:
+        coco_json = json.load(annotations_fp)
+
+    assert list(coco_json) == [
+        "info", "categories", "images", "annotations", "licenses"
+    ]
+    assert len(coco_json["images"]) == 100
+    assert len(coco_json["annotations"]) == 200
+    assert [category["name"] for category in coco_json["categories"]
+            ] == ["class0", "class1"]
+    assert coco_json["annotations"][-1]["bbox"] == [5, 6, 2, 2]
+
+
+def test_failed_coco_writer_keeps_the_previous_annotations(tmp_path):
+
+    annotations_file = os.path.join(tmp_path, "annotations.coco.json")
+
+    image = np.zeros((10, 20, 3), dtype=np.uint8)
+    annotations = AnnotationTable.from_numpy([[1, 2, 3, 4, 0]])
+
+    write_coco(annotations_file, image, annotations, 3)
+
+    with open(annotations_file, "rb") as annotations_fp:
+        expected = annotations_fp.read()
+
+    with pytest.raises(RuntimeError):
+        write_coco(annotations_file, image, annotations, 100, fail=True)
+
+    assert os.listdir(tmp_path) == ["annotations.coco.json"]
+
+    with open(annotations_file, "rb") as annotations_fp:
+        assert annotations_fp.read() == expected
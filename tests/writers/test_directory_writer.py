@@ -1,4 +1,6 @@
 import os
+import filecmp
+import pytest
 from discolight.writers.image.directory import Directory
 
 
@@ -18,3 +20,38 @@ def test_directory_image_writer_clean_directory_false(tmp_path):
 
     with Directory(directory=tmp_path, clean_directory=False):
         assert os.path.isfile(os.path.join(tmp_path, "test"))
+
+
+@pytest.mark.usefixtures("sample_image")
+def test_directory_image_writer_threaded_matches_synchronous(
+        tmp_path, sample_image):
+
+    image, _ = sample_image
+
+    for threads in [0, 3]:
+        with Directory(directory=os.path.join(tmp_path, str(threads)),
+                       clean_directory=True,
+                       threads=threads,
+                       queue_size=2) as image_writer:
+            for idx in range(6):
+                image_writer.write_image("image{}.jpg".format(idx), image)
+
+    for idx in range(6):
+        assert filecmp.cmp(os.path.join(tmp_path, "0",
+                                        "image{}.jpg".format(idx)),
+                           os.path.join(tmp_path, "3",
+                                        "image{}.jpg".format(idx)),
+                           shallow=False)
+
+
+@pytest.mark.usefixtures("sample_image")
+def test_directory_image_writer_threaded_raises_deferred_errors(
+        tmp_path, sample_image):
+
+    image, _ = sample_image
+
+    with pytest.raises(IOError):
+        with Directory(directory=tmp_path, clean_directory=False,
+                       threads=2) as image_writer:
+            image_writer.write_image(
+                os.path.join("no-such-directory", "image.jpg"), image)
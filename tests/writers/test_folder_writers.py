@@ -0,0 +1,122 @@
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from discolight.writers.annotation.pascalvoc import (PascalVOC as
+                                                     PascalVOCWriter)
+from discolight.writers.annotation.yolodarknet import (YOLODarknet as
+                                                       YOLODarknetWriter)
+
+
+def write_annotations(writer, annotations_folder, image, annotations,
+                      **options):
+
+    if writer is PascalVOCWriter:
+        options["database"] = "wheat"
+
+    with writer(annotations_folder=annotations_folder,
+                clean_directory=True,
+                **options) as annotation_writer:
+        for image_idx in range(20):
+            annotation_writer.write_annotations_for_image(
+                "{}.jpg".format(image_idx), image, annotations[image_idx:])
+
+
+def read_folder(annotations_folder):
+
+    files = {}
+
+    for directory, _, file_names in os.walk(annotations_folder):
+        for file_name in file_names:
+            path = os.path.join(directory, file_name)
+
+            with open(path, "rb") as annotations_file:
+                files[os.path.relpath(path, annotations_folder).replace(
+                    os.path.sep, "/")] = annotations_file.read()
+
+    return files
+
+
+@pytest.mark.usefixtures("sample_image")
+@pytest.mark.parametrize("writer", [PascalVOCWriter, YOLODarknetWriter],
+                         ids=["PascalVOC", "YOLODarknet"])
+def test_folder_writers_write_the_same_files_in_every_mode(
+        tmp_path, sample_image, writer):
+
+    image, annotations = sample_image
+
+    expected_folder = os.path.join(tmp_path, "expected")
+    write_annotations(writer, expected_folder, image, annotations)
+    expected = read_folder(expected_folder)
+
+    assert len(expected) == 20
+
+    threaded_folder = os.path.join(tmp_path, "threaded")
+    write_annotations(writer,
+                      threaded_folder,
+                      image,
+                      annotations,
+                      threads=4,
+                      queue_size=2)
+
+    assert read_folder(threaded_folder) == expected
+
+    sharded_folder = os.path.join(tmp_path, "sharded")
+    write_annotations(writer,
+                      sharded_folder,
+                      image,
+                      annotations,
+                      threads=2,
+                      shard_levels=2)
+
+    sharded = read_folder(sharded_folder)
+
+    assert {
+        name.split("/")[-1]: content
+        for name, content in sharded.items()
+    } == expected
+    assert all(
+        len(name.split("/")) == 3 and len(name.split("/")[0]) == 2
+        for name in sharded)
+
+    tar_folder = os.path.join(tmp_path, "annotations")
+    write_annotations(writer,
+                      tar_folder,
+                      image,
+                      annotations,
+                      threads=4,
+                      shard_levels=1,
+                      archive="tar")
+
+    with tarfile.open(tar_folder + ".tar") as tar:
+        names = tar.getnames()
+        archived = {name: tar.extractfile(name).read() for name in names}
+
+    # Files are archived in the order they were written
+    file_names = [name.split("/")[-1] for name in names]
+
+    assert not os.path.exists(tar_folder)
+    assert file_names == sorted(file_names,
+                                key=lambda name: int(name.split(".")[0]))
+    assert {
+        name.split("/")[-1]: content
+        for name, content in archived.items()
+    } == expected
+
+    write_annotations(writer, tar_folder, image, annotations, archive="zip")
+
+    with zipfile.ZipFile(tar_folder + ".zip") as archive:
+        assert {name: archive.read(name)
+                for name in archive.namelist()} == expected
+
+
+def test_folder_writers_reject_unknown_archive_formats(tmp_path):
+
+    with pytest.raises(ValueError):
+        YOLODarknetWriter.params().call_with_params(
+            YOLODarknetWriter, {
+                "annotations_folder": str(tmp_path),
+                "archive": "rar"
+            })
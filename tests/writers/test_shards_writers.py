@@ -0,0 +1,185 @@
+import json
+import os
+import tarfile
+
+import cv2
+import numpy as np
+import pytest
+
+from discolight.run import main
+from discolight.writers.annotation.shards import (Shards as
+                                                  ShardsAnnotationWriter)
+from discolight.writers.image.shards import Shards as ShardsImageWriter
+
+
+def read_shards(directory):
+
+    with open(os.path.join(directory, "index.json")) as index_file:
+        index = json.load(index_file)
+
+    shards = []
+
+    for shard in index["shards"]:
+        with open(os.path.join(directory, shard["index"])) as index_file:
+            samples = json.load(index_file)["samples"]
+
+        with open(os.path.join(directory, shard["tar"]), "rb") as tar_file:
+            data = tar_file.read()
+
+        with tarfile.open(os.path.join(directory, shard["tar"])) as tar:
+            members = [(member.name, tar.extractfile(member).read())
+                       for member in tar.getmembers()]
+
+        assert shard["samples"] == len(samples)
+        assert shard["bytes"] == len(data)
+
+        # The index gives the offset of each file in the tar
+        assert [("{}.{}".format(sample["key"], extension),
+                 data[offset:offset + size])
+                for sample in samples
+                for extension, (offset, size) in sorted(
+                    sample["files"].items())] == members
+
+        shards.append(members)
+
+    return index, shards
+
+
+@pytest.mark.usefixtures("sample_image")
+def test_shards_writers_store_samples_together(tmp_path, sample_image):
+
+    _, annotations = sample_image
+
+    images = np.random.default_rng(0).integers(0,
+                                               256, (20, 32, 32, 3),
+                                               dtype=np.uint8)
+
+    directory = os.path.join(tmp_path, "shards")
+
+    with ShardsImageWriter(
+            directory=directory,
+            shard_size_mb=0.01) as image_writer, ShardsAnnotationWriter(
+                directory=directory,
+                shard_size_mb=0.01) as annotation_writer:
+        for image_idx, image in enumerate(images):
+            name = "{}.png".format(image_idx)
+
+            image_writer.write_image(name, image)
+            annotation_writer.write_annotations_for_image(
+                name, image, annotations[image_idx:])
+
+    index, shards = read_shards(directory)
+
+    assert index["shard_size"] == int(0.01 * (1 << 20))
+    assert len(shards) > 1
+    assert all(shard["bytes"] <= index["shard_size"]
+               for shard in index["shards"])
+
+    members = [member for shard in shards for member in shard]
+
+    assert [name for name, _ in members] == [
+        "{}.{}".format(image_idx, extension) for image_idx in range(20)
+        for extension in ["json", "png"]
+    ]
+
+    for image_idx, image in enumerate(images):
+        sample = json.loads(members[2 * image_idx][1])
+
+        assert sample["image"] == "{}.png".format(image_idx)
+        assert (sample["width"], sample["height"]) == (32, 32)
+        assert np.array_equal(sample["bboxes"],
+                              annotations[image_idx:].to_numpy())
+
+        decoded = cv2.imdecode(
+            np.frombuffer(members[2 * image_idx + 1][1], dtype=np.uint8),
+            cv2.IMREAD_COLOR)
+
+        assert np.array_equal(cv2.cvtColor(decoded, cv2.COLOR_BGR2RGB),
+                              image)
+
+
+def make_shards_query(sample_query, shards_output):
+
+    output_start = sample_query.index("output:")
+    output_end = sample_query.index("augmentations:")
+
+    return (sample_query[:output_start] + """output:
+  images:
+    writer: Shards
+    options:
+      directory: {directory}
+      shard_size_mb: 1
+  annotations:
+    writer: Shards
+    options:
+      directory: {directory}
+      shard_size_mb: 1
+""".format(directory=shards_output) + sample_query[output_end:])
+
+
+@pytest.mark.usefixtures("sample_query")
+def test_generate_to_shards_matches_directory_output(sample_query,
+                                                     tmp_path):
+
+    directory_output = os.path.join(tmp_path, "directory")
+    shards_output = os.path.join(tmp_path, "shards")
+
+    directory_query = sample_query.replace(str(tmp_path), directory_output)
+    shards_query = make_shards_query(sample_query, shards_output)
+
+    for name, query in [("directory", directory_query),
+                        ("shards", shards_query)]:
+        query_path = os.path.join(tmp_path, "{}.yml".format(name))
+
+        with open(query_path, "w") as query_file:
+            query_file.write(query)
+
+        main(["generate", query_path, "--seed", "3"])
+
+    _, shards = read_shards(shards_output)
+
+    assert len(shards) > 1
+
+    images = {
+        name: content
+        for shard in shards for name, content in shard
+        if name.endswith(".jpg")
+    }
+
+    assert sorted(images) == sorted(
+        name for name in os.listdir(directory_output)
+        if name.endswith(".jpg"))
+
+    for name, content in images.items():
+        with open(os.path.join(directory_output, name), "rb") as image_file:
+            assert image_file.read() == content
+
+    # Every image is stored next to its annotations
+    assert all(
+        name.endswith(".jpg") and next_name == name[:-4] + ".json"
+        for shard in shards
+        for (name, _), (next_name, _) in zip(shard[::2], shard[1::2]))
+
+
+@pytest.mark.usefixtures("sample_query")
+def test_generate_to_shards_refuses_to_resume(sample_query, tmp_path):
+
+    shards_output = os.path.join(tmp_path, "shards")
+    query_path = os.path.join(tmp_path, "shards.yml")
+
+    with open(query_path, "w") as query_file:
+        query_file.write(
+            make_shards_query(sample_query, shards_output) +
+            "manifest: {}\n".format(os.path.join(tmp_path, "manifest.json")))
+
+    main(["generate", query_path, "--seed", "3"])
+
+    _, shards = read_shards(shards_output)
+
+    with pytest.raises(ValueError, match="cannot resume"):
+        main(["generate", query_path, "--seed", "3"])
+
+    # The shards of the first run are left as they were
+    assert read_shards(shards_output)[1] == shards
+    assert any(
+        name.endswith(".jpg") for shard in shards for name, _ in shard)